@@ -0,0 +1,273 @@
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from statistics import median
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "test"))
+
+from BasicPatternGenerator import BasicPatternGenerator  # noqa: E402
+from minesweeper import Minesweeper  # noqa: E402
+from minesweeper_cache import ComponentCache  # noqa: E402
+from minesweeper_solver import MinesweeperSolver, MAX_COMPONENT_SIZE  # noqa: E402
+
+SEEDS = range(5)
+SIZE = (16, 30, 99)  # rows, cols, mines of the seeded random boards
+PATTERNS = ["mine_in_center", "pattern_corner_1", "pattern_corner_1_with_2_mines", "mines_1_2_2", "mines_corner_3",
+            "mines_edge_5", "mines_4", "pattern_b2", "pattern_1_1", "pattern_1_2"]
+THRESHOLD = 0.25  # allowed slowdown against the baseline
+MIN_SAMPLE_TIME = 0.1  # seconds per sample, calls get repeated until a sample takes that long
+PROCESSES = 3  # fresh worker processes per benchmark
+
+
+def random_game(seed):
+    rows, cols, mines = SIZE
+    return Minesweeper(rows=rows, cols=cols, mines=mines, rng=random.Random(seed))
+
+
+def started_solver(seed):
+    """Solver on a seeded random board, that ran AC3 once (the state ``find_solutions`` starts in)"""
+    game = random_game(seed)
+    rng = random.Random(seed)
+    solver = MinesweeperSolver(game, starting_point=(rng.randrange(game.cols), rng.randrange(game.rows)), rng=rng,
+                               cache=ComponentCache())
+    solver.ac3()
+    return solver
+
+
+def pattern_solvers():
+    """Solvers on the patterns of ``BasicPatternGenerator``, with the given cells uncovered"""
+    solvers = []
+    for pattern in PATTERNS:
+        game = Minesweeper(3, 3, 1)
+        solver = MinesweeperSolver(game, cache=ComponentCache())
+        with redirect_stdout(io.StringIO()):  # the generator prints every pattern
+            getattr(BasicPatternGenerator(game, solver), pattern)()
+        solver.uncover_cells()
+        solvers.append(solver)
+    return solvers
+
+
+def fixture_solvers():
+    """Pattern solvers and started random solvers, that aren't finished yet"""
+    return [solver for solver in pattern_solvers() + [started_solver(seed) for seed in SEEDS]
+            if not solver.game.game_over]
+
+
+def setup_generate_board():
+    return [random_game(seed) for seed in SEEDS]
+
+
+def run_generate_board(games):
+    for game in games:
+        game.generate_board()
+
+
+def run_get_neighbors(game):
+    for _ in range(10):
+        for x in range(game.cols):
+            for y in range(game.rows):
+                game.get_neighbors(x, y)
+
+
+def setup_ac3():
+    solvers = []
+    for seed in SEEDS:
+        game = random_game(seed)
+        rng = random.Random(seed)
+        solvers.append(MinesweeperSolver(game, starting_point=(rng.randrange(game.cols), rng.randrange(game.rows)),
+                                         rng=rng, cache=ComponentCache()))
+    return solvers
+
+
+def run_ac3(solvers):
+    for solver in solvers:
+        solver.ac3()
+
+
+def setup_arcs():
+    """Every arc from a covered cell to an uncovered neighbor"""
+    return [(solver, [(x, y, i, j) for x, y in solver.get_frontier() for i, j in solver.neighbors[(x, y)]
+                      if (i, j) in solver.checked]) for solver in fixture_solvers()]
+
+
+def run_revise(fixtures):
+    for solver, arcs in fixtures:
+        for arc in arcs:
+            solver.revise(*arc)
+
+
+def setup_frontiers():
+    return [(solver, solver.get_frontier()) for solver in fixture_solvers()]
+
+
+def run_violates_constraints(fixtures):
+    for solver, frontier in fixtures:
+        for x, y in frontier:
+            solver.violates_constraints(x, y, 0)
+            solver.violates_constraints(x, y, 1)
+
+
+def setup_components():
+    return [(solver, [component for component in solver.split_components(solver.get_frontier())
+                      if len(component) <= MAX_COMPONENT_SIZE])  # larger ones aren't backtracked
+            for solver in fixture_solvers()]
+
+
+def run_backtrack(fixtures):
+    for solver, components in fixtures:
+        for component in components:
+            solver.unassigned = component
+            solver.backtrack(solver.game.mines - len(solver.game.marked))
+
+
+def run_find_solutions(solvers):
+    for solver in solvers:
+        solver.find_solutions()
+
+
+def run_solve(solvers):
+    for solver in solvers:
+        solver.solve()
+
+
+# name -> (setup, timed function of the setup's result), setup runs again before every repetition
+BENCHMARKS = {
+    "generate_board": (setup_generate_board, run_generate_board),
+    "get_neighbors": (lambda: random_game(0), run_get_neighbors),
+    "ac3": (setup_ac3, run_ac3),
+    "revise": (setup_arcs, run_revise),
+    "violates_constraints": (setup_frontiers, run_violates_constraints),
+    "backtrack": (setup_components, run_backtrack),
+    # successor of find_safe_cells: one round of deductions, enumeration and probabilities at the first AC3 fixpoint
+    "find_solutions": (lambda: [solver for solver in fixture_solvers() if solver.checked], run_find_solutions),
+    "solve": (lambda: [solver for solver in fixture_solvers() if solver.checked], run_solve),  # rest of the game
+}
+
+
+def sample(setup, function, number):
+    """
+    Runs ``function`` on ``number`` fresh results of ``setup``. Only the calls get timed. Like ``timeit``, the garbage
+    collector is off while timing, else collections over the fixtures of the whole sample land in random calls
+
+    :return: time of all calls in seconds
+    """
+    states = [setup() for _ in range(number)]
+    gc.collect()
+    gc.disable()
+    try:
+        tic = time.perf_counter()
+        for state in states:
+            function(state)
+        return time.perf_counter() - tic
+    finally:
+        gc.enable()
+
+
+def calibrate(setup, function, min_time=MIN_SAMPLE_TIME):
+    """
+    Finds the amount of calls per sample, so that a sample takes at least ``min_time`` (1, 2, 5, 10, 20, ... calls
+    like ``timeit.Timer.autorange``). Single calls of the fast benchmarks take less than a millisecond, which is
+    mostly timer noise
+
+    :return: amount of calls per sample
+    """
+    number = 1
+    while True:
+        for factor in (1, 2, 5):
+            if sample(setup, function, number * factor) >= min_time:
+                return number * factor
+        number *= 10
+
+
+def measure(name, repeat=7, min_time=MIN_SAMPLE_TIME):
+    """
+    Times benchmark ``name`` in ``repeat`` samples of at least ``min_time`` each. The setup isn't timed and runs
+    before every call, so every call gets fresh state
+
+    :param name: name of the benchmark
+    :param repeat: amount of samples
+    :param min_time: minimal time of a sample in seconds
+    :return: dict with the best and the median time of a single call in seconds and the amount of calls per sample
+    """
+    setup, function = BENCHMARKS[name]
+    number = calibrate(setup, function, min_time)
+    times = [sample(setup, function, number) / number for _ in range(repeat)]
+    return {"best": min(times), "median": median(times), "number": number, "times": times}
+
+
+def measure_in_processes(name, processes=PROCESSES, repeat=7):
+    """
+    Measures benchmark ``name`` in ``processes`` fresh worker processes (``--worker``) and combines their samples. The
+    speed of a whole process can differ by more than the threshold (memory layout, allocator state), so samples of a
+    single process can't tell a regression from an unlucky process
+
+    :return: dict like ``measure``, over the samples of every worker
+    """
+    times = []
+    for _ in range(processes):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", name, "--repeat", str(repeat)],
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output)
+        times.extend(result["times"])
+    return {"best": min(times), "median": median(times), "number": result["number"], "times": times}
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    Compares the median times of ``results`` against ``baseline``. The best time of a run depends on a single lucky
+    sample, the median of all samples of all workers is stable enough to gate on
+
+    :param results: dict mapping benchmark names to measurements
+    :param baseline: dict mapping benchmark names to measurements
+    :param threshold: allowed relative slowdown, e.g. 0.25 for 25%
+    :return: list of tuples (name, baseline time, current time) of every regression
+    """
+    return [(name, baseline[name]["median"], result["median"]) for name, result in results.items()
+            if name in baseline and result["median"] > baseline[name]["median"] * (1 + threshold)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Times the hot functions of game and solver on fixed fixtures")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="run only these benchmarks")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--save", help="write the results as baseline JSON to this file")
+    parser.add_argument("--baseline", help="compare against this baseline JSON and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed slowdown, default 0.25 (25%%)")
+    parser.add_argument("--processes", type=int, default=PROCESSES, help="fresh worker processes per benchmark")
+    parser.add_argument("--worker", choices=BENCHMARKS, help=argparse.SUPPRESS)  # measure one benchmark, print JSON
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(measure(args.worker, args.repeat)))
+        return 0
+    results = {}
+    for name in args.only or BENCHMARKS:
+        results[name] = measure_in_processes(name, args.processes, args.repeat)
+        print("{:<22} best {:>10.3f}ms  median {:>10.3f}ms".format(name, results[name]["best"] * 1000,
+                                                                     results[name]["median"] * 1000))
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results},
+                      file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after in regressions:
+            print("REGRESSION {}: {:.3f}ms -> {:.3f}ms ({:+.0%})".format(name, before * 1000, after * 1000,
+                                                                       after / before - 1))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,20 @@
 import random
+import warnings
+from functools import cached_property
+
+try:
+    import numpy as np
+except ImportError:  # numpy only speeds up the generation of large boards
+    np = None
+
+from minesweeper_topology import get_topology
+from minesweeper_trace import NULL_SINK, BOARD_GENERATED, MINES_MOVED, UNCOVERED, FLAG, GAME_OVER
+
+SIZE_WARNING = 1000 * 1000  # amount of cells, above which boards get slow and need a lot of memory
+
+# bits of the state byte of a cell
+MARKED_BIT = 1
+UNCOVERED_BIT = 2
 
 
 class Minesweeper:
@@ -6,138 +22,305 @@ class Minesweeper:
     Minesweeper game representation
     adapted from: https://cs50.harvard.edu/ai/2020/projects/1/minesweeper/
     board generation from: https://www.lvngd.com/blog/generating-minesweeper-boards-python/
+
+    The state is kept in two byte arrays indexed by ``x * rows + y``: the constants (9 for mines) and a state byte
+    with the bits ``MARKED_BIT`` and ``UNCOVERED_BIT``. A game needs about two bytes per cell, ``board``, ``uncovered``
+    and ``marked`` are views on these arrays
     """
 
-    def __init__(self, rows=9, cols=9, mines=10):
-        assert 2 < rows < 50 and 2 < cols < 50 and 0 < mines  # check parameters
+    def __init__(self, rows=9, cols=9, mines=10, rng=None, trace=None, debug=False, opening=False):
+        assert 2 < rows and 2 < cols and 0 < mines  # check parameters
         assert 0 < mines / (rows * cols) < 0.5  # assure max mine density of 0.5
+        if rows * cols > SIZE_WARNING:
+            warnings.warn("board with {} cells is above {}, generating and solving it needs a lot of time and memory"
+                          .format(rows * cols, SIZE_WARNING), stacklevel=2)
 
         # Set initial cols, rows, and number of mines
         self.rows = rows
         self.cols = cols
         self.mines = mines
+        self.rng = random if rng is None else rng  # e.g. random.Random(seed) for reproducible boards
+        self.trace = NULL_SINK if trace is None else trace  # receives the events of the game, see minesweeper_trace
+        self.debug = debug  # check the constants of every generated board
+        self.opening = opening  # the first uncovered cell is a 0, when the board has room for it
 
-        # Initialize an empty field with no mines aka all 0 then add the mines
-        self.board = [[Cell(x, y, 0) for y in range(0, rows)] for x in range(0, cols)]
-        self.generate_board()
-        self.check_consistency()
+        mine_coordinates = self.generate_board()
 
-        # keep track of uncovered cells
-        self.uncovered = set()
-        self.marked = set()
+        # keep track of uncovered and marked cells
+        self.state = bytearray(rows * cols)
+        self.uncovered_count = 0
+        self.marked_count = 0
         self.game_over = False
         self.result = ""
 
-        self.print()
+        self.trace.emit(BOARD_GENERATED, rows=rows, cols=cols, mines=mines, mine_coordinates=mine_coordinates)
 
-    def generate_board(self):
-        # Generate list of coordinates and sample mine coordinates
-        board_coordinates = [(x, y) for x in range(0, self.cols) for y in range(0, self.rows)]
-        mine_coordinates = random.sample(board_coordinates, self.mines)
+    @cached_property
+    def topology(self):
+        """Shared neighbor tables for this board size, built on first use, because generation doesn't need them"""
+        return get_topology(self.rows, self.cols)
+
+    @property
+    def board(self):
+        """Cells as ``board[x][y]``. Assigning a Cell to a position writes its constant and mark into the game"""
+        return Board(self)
 
-        # place mines
-        for mine in mine_coordinates:
-            x, y = mine
-            self.board[x][y].constant = 9
-            neighbors = self.get_neighbors(x, y)
+    @property
+    def uncovered(self):
+        """Uncovered cells as set-like view"""
+        return CellSet(self, UNCOVERED_BIT)
 
-            # increase "mine counter" for all neighbors
-            for n in neighbors:
-                if n not in mine_coordinates:
-                    self.board[n[0]][n[1]].constant += 1
+    @property
+    def marked(self):
+        """Marked cells as set-like view"""
+        return CellSet(self, MARKED_BIT)
+
+    def generate_board(self):
+        """
+        Builds a new board: samples the mines by their flat index ``x * rows + y`` and counts them for their neighbors,
+        vectorized with numpy when it is installed. Boards of millions of cells take about a second
+        :return: list of mine coordinates
+        """
+        indices = self.rng.sample(range(self.rows * self.cols), self.mines)
+        mine_coordinates = [divmod(index, self.rows) for index in indices]
+        if np is not None:
+            self.constants = self.count_mines_numpy(indices)
+        else:
+            self.constants = self.count_mines(mine_coordinates)
+        if self.debug:
+            self.check_consistency()
+        return mine_coordinates
+
+    def count_mines_numpy(self, indices):
+        """
+        :param indices: flat indices of the mines
+        :return: constants as bytearray, 9 for mines
+        """
+        mines = np.zeros(self.cols * self.rows, dtype=np.uint8)
+        mines[indices] = 1
+        padded = np.pad(mines.reshape(self.cols, self.rows), 1)
+        # sum of the 8 shifted copies of the board is the amount of neighboring mines of every cell
+        counts = sum(padded[1 + i:1 + i + self.cols, 1 + j:1 + j + self.rows]
+                     for i in (-1, 0, 1) for j in (-1, 0, 1) if i or j)
+        return bytearray(np.where(padded[1:-1, 1:-1] == 1, 9, counts).astype(np.uint8).tobytes())
+
+    def count_mines(self, mine_coordinates):
+        """
+        Pure python fallback of ``count_mines_numpy``, that only visits the neighbors of mines
+        :param mine_coordinates: list of mine coordinates
+        :return: constants as bytearray, 9 for mines
+        """
+        constants = bytearray(self.rows * self.cols)
+        for x, y in mine_coordinates:
+            constants[x * self.rows + y] = 9
+        for x, y in mine_coordinates:
+            for i in range(max(0, x - 1), min(self.cols, x + 2)):
+                for index in range(i * self.rows + max(0, y - 1), i * self.rows + min(self.rows, y + 2)):
+                    if constants[index] != 9:
+                        constants[index] += 1
+        return constants
 
     def check_consistency(self):
-        for x in range(0, self.cols):
-            for y in range(0, self.rows):
-                cell = self.board[x][y]
-                if 0 < cell.constant < 9:
-                    mine_neighbors = [self.board[n[0]][n[1]] for n in self.get_neighbors(x, y)]
-                    if cell.constant != [m.constant == 9 for m in mine_neighbors].count(True):
-                        print("not consistent!")
+        """
+        Debug check, that every constant matches the amount of neighboring mines
+        :raises AssertionError: at the first inconsistent cell
+        """
+        for index, constant in enumerate(self.constants):
+            if constant != 9:
+                mines = [self.constants[n] for n in self.topology.neighbor_indices(index)].count(9)
+                assert constant == mines, "not consistent: {} has constant {}, but {} neighboring mines".format(
+                    divmod(index, self.rows), constant, mines)
 
     def uncover(self, x, y):
         """
         uncovers a cell, adds it to uncovered-set and checks for game over
         :param x: x value to uncover
         :param y: y value to uncover
-        :return: Cell at x, y, game_over state and result string
+        :return: game_over state, None when the cell was uncovered before
         """
-        cell = self.board[x][y]
-        val = cell.constant
-
-        if cell in self.uncovered:
+        if self.state[x * self.rows + y] & UNCOVERED_BIT:
             return
+        self.reveal(x, y)
+        return self.game_over
 
-        # make sure that first uncover isn't a mine
-        if len(self.uncovered) == 0 and val == 9:
-            while val == 9:
-                self.board = [[Cell(x, y, 0) for y in range(0, self.rows)] for x in range(0, self.cols)]
-                self.generate_board()
-                val = self.board[x][y].constant
-            self.print()
+    def uncover_many(self, cells, flood=True):
+        """
+        Uncovers a batch of cells and, with ``flood``, the zero regions they open (see ``uncover_zeroes``). Cells that
+        are uncovered already get skipped, the batch stops at the cell, that ends the game
+        :param cells: iterable of (x, y)
+        :param flood: True to uncover the neighbors of every uncovered zero
+        :return: tuple (delta as list of (x, y, constant) of every newly uncovered cell in order, game_over state)
+        """
+        delta = []
+        over = self.game_over  # e.g. finished by the solver, before it uncovers the remaining cells
+        for x, y in cells:
+            if self.state[x * self.rows + y] & UNCOVERED_BIT:
+                continue
+            constant = self.reveal(x, y)
+            delta.append((x, y, constant))
+            if constant == 0 and flood:
+                delta.extend(self.uncover_zeroes(x, y))
+            if self.game_over and not over:
+                break
+        return delta, self.game_over
+
+    def reveal(self, x, y):
+        """
+        Uncovers the covered cell ``(x, y)``: protects the first click, emits the event and checks for game over
+        :return: constant of the cell
+        """
+        index = x * self.rows + y
 
-        self.uncovered.add(cell)
+        # make sure that first uncover isn't a mine (or is an opening)
+        val = self.constants[index]
+        if self.uncovered_count == 0 and (val == 9 or self.opening and val != 0):
+            self.clear_first_click(x, y)
+            val = self.constants[index]
+
+        self.state[index] |= UNCOVERED_BIT
+        self.uncovered_count += 1
+        self.trace.emit(UNCOVERED, x=x, y=y, constant=val)
 
         if val == 9:
-            self.game_over = True
-            self.result = "Lost"
-            print(self.result)
-        elif len(self.uncovered) == (self.rows * self.cols) - self.mines:
-            self.game_over = True
-            self.result = "Won"
-            print(self.result)
-        # if val == 0:
-            # self.uncover_zeroes(x, y)
+            self.finish("Lost")
+        elif self.uncovered_count == (self.rows * self.cols) - self.mines:
+            self.finish("Won")
+        return val
 
-        return self.game_over
+    def clear_first_click(self, x, y):
+        """
+        Moves the mines off the first clicked cell, and off its neighbors too when an opening is wanted. Every mine
+        goes to a random free cell outside of that area and only the constants around the old and new positions get
+        updated, so this costs at most 9 moves, whatever the density. Boards too crowded for an opening only get a safe
+        first cell
+        :param x: x of the first clicked cell
+        :param y: y of the first clicked cell
+        """
+        area = {(x, y)}
+        if self.opening and self.rows * self.cols - self.mines >= 1 + len(self.get_neighbors(x, y)):
+            area.update(self.get_neighbors(x, y))
+        moves = []
+        for i, j in sorted(area):
+            if self.is_mine(i, j):
+                # the density is below 0.5, so about every second draw finds a free cell
+                while True:
+                    target = divmod(self.rng.randrange(self.rows * self.cols), self.rows)
+                    if target not in area and not self.is_mine(*target):
+                        break
+                self.move_mine((i, j), target)
+                moves.append(((i, j), target))
+        if self.debug:
+            self.check_consistency()
+        self.trace.emit(MINES_MOVED, moves=moves)
+
+    def move_mine(self, source, target):
+        """
+        Moves a mine from ``source`` to the free cell ``target`` and updates the constants of both neighborhoods
+        :param source: (x, y) of the mine
+        :param target: (x, y) of a cell without mine
+        """
+        constants = self.constants
+        source = source[0] * self.rows + source[1]
+        target = target[0] * self.rows + target[1]
+        mines = 0
+        for n in self.topology.neighbor_indices(source):
+            if constants[n] == 9:
+                mines += 1
+            else:
+                constants[n] -= 1
+        constants[source] = mines
+        constants[target] = 9
+        for n in self.topology.neighbor_indices(target):
+            if constants[n] != 9:
+                constants[n] += 1
+
+    def finish(self, result):
+        """
+        Ends the game with ``result``. The solver also ends the game, when it knows every cell before the last one is
+        uncovered
+        :param result: "Won" or "Lost"
+        """
+        changed = not self.game_over or self.result != result
+        self.game_over = True
+        self.result = result
+        if changed:
+            self.trace.emit(GAME_OVER, result=result)
 
     def uncover_zeroes(self, x, y):
         """
-        uncovers all neighboring zeroes
-        :param x: x of current cell
-        :param y: x of current cell
+        Scanline flood fill from the zero at ``(x, y)``: uncovers the zero region around it and the border of numbers.
+        A span is a run of zeros in one column (consecutive in memory). Each span gets uncovered together with the
+        cells next to it in the neighboring columns, zeros among those start new spans. Iterative, so regions of any
+        size work
+        :param x: x of an uncovered zero
+        :param y: y of an uncovered zero
+        :return: delta as list of (x, y, constant) of the newly uncovered cells
         """
-        neighbors = self.get_neighbors(x, y)
-        for neigh in neighbors:
-            if self.board[neigh[0]][neigh[1]] not in self.uncovered:
-                self.uncover(neigh[0], neigh[1])
+        rows, constants, state = self.rows, self.constants, self.state
+        delta = []
+        expanded = set()  # zeros, whose span has been filled
+        seeds = [(x, y)]
+        while seeds:
+            x, y = seeds.pop()
+            if x * rows + y in expanded:
+                continue
+            start = end = y
+            while start > 0 and constants[x * rows + start - 1] == 0:
+                start -= 1
+            while end < rows - 1 and constants[x * rows + end + 1] == 0:
+                end += 1
+            expanded.update(range(x * rows + start, x * rows + end + 1))
+            for i in (x - 1, x, x + 1):
+                if not 0 <= i < self.cols:
+                    continue
+                for j in range(max(0, start - 1), min(rows, end + 2)):
+                    index = i * rows + j
+                    if not state[index] & UNCOVERED_BIT:
+                        delta.append((i, j, self.reveal(i, j)))
+                    if i != x and constants[index] == 0 and index not in expanded:
+                        seeds.append((i, j))
+        return delta
 
     def get_neighbors(self, x, y):
         """
-        Returns x and x coordinate-list of neighbors
+        Returns x and y coordinates of neighbors, shared with all games of this size through the topology
         :param x: x of current cell
-        :param y: x of current cell
-        :return: neighbors as (x,x)-list
+        :param y: y of current cell
+        :return: neighbors as (x,y)-tuple
         """
-        neighbors = []
-        x_vals = [x - 1, x, x + 1]
-        y_vals = [y - 1, y, y + 1]
-
-        # collect neighbours only in bounds
-        for i in range(0, 3):
-            for j in range(0, 3):
-                if i == 1 and j == 1:  # skip self
-                    continue
-                if 0 <= x_vals[i] <= self.cols - 1 and 0 <= y_vals[j] <= self.rows - 1:
-                    neighbors.append((x_vals[i], y_vals[j]))
-
-        return neighbors
+        index = x * self.rows + y
+        return self.topology.neighbor_tuples[index] or self.topology.neighbor_coordinates(index)
 
     def flag(self, x, y):
-        cell = self.board[x][y]
-        if cell in self.uncovered:
+        index = x * self.rows + y
+        if self.state[index] & UNCOVERED_BIT:
             return
-        cell.marked = not cell.marked
-        self.marked.add(cell) if cell.marked else self.marked.remove(cell)
+        self.state[index] ^= MARKED_BIT
+        marked = bool(self.state[index] & MARKED_BIT)
+        self.marked_count += 1 if marked else -1
+        self.trace.emit(FLAG, x=x, y=y, marked=marked)
 
     def is_mine(self, x, y):
-        return self.board[x][y].constant == 9
+        return self.constants[x * self.rows + y] == 9
+
+    def is_uncovered(self, x, y):
+        return bool(self.state[x * self.rows + y] & UNCOVERED_BIT)
+
+    def is_marked(self, x, y):
+        return bool(self.state[x * self.rows + y] & MARKED_BIT)
+
+    def coordinates_with(self, bit):
+        """
+        :param bit: ``MARKED_BIT`` or ``UNCOVERED_BIT``
+        :return: set of the coordinates of every cell, whose state has ``bit``
+        """
+        return {divmod(index, self.rows) for index, state in enumerate(self.state) if state & bit}
 
     def uncovered_to_coordinates(self):
-        return set([cell.to_coordinate() for cell in self.uncovered])
+        return self.coordinates_with(UNCOVERED_BIT)
 
     def marked_to_coordinates(self):
-        return set([cell.to_coordinate() for cell in self.marked])
+        return self.coordinates_with(MARKED_BIT)
 
     def print(self):
         """
@@ -147,14 +330,84 @@ class Minesweeper:
         print("Board: \n")
         for x in range(self.cols):
             for y in range(self.rows):
-                if self.board[x][y].constant == 9:
+                if self.constants[x * self.rows + y] == 9:
                     print("| *", end="")
                 else:
-                    print("|", self.board[x][y].constant, end="")
+                    print("|", self.constants[x * self.rows + y], end="")
             print("|")
 
 
+class Board:
+    """View of a game as ``board[x][y]``, that creates cell views on access"""
+    __slots__ = ("game",)
+
+    def __init__(self, game):
+        self.game = game
+
+    def __len__(self):
+        return self.game.cols
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.game.cols:
+            raise IndexError(x)
+        return Column(self.game, x)
+
+    def __iter__(self):
+        return (Column(self.game, x) for x in range(self.game.cols))
+
+
+class Column:
+    """View of column ``x`` of a game"""
+    __slots__ = ("game", "x")
+
+    def __init__(self, game, x):
+        self.game = game
+        self.x = x
+
+    def __len__(self):
+        return self.game.rows
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.game.rows:
+            raise IndexError(y)
+        return CellView(self.game, self.x, y)
+
+    def __setitem__(self, y, cell):
+        """Writes constant and mark of ``cell`` to position ``(x, y)``, e.g. to set up test patterns"""
+        if not 0 <= y < self.game.rows:
+            raise IndexError(y)
+        view = CellView(self.game, self.x, y)
+        view.constant = cell.constant
+        view.marked = cell.marked
+
+    def __iter__(self):
+        return (CellView(self.game, self.x, y) for y in range(self.game.rows))
+
+
+class CellSet:
+    """
+    Set-like view of the cells, whose state has ``bit``. Length is a counter of the game, membership a lookup of the
+    state byte, only iterating scans the board
+    """
+    __slots__ = ("game", "bit")
+
+    def __init__(self, game, bit):
+        self.game = game
+        self.bit = bit
+
+    def __len__(self):
+        return self.game.uncovered_count if self.bit == UNCOVERED_BIT else self.game.marked_count
+
+    def __contains__(self, cell):
+        return bool(self.game.state[cell.x * self.game.rows + cell.y] & self.bit)
+
+    def __iter__(self):
+        return (CellView(self.game, x, y) for x, y in self.game.coordinates_with(self.bit))
+
+
 class Cell:
+    """Plain cell, that isn't bound to a game. Equal cells have the same position and constant"""
+    __slots__ = ("x", "y", "constant", "marked")
 
     def __init__(self, x, y, constant):
         self.x = x
@@ -166,10 +419,39 @@ class Cell:
         return self.x, self.y
 
     def __eq__(self, other):
-        return self.x == other.x and self.y == other.x and self.constant == other.constant
+        return self.x == other.x and self.y == other.y and self.constant == other.constant
 
     def __hash__(self):
-        return hash((self.x, self.y, self.constant))
+        return hash((self.x, self.y))
 
     def __str__(self):
         return "(x:" + str(self.x) + ",y:" + str(self.y) + ",constant:" + str(self.constant) + ")"
+
+
+class CellView(Cell):
+    """Cell at ``(x, y)`` of a game, whose constant and mark are read from and written to the game's arrays"""
+    __slots__ = ("game", "index")
+
+    def __init__(self, game, x, y):
+        self.game = game
+        self.x = x
+        self.y = y
+        self.index = x * game.rows + y
+
+    @property
+    def constant(self):
+        return self.game.constants[self.index]
+
+    @constant.setter
+    def constant(self, constant):
+        self.game.constants[self.index] = constant
+
+    @property
+    def marked(self):
+        return bool(self.game.state[self.index] & MARKED_BIT)
+
+    @marked.setter
+    def marked(self, marked):
+        if marked != self.marked:
+            self.game.state[self.index] ^= MARKED_BIT
+            self.game.marked_count += 1 if marked else -1
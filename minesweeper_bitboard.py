@@ -0,0 +1,135 @@
+NEIGHBOR_OFFSETS = [(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]
+
+
+class BitboardEngine:
+    """
+    Deduction engine, that keeps the state of the board as Python integers (bitboards). Cell ``(x, y)`` is bit
+    ``y * stride + x``. Every row has one padding bit (``stride = cols + 1``), so shifting by one never wraps a cell
+    into the next row. Numbers (constants and neighbor counts) are stored bit-sliced as a list of bitboards, one per
+    bit of the number, so they can be added and compared for the whole board at once.
+
+    Only the trivial deductions are done here: when a revealed cell already has as many known mines as its constant,
+    every other covered neighbor is safe, and when its known mines plus unknown neighbors equal its constant, every
+    unknown neighbor is a mine
+    """
+
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.stride = cols + 1
+        self.mask = 0  # every cell of the board without padding bits
+        for y in range(rows):
+            self.mask |= ((1 << cols) - 1) << (y * self.stride)
+        self.shifts = [dy * self.stride + dx for dx, dy in NEIGHBOR_OFFSETS]
+
+        self.revealed = 0
+        self.flagged = 0
+        self.safe = 0
+        self.mines = 0
+        self.constants = [0, 0, 0, 0]  # bit-sliced constants of revealed cells
+
+    def bit(self, x, y):
+        return 1 << (y * self.stride + x)
+
+    def cells(self, board):
+        """
+        Yields the coordinates of every set bit of ``board``
+
+        :param board: bitboard
+        :return: generator of (x, y)
+        """
+        while board:
+            low = board & -board
+            index = low.bit_length() - 1
+            yield index % self.stride, index // self.stride
+            board ^= low
+
+    def reveal(self, x, y, constant):
+        bit = self.bit(x, y)
+        self.revealed |= bit
+        self.safe &= ~bit
+        for i in range(len(self.constants)):
+            if constant >> i & 1:
+                self.constants[i] |= bit
+
+    def flag(self, x, y):
+        self.flagged |= self.bit(x, y)
+
+    def mark_mine(self, x, y):
+        self.mines |= self.bit(x, y)
+
+    def shift(self, board, offset):
+        return (board << offset if offset > 0 else board >> -offset) & self.mask
+
+    def dilate(self, board):
+        """Returns every cell, that is a neighbor of a cell in ``board``"""
+        result = 0
+        for offset in self.shifts:
+            result |= self.shift(board, offset)
+        return result
+
+    def count(self, board):
+        """
+        Counts for every cell how many of its neighbors are set in ``board``. Each shifted board gets added to the
+        bit-sliced sum with a ripple carry
+
+        :param board: bitboard
+        :return: bit-sliced neighbor counts
+        """
+        planes = []
+        for offset in self.shifts:
+            carry = self.shift(board, offset)
+            for i in range(len(planes)):
+                if not carry:
+                    break
+                planes[i], carry = planes[i] ^ carry, planes[i] & carry
+            if carry:
+                planes.append(carry)
+        return planes
+
+    @staticmethod
+    def add(a, b):
+        """Adds two bit-sliced numbers"""
+        result = []
+        carry = 0
+        for i in range(max(len(a), len(b))):
+            x = a[i] if i < len(a) else 0
+            y = b[i] if i < len(b) else 0
+            result.append(x ^ y ^ carry)
+            carry = (x & y) | (carry & (x ^ y))
+        result.append(carry)
+        return result
+
+    def equal(self, a, b):
+        """Returns every cell, where the bit-sliced numbers ``a`` and ``b`` are equal"""
+        result = self.mask
+        for i in range(max(len(a), len(b))):
+            x = a[i] if i < len(a) else 0
+            y = b[i] if i < len(b) else 0
+            result &= ~(x ^ y)
+        return result
+
+    def deduce(self):
+        """
+        Repeats the trivial deductions over the whole board until nothing changes anymore
+
+        :return: tuple (bitboard of new safe cells, bitboard of new mines)
+        """
+        new_safe = 0
+        new_mines = 0
+        while True:
+            known_mines = self.flagged | self.mines
+            unknown = self.mask & ~(self.revealed | self.safe | known_mines)
+            mine_count = self.count(known_mines)
+            # every mine around these cells is known -> their unknown neighbors are safe
+            done = self.revealed & self.equal(self.constants, mine_count)
+            # known mines plus unknown neighbors meet the constant -> their unknown neighbors are mines
+            full = self.revealed & self.equal(self.constants, self.add(mine_count, self.count(unknown)))
+            safe = self.dilate(done) & unknown
+            mines = self.dilate(full) & unknown & ~safe
+            if not safe and not mines:
+                return new_safe, new_mines
+            self.safe |= safe
+            self.mines |= mines
+            new_safe |= safe
+            new_mines |= mines
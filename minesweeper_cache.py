@@ -0,0 +1,78 @@
+from collections import OrderedDict
+
+# the 8 symmetries of the square grid: identity, rotations and reflections
+SYMMETRIES = [
+    lambda x, y: (x, y), lambda x, y: (-y, x), lambda x, y: (-x, -y), lambda x, y: (y, -x),
+    lambda x, y: (-x, y), lambda x, y: (y, x), lambda x, y: (x, -y), lambda x, y: (-y, -x),
+]
+
+
+def canonical_signature(cells, constraints):
+    """
+    Computes a signature of a frontier component, that is the same for every translation, rotation and reflection of
+    it. For each symmetry of the grid, the cells get transformed and sorted by their new coordinates, which numbers
+    them. The constraints are written down with those numbers and sorted. The smallest of the 8 results is the
+    signature, its numbering is the canonical order of the cells.
+
+    The solutions of a component only depend on the constraints, so components with the same signature have the same
+    solution counts (with cells in canonical order)
+
+    :param cells: list of cells of the component
+    :param constraints: list of tuples (cells of the component in the scope, amount of mines in the scope, amount of
+        unknown cells of the scope outside the component)
+    :return: tuple (signature, list of the cells in canonical order)
+    """
+    best = None
+    for transform in SYMMETRIES:
+        moved = {cell: transform(*cell) for cell in cells}
+        order = sorted(cells, key=moved.get)
+        position = {cell: i for i, cell in enumerate(order)}
+        signature = (len(cells), tuple(sorted((tuple(sorted(position[cell] for cell in scope)), mines, outside)
+                                              for scope, mines, outside in constraints)))
+        if best is None or signature < best[0]:
+            best = (signature, order)
+    return best
+
+
+class ComponentCache:
+    """
+    Bounded LRU cache for solution counts of frontier components (see ``count_solutions``), keyed by canonical
+    signature (see ``canonical_signature``). Per-cell counts are stored in canonical order. The same small components
+    recur all the time, over moves and over games, so one cache is shared by default (``component_cache``)
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        :param key: signature of the component
+        :return: cached solution counts or None
+        """
+        counts = self.entries.get(key)
+        if counts is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return counts
+
+    def put(self, key, counts):
+        self.entries[key] = counts
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+component_cache = ComponentCache()
@@ -0,0 +1,95 @@
+from math import gcd
+
+
+def normalize(coefficients, constant):
+    """
+    Divides an equation by the gcd of its numbers and makes the first coefficient positive, so equal equations have
+    equal representations and numbers stay small during elimination
+
+    :param coefficients: dict mapping variables to integer coefficients (no zeros)
+    :param constant: integer right-hand side
+    :return: tuple (coefficients, constant)
+    """""
+    divisor = gcd(constant, *coefficients.values())
+    if next(iter(coefficients.values())) < 0:
+        divisor = -divisor
+    if divisor != 1:
+        coefficients = {var: c // divisor for var, c in coefficients.items()}
+        constant //= divisor
+    return coefficients, constant
+
+
+def eliminate(row, pivot_row, var):
+    """
+    Removes ``var`` from ``row`` with ``pivot_row`` (fraction-free: ``c * row - d * pivot_row``)
+
+    :param row: tuple (coefficients, constant)
+    :param pivot_row: tuple (coefficients, constant) containing ``var``
+    :param var: variable to eliminate
+    :return: tuple (coefficients, constant), coefficients can be empty
+    """""
+    coefficients, constant = row
+    pivot_coefficients, pivot_constant = pivot_row
+    c = pivot_coefficients[var]
+    d = coefficients[var]
+    result = {v: c * coefficient for v, coefficient in coefficients.items()}
+    for v, coefficient in pivot_coefficients.items():
+        value = result.get(v, 0) - d * coefficient
+        if value:
+            result[v] = value
+        else:
+            result.pop(v, None)
+    constant = c * constant - d * pivot_constant
+    return normalize(result, constant) if result else (result, constant)
+
+
+def row_reduce(equations):
+    """
+    Brings a system of linear equations into reduced row echelon form with integer (fraction-free) Gauss-Jordan
+    elimination. Rows are sparse dicts, so independent parts of the system stay independent and cheap
+
+    :param equations: list of tuples (dict mapping variables to integer coefficients, integer constant)
+    :return: list of reduced rows, or None when the system is inconsistent
+    """""
+    pivots = {}  # pivot variable -> row, every pivot variable only appears in its own row
+    for coefficients, constant in equations:
+        row = (dict(coefficients), constant)
+        for var in [v for v in row[0] if v in pivots]:
+            row = eliminate(row, pivots[var], var)
+        if not row[0]:
+            if row[1] != 0:
+                return None
+            continue
+        row = normalize(*row)
+        var = next(iter(row[0]))
+        for other, pivot_row in pivots.items():
+            if var in pivot_row[0]:
+                pivots[other] = eliminate(pivot_row, row, var)
+        pivots[var] = row
+    return list(pivots.values())
+
+
+def forced_values(equations):
+    """
+    Reads off forced values of 0/1 variables from the reduced system. For every row, the left side is between the
+    sum of its negative and the sum of its positive coefficients. When the constant hits one of those bounds, every
+    variable of the row is forced (1 for positive and 0 for negative coefficients at the upper bound, the other way
+    round at the lower bound)
+
+    :param equations: list of tuples (dict mapping variables to integer coefficients, integer constant)
+    :return: dict mapping forced variables to 0 or 1, or None when the system is inconsistent
+    """""
+    rows = row_reduce(equations)
+    if rows is None:
+        return None
+    forced = {}
+    for coefficients, constant in rows:
+        upper = sum(c for c in coefficients.values() if c > 0)
+        lower = sum(c for c in coefficients.values() if c < 0)
+        if constant == upper:
+            forced.update((var, 1 if c > 0 else 0) for var, c in coefficients.items())
+        elif constant == lower:
+            forced.update((var, 0 if c > 0 else 1) for var, c in coefficients.items())
+        elif not lower <= constant <= upper:
+            return None
+    return forced
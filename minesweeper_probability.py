@@ -0,0 +1,151 @@
+from fractions import Fraction
+from math import comb
+
+
+def count_solutions(solutions, size):
+    """
+    Counts the valid assignments of one frontier component per amount of mines. For every amount of mines we keep the
+    amount of solutions and how often each cell of the component is a mine in those solutions
+
+    :param solutions: list of valid assignments (lists of 0 and 1) for the cells of the component
+    :param size: amount of cells in the component
+    :return: dict mapping amount of mines to a tuple (amount of solutions, list of mine counts per cell)
+    """""
+    counts = {}
+    for solution in solutions:
+        total, cells = counts.get(sum(solution), (0, [0] * size))
+        counts[sum(solution)] = (total + 1, [c + value for c, value in zip(cells, solution)])
+    return counts
+
+
+def count_assignments(size, constraints, mines_left):
+    """
+    Counts the valid assignments of one frontier component per amount of mines like ``count_solutions``, without
+    enumerating them. Cells get assigned in order and assignments with the same mines in every open constraint and the
+    same amount of mines in total are merged into one state (dynamic programming). A constraint is closed after its last
+    cell, then its sum is checked and dropped from the state. With cells in breadth-first order only few constraints
+    are open at once, so the amount of states stays small, while the amount of solutions grows exponentially
+
+    :param size: amount of cells in the component
+    :param constraints: list of tuples (cell positions, lower, upper): the amount of mines in those cells has to be
+        between ``lower`` and ``upper``
+    :param mines_left: amount of mines left
+    :return: dict mapping amount of mines to a tuple (amount of solutions, list of mine counts per cell)
+    """""
+    member_of = [[] for _ in range(size)]
+    last = [max(cells) for cells, _, _ in constraints]
+    for c, (cells, _, _) in enumerate(constraints):
+        for cell in cells:
+            member_of[cell].append(c)
+    closing = [[c for c in member_of[cell] if last[c] == cell] for cell in range(size)]
+
+    states = {((0,) * len(constraints), 0): (1, [0] * size)}  # (mines per constraint, mines) -> (total, cells)
+    for cell in range(size):
+        following = {}
+        for (sums, mines), (total, cells) in states.items():
+            for value in (0, 1):
+                if mines + value > mines_left:
+                    break
+                new_sums = list(sums)
+                if value:
+                    for c in member_of[cell]:
+                        new_sums[c] += 1
+                if any(new_sums[c] > constraints[c][2] for c in member_of[cell]):
+                    continue
+                if any(new_sums[c] < constraints[c][1] for c in closing[cell]):
+                    continue
+                for c in closing[cell]:
+                    new_sums[c] = 0
+                key = (tuple(new_sums), mines + value)
+                new_cells = cells.copy()
+                new_cells[cell] += value * total
+                if key in following:
+                    old_total, old_cells = following[key]
+                    following[key] = (old_total + total, [a + b for a, b in zip(old_cells, new_cells)])
+                else:
+                    following[key] = (total, new_cells)
+        states = following
+
+    counts = {}
+    for (_, mines), (total, cells) in states.items():
+        if mines in counts:
+            old_total, old_cells = counts[mines]
+            counts[mines] = (old_total + total, [a + b for a, b in zip(old_cells, cells)])
+        else:
+            counts[mines] = (total, cells)
+    return counts
+
+
+def convolve(a, b):
+    """
+    Convolves two lists indexed by amount of mines. The result at index ``k`` is the amount of combinations of both
+    lists with ``k`` mines in total
+
+    :param a: list of solution counts per amount of mines
+    :param b: list of solution counts per amount of mines
+    :return: list of combined solution counts per amount of mines
+    """""
+    result = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                result[i + j] += x * y
+    return result
+
+
+def mine_probabilities(component_counts, unconstrained, mines_left):
+    """
+    Calculates the exact mine probability of every covered, undecided cell. Components are independent apart from the
+    total amount of mines, so a combination of component solutions with ``k`` mines in total is weighted with the
+    amount of ways to place the remaining ``mines_left - k`` mines on the ``unconstrained`` cells (binomial
+    coefficient). Summing the weighted counts gives the probability of every component cell, the expected amount of
+    remaining mines gives the probability of the unconstrained cells.
+
+    Counts are combined with prefix and suffix convolutions, so every component only gets convolved with the
+    combination of all other components once
+
+    :param component_counts: list of results of ``count_solutions``, one per component
+    :param unconstrained: amount of undecided cells, that aren't part of any component
+    :param mines_left: amount of mines left on the board
+    :return: tuple (list of per-cell probabilities per component, probability of an unconstrained cell or None), or
+        None, when there is no consistent combination
+    """""
+    if not all(component_counts):
+        return None
+    polynomials = []
+    for counts in component_counts:
+        polynomial = [0] * (max(counts) + 1)
+        for k, (total, _) in counts.items():
+            polynomial[k] = total
+        polynomials.append(polynomial)
+
+    prefix = [[1]]
+    for polynomial in polynomials:
+        prefix.append(convolve(prefix[-1], polynomial))
+    suffix = [[1]]
+    for polynomial in reversed(polynomials):
+        suffix.append(convolve(suffix[-1], polynomial))
+    suffix.reverse()
+
+    def weight(k):  # ways to place the remaining mines on the unconstrained cells
+        rest = mines_left - k
+        return comb(unconstrained, rest) if 0 <= rest <= unconstrained else 0
+
+    combined = prefix[-1]
+    norm = sum(total * weight(k) for k, total in enumerate(combined))
+    if norm == 0:
+        return None
+
+    probabilities = []
+    for i, counts in enumerate(component_counts):
+        others = convolve(prefix[i], suffix[i + 1])
+        weights = {k: sum(total * weight(k + j) for j, total in enumerate(others)) for k in counts}
+        size = len(next(iter(counts.values()))[1])
+        probabilities.append([Fraction(sum(cells[c] * weights[k] for k, (_, cells) in counts.items()), norm)
+                              for c in range(size)])
+
+    free = None
+    if unconstrained:
+        expected = sum(total * weight(k) * (mines_left - k) for k, total in enumerate(combined))
+        free = Fraction(expected, norm * unconstrained)
+    return probabilities, free
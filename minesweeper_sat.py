@@ -0,0 +1,317 @@
+from functools import lru_cache
+from itertools import combinations
+
+
+@lru_cache(maxsize=None)
+def exactly(n, k):
+    """
+    Binomial encoding of ``exactly k of n`` variables being true: every ``k + 1`` variables contain a false one and
+    every ``n - k + 1`` variables contain a true one. Without auxiliary variables, so this is meant for the small scopes
+    of uncovered cells (at most 8 neighbors). The clauses are a template over positions ``1..n`` and get cached, because
+    the same few shapes occur over and over
+
+    :param n: amount of variables
+    :param k: amount of true variables
+    :return: tuple of clauses (tuples of positions, negative for negated)
+    """""
+    if not 0 <= k <= n:
+        return ((),)
+    at_most = [tuple(-i for i in subset) for subset in combinations(range(1, n + 1), k + 1)]
+    at_least = [subset for subset in combinations(range(1, n + 1), n - k + 1)]
+    return tuple(at_most + at_least)
+
+
+@lru_cache(maxsize=None)
+def at_most(n, k):
+    """
+    Sequential counter encoding of ``at most k of n`` variables being true (Sinz 2005). Auxiliary variable ``s(i, j)``
+    means, that at least ``j`` of the first ``i`` variables are true. Positions ``1..n`` are the variables, the
+    auxiliary variables follow after them
+
+    :param n: amount of variables
+    :param k: maximum amount of true variables
+    :return: tuple (tuple of clauses, amount of auxiliary variables)
+    """""
+    if k < 0:
+        return ((),), 0
+    if k == 0:
+        return tuple((-i,) for i in range(1, n + 1)), 0
+    if k >= n:
+        return (), 0
+
+    def s(i, j):
+        return n + (i - 1) * k + j
+
+    clauses = [(-1, s(1, 1))]
+    clauses += [(-s(1, j),) for j in range(2, k + 1)]
+    for i in range(2, n):
+        clauses.append((-i, s(i, 1)))
+        clauses.append((-s(i - 1, 1), s(i, 1)))
+        for j in range(2, k + 1):
+            clauses.append((-i, -s(i - 1, j - 1), s(i, j)))
+            clauses.append((-s(i - 1, j), s(i, j)))
+        clauses.append((-i, -s(i - 1, k)))
+    clauses.append((-n, -s(n - 1, k)))
+    return tuple(clauses), (n - 1) * k
+
+
+class SatSolver:
+    """
+    Small CDCL SAT solver. Variables are numbered from 1, literals are ``v`` or ``-v``. Every clause watches two of its
+    literals (always the first two), so propagation only visits clauses, when one of their watched literals becomes
+    false. Conflicts get analyzed to the first unique implication point, the learned clause is kept and the search
+    jumps back to its second highest level. Branching picks the most active variable (VSIDS) with saved phases, and
+    restarts happen after a growing amount of conflicts.
+
+    The solver is incremental: clauses can be added between calls of ``solve`` and learned clauses are kept, so many
+    queries like "can this cell be a mine" under assumptions are cheap after the first one
+    """
+
+    def __init__(self):
+        self.num_vars = 0
+        self.clauses = []
+        self.watches = {}  # literal -> indices of clauses watching it
+        self.assign = [None]  # variable -> True, False or None
+        self.level = [0]
+        self.reason = [None]  # variable -> index of the clause, that implied it
+        self.activity = [0.0]
+        self.phase = [False]
+        self.trail = []
+        self.trail_lim = []  # trail index, where each decision level starts
+        self.qhead = 0
+        self.increment = 1.0
+        self.ok = True
+        self.model = None
+
+    def new_var(self):
+        self.num_vars += 1
+        self.watches[self.num_vars] = []
+        self.watches[-self.num_vars] = []
+        self.assign.append(None)
+        self.level.append(0)
+        self.reason.append(None)
+        self.activity.append(0.0)
+        self.phase.append(False)
+        return self.num_vars
+
+    def value(self, literal):
+        value = self.assign[abs(literal)]
+        if value is None:
+            return None
+        return value if literal > 0 else not value
+
+    def add_clause(self, literals):
+        """
+        Adds a clause. Literals, that are already false for good, are dropped and satisfied clauses are ignored
+
+        :param literals: iterable of literals
+        :return: False, when the formula became unsatisfiable
+        """""
+        if not self.ok:
+            return False
+        clause = []
+        for literal in literals:
+            value = self.value(literal)
+            if value is True or -literal in clause:
+                return True
+            if value is None and literal not in clause:
+                clause.append(literal)
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self.enqueue(clause[0], None)
+            self.ok = self.propagate() is None
+        else:
+            self.clauses.append(clause)
+            self.watches[clause[0]].append(len(self.clauses) - 1)
+            self.watches[clause[1]].append(len(self.clauses) - 1)
+        return self.ok
+
+    def add_template(self, clauses, variables, aux=0):
+        """
+        Adds the clauses of an encoding template (see ``exactly`` and ``at_most``) for ``variables``
+
+        :param clauses: clauses over positions
+        :param variables: list of variables for positions ``1..len(variables)``
+        :param aux: amount of auxiliary variables of the template, they get created here
+        :return: False, when the formula became unsatisfiable
+        """""
+        variables = list(variables) + [self.new_var() for _ in range(aux)]
+        for clause in clauses:
+            self.add_clause([variables[p - 1] if p > 0 else -variables[-p - 1] for p in clause])
+        return self.ok
+
+    def add_exactly(self, variables, k):
+        return self.add_template(exactly(len(variables), k), variables)
+
+    def add_at_most(self, variables, k):
+        clauses, aux = at_most(len(variables), k)
+        return self.add_template(clauses, variables, aux)
+
+    def enqueue(self, literal, reason):
+        var = abs(literal)
+        self.assign[var] = literal > 0
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """
+        Unit propagation over the watched literals
+
+        :return: index of a conflicting clause or None
+        """""
+        while self.qhead < len(self.trail):
+            false_literal = -self.trail[self.qhead]
+            self.qhead += 1
+            watchers = self.watches[false_literal]
+            kept = []
+            conflict = None
+            for i, index in enumerate(watchers):
+                clause = self.clauses[index]
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                first = self.value(clause[0])
+                if first is True:
+                    kept.append(index)
+                    continue
+                for m in range(2, len(clause)):
+                    if self.value(clause[m]) is not False:  # found a new literal to watch
+                        clause[1], clause[m] = clause[m], clause[1]
+                        self.watches[clause[1]].append(index)
+                        break
+                else:
+                    kept.append(index)
+                    if first is False:
+                        conflict = index
+                        kept.extend(watchers[i + 1:])
+                        break
+                    self.enqueue(clause[0], index)
+            self.watches[false_literal] = kept
+            if conflict is not None:
+                return conflict
+        return None
+
+    def analyze(self, conflict):
+        """
+        Resolves the conflict back to the first unique implication point of the current level
+
+        :param conflict: index of the conflicting clause
+        :return: tuple (learned clause with the asserting literal first, level to jump back to)
+        """""
+        learned = [None]
+        seen = set()
+        counter = 0
+        literal = None
+        clause = self.clauses[conflict]
+        index = len(self.trail) - 1
+        current = len(self.trail_lim)
+        while True:
+            for q in clause:
+                var = abs(q)
+                if q == literal or var in seen or self.level[var] == 0:
+                    continue
+                seen.add(var)
+                self.bump(var)
+                if self.level[var] == current:
+                    counter += 1
+                else:
+                    learned.append(q)
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            counter -= 1
+            if counter == 0:
+                break
+            clause = self.clauses[self.reason[abs(literal)]]
+        learned[0] = -literal
+
+        level = 0
+        if len(learned) > 1:  # watch the literal of the highest remaining level second
+            second = max(range(1, len(learned)), key=lambda i: self.level[abs(learned[i])])
+            learned[1], learned[second] = learned[second], learned[1]
+            level = self.level[abs(learned[1])]
+        return learned, level
+
+    def bump(self, var):
+        self.activity[var] += self.increment
+        if self.activity[var] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.increment *= 1e-100
+
+    def cancel_until(self, level):
+        if len(self.trail_lim) <= level:
+            return
+        for literal in self.trail[self.trail_lim[level]:]:
+            var = abs(literal)
+            self.phase[var] = self.assign[var]
+            self.assign[var] = None
+            self.reason[var] = None
+        del self.trail[self.trail_lim[level]:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def pick_branch(self):
+        best = None
+        for var in range(1, self.num_vars + 1):
+            if self.assign[var] is None and (best is None or self.activity[var] > self.activity[best]):
+                best = var
+        return best
+
+    def solve(self, assumptions=()):
+        """
+        Searches a satisfying assignment, in which every literal of ``assumptions`` is true. The assumptions are the
+        first decisions, so everything learned stays valid for later calls
+
+        :param assumptions: iterable of literals
+        :return: True and the assignment in ``model`` (list indexed by variable), or False
+        """""
+        self.model = None
+        if not self.ok:
+            return False
+        assumptions = list(assumptions)
+        conflicts = 0
+        restart = 100
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                learned, level = self.analyze(conflict)
+                self.cancel_until(level)
+                if len(learned) == 1:
+                    self.enqueue(learned[0], None)
+                else:
+                    self.clauses.append(learned)
+                    self.watches[learned[0]].append(len(self.clauses) - 1)
+                    self.watches[learned[1]].append(len(self.clauses) - 1)
+                    self.enqueue(learned[0], len(self.clauses) - 1)
+                self.increment /= 0.95
+                conflicts += 1
+                continue
+
+            if conflicts >= restart:
+                conflicts = 0
+                restart = int(restart * 1.5)
+                self.cancel_until(0)
+                continue
+            level = len(self.trail_lim)
+            if level < len(assumptions):
+                literal = assumptions[level]
+                value = self.value(literal)
+                if value is False:  # assumptions contradict the formula
+                    self.cancel_until(0)
+                    return False
+                self.trail_lim.append(len(self.trail))
+                if value is None:
+                    self.enqueue(literal, None)
+                continue
+            var = self.pick_branch()
+            if var is None:
+                self.model = list(self.assign)
+                self.cancel_until(0)
+                return True
+            self.trail_lim.append(len(self.trail))
+            self.enqueue(var if self.phase[var] else -var, None)
@@ -0,0 +1,375 @@
+import argparse
+import asyncio
+import json
+import random
+import socket
+import time
+from itertools import count
+from statistics import quantiles
+
+from minesweeper import Minesweeper, UNCOVERED_BIT, MARKED_BIT
+from minesweeper_trace import NULL_SINK, UNCOVERED, FLAG
+
+MAX_GAMES = 100000  # games open at once on one server
+MAX_CELLS = 500 * 500  # cells per game, a game costs about two bytes per cell plus the shared topology
+LINE_LIMIT = 16 * 1024 * 1024  # bytes per request or response line, an uncover of every cell of the largest game fits
+
+
+class GameServer:
+    """
+    Serves many games on one asyncio event loop. The protocol is JSON lines: every request is an object with ``op``,
+    the arguments of the operation and an optional ``id``, that gets echoed in the response. Each connection gets its
+    responses in request order, so clients can pipeline requests. Errors are answered with ``error`` and keep the
+    connection open. Games belong to the connection, that created them, and get dropped when it closes.
+
+    Operations:
+
+    - ``new``: rows, cols, mines, seed (optional), opening (optional) -> game
+    - ``uncover``: game, cells as list of [x, y], flood (default true) -> delta as list of [x, y, constant],
+      game_over, result
+    - ``flag``: game, x, y -> marked
+    - ``snapshot``: game -> rows, cols, mines, uncovered as list of [x, y, constant], marked as list of [x, y],
+      game_over, result
+    - ``close``: game
+
+    :param max_games: amount of games open at once, ``new`` fails above it
+    :param max_cells: amount of cells of a game, ``new`` fails above it
+    :param line_limit: length of a request line in bytes, longer requests get skipped and answered with ``error``
+    """
+
+    def __init__(self, max_games=MAX_GAMES, max_cells=MAX_CELLS, line_limit=LINE_LIMIT):
+        self.games = {}
+        self.ids = count(1)
+        self.max_games = max_games
+        self.max_cells = max_cells
+        self.line_limit = line_limit
+        self.requests = 0
+        self.operations = {"new": self.new_game, "uncover": self.uncover, "flag": self.flag,
+                           "snapshot": self.snapshot, "close": self.close_game}
+
+    async def handle(self, reader, writer):
+        """Serves one connection until the client closes it"""
+        owned = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError:  # closed by the client
+                    break
+                except asyncio.LimitOverrunError:
+                    await self.skip_line(reader)
+                    self.requests += 1
+                    response = {"error": "ValueError: request longer than {} bytes".format(self.line_limit)}
+                else:
+                    try:
+                        response = self.respond(line, owned)
+                    except Exception as error:  # a bug in one request must not drop the games of the connection
+                        response = {"error": "{}: {}".format(type(error).__name__, error)}
+                writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for game in owned:
+                self.games.pop(game, None)
+            writer.close()
+
+    @staticmethod
+    async def skip_line(reader):
+        """Drops the rest of a line, that is longer than the limit of ``reader``, so the next request starts clean"""
+        while True:
+            try:
+                await reader.readuntil(b"\n")
+                return
+            except asyncio.LimitOverrunError as error:  # the data stays in the buffer, drop what got checked
+                await reader.readexactly(error.consumed)
+
+    def respond(self, line, owned):
+        """
+        :param line: request as JSON line
+        :param owned: ids of the games of the connection
+        :return: response as dict
+        """
+        self.requests += 1
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request has to be an object")
+            request_id = request.pop("id", None)
+            operation = self.operations.get(request.pop("op", None))
+            if operation is None:
+                raise ValueError("unknown operation")
+            response = operation(owned, **request)
+        except (ValueError, KeyError, TypeError, AssertionError) as error:
+            response = {"error": "{}: {}".format(type(error).__name__, error)}
+        if request_id is not None:
+            response["id"] = request_id
+        return response
+
+    def game(self, game):
+        if game not in self.games:
+            raise KeyError("unknown game {}".format(game))
+        return self.games[game]
+
+    def new_game(self, owned, rows=9, cols=9, mines=10, seed=None, opening=False):
+        if len(self.games) >= self.max_games:
+            raise ValueError("too many games, at most {}".format(self.max_games))
+        if rows * cols > self.max_cells:
+            raise ValueError("board too large, at most {} cells".format(self.max_cells))
+        game_id = next(self.ids)
+        self.games[game_id] = Minesweeper(rows, cols, mines, rng=random.Random(seed), opening=opening)
+        owned.add(game_id)
+        return {"game": game_id}
+
+    @staticmethod
+    def check_cell(game, cell):
+        """
+        :raises ValueError: when ``cell`` isn't a pair of integer coordinates on the board of ``game``
+        """
+        if not (isinstance(cell, (list, tuple)) and len(cell) == 2
+                and all(isinstance(i, int) and not isinstance(i, bool) for i in cell)):
+            raise ValueError("cell {} is not a pair of integers".format(json.dumps(cell)))
+        x, y = cell
+        if not (0 <= x < game.cols and 0 <= y < game.rows):
+            raise ValueError("cell ({}, {}) is off the board".format(x, y))
+
+    def uncover(self, owned, game, cells, flood=True):
+        game = self.game(game)
+        if not isinstance(cells, list):
+            raise ValueError("cells has to be a list")
+        for cell in cells:  # the whole request gets checked first, an error must not leave half of it applied
+            self.check_cell(game, cell)
+        delta, game_over = game.uncover_many(cells, flood)
+        return {"delta": delta, "game_over": game_over, "result": game.result}
+
+    def flag(self, owned, game, x, y):
+        game = self.game(game)
+        self.check_cell(game, (x, y))
+        game.flag(x, y)
+        return {"marked": game.is_marked(x, y)}
+
+    def snapshot(self, owned, game):
+        game = self.game(game)
+        return {"rows": game.rows, "cols": game.cols, "mines": game.mines,
+                "uncovered": [(x, y, game.constants[x * game.rows + y]) for x, y in game.uncovered_to_coordinates()],
+                "marked": list(game.marked_to_coordinates()), "game_over": game.game_over, "result": game.result}
+
+    def close_game(self, owned, game):
+        self.game(game)
+        del self.games[game]
+        owned.discard(game)
+        return {}
+
+    async def start(self, address):
+        """
+        :param address: (host, port) for TCP, port 0 picks a free one, or a path for a Unix socket
+        :return: asyncio.Server
+        """
+        if isinstance(address, str):
+            return await asyncio.start_unix_server(self.handle, address, limit=self.line_limit)
+        return await asyncio.start_server(self.handle, *address, limit=self.line_limit)
+
+
+class GameClient:
+    """
+    Blocking client of a ``GameServer``. One connection can hold many games
+
+    :param address: (host, port) or path of a Unix socket
+    """
+
+    def __init__(self, address):
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self.socket = socket.socket(family, socket.SOCK_STREAM)
+        self.socket.connect(address)
+        if family == socket.AF_INET:
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.file = self.socket.makefile("rwb")
+
+    def call(self, op, **arguments):
+        """
+        Sends one request and waits for its response
+
+        :raises ValueError: when the server answers with an error
+        :return: response as dict
+        """
+        self.file.write(json.dumps(dict(arguments, op=op), separators=(",", ":")).encode() + b"\n")
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response
+
+    def new_game(self, rows=9, cols=9, mines=10, seed=None, opening=False, trace=None):
+        """
+        :return: RemoteGame, that can be passed to ``MinesweeperSolver``
+        """
+        response = self.call("new", rows=rows, cols=cols, mines=mines, seed=seed, opening=opening)
+        return RemoteGame(self, response["game"], rows, cols, mines, trace)
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+
+class RemoteGame(Minesweeper):
+    """
+    Game on a ``GameServer``, that looks like a local ``Minesweeper``, so the solver plays it unchanged. It mirrors
+    what the server told: constants of uncovered cells (covered cells read as 0), marks and the end of the game.
+    ``uncover_many``, ``uncover`` and ``flag`` are one round trip each. ``finish`` only ends the local mirror, the
+    server decides the result of its game by itself
+    """
+
+    def __init__(self, client, game_id, rows, cols, mines, trace=None):
+        self.client = client
+        self.id = game_id
+        self.rows = rows
+        self.cols = cols
+        self.mines = mines
+        self.rng = None
+        self.trace = NULL_SINK if trace is None else trace
+        self.debug = False
+        self.opening = False
+        self.constants = bytearray(rows * cols)
+        self.state = bytearray(rows * cols)
+        self.uncovered_count = 0
+        self.marked_count = 0
+        self.game_over = False
+        self.result = ""
+
+    def uncover(self, x, y):
+        if self.state[x * self.rows + y] & UNCOVERED_BIT:
+            return
+        self.uncover_many([(x, y)], flood=False)
+        return self.game_over
+
+    def uncover_many(self, cells, flood=True):
+        response = self.client.call("uncover", game=self.id, cells=list(cells), flood=flood)
+        delta = [tuple(cell) for cell in response["delta"]]
+        for x, y, constant in delta:
+            index = x * self.rows + y
+            self.constants[index] = constant
+            self.state[index] |= UNCOVERED_BIT
+            self.uncovered_count += 1
+            self.trace.emit(UNCOVERED, x=x, y=y, constant=constant)
+        if response["game_over"]:
+            self.finish(response["result"])
+        return delta, self.game_over
+
+    def flag(self, x, y):
+        marked = self.client.call("flag", game=self.id, x=x, y=y)["marked"]
+        index = x * self.rows + y
+        if marked != bool(self.state[index] & MARKED_BIT):
+            self.state[index] ^= MARKED_BIT
+            self.marked_count += 1 if marked else -1
+            self.trace.emit(FLAG, x=x, y=y, marked=marked)
+
+    def close(self):
+        self.client.call("close", game=self.id)
+
+
+async def play(address, games, rows, cols, mines, seed, latencies):
+    """
+    One benchmark client: plays ``games`` games on its own connection by uncovering random covered cells, one
+    request per move, and records the latency of every request
+
+    :return: amount of requests
+    """
+    if isinstance(address, str):
+        reader, writer = await asyncio.open_unix_connection(address, limit=LINE_LIMIT)
+    else:
+        reader, writer = await asyncio.open_connection(*address, limit=LINE_LIMIT)
+    rng = random.Random(seed)
+    requests = 0
+
+    async def call(**request):
+        nonlocal requests
+        tic = time.perf_counter()
+        writer.write(json.dumps(request, separators=(",", ":")).encode() + b"\n")
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - tic)
+        requests += 1
+        return response
+
+    for _ in range(games):
+        game = (await call(op="new", rows=rows, cols=cols, mines=mines, seed=rng.random()))["game"]
+        uncovered = set()
+        while True:
+            index = rng.randrange(rows * cols)
+            if index in uncovered:  # the game ends before most cells are uncovered, so redrawing is cheap
+                continue
+            response = await call(op="uncover", game=game, cells=[divmod(index, rows)])
+            uncovered.update(x * rows + y for x, y, _ in response["delta"])
+            if response["game_over"]:
+                break
+        await call(op="close", game=game)
+    writer.close()
+    return requests
+
+
+async def benchmark(address, clients, games, rows, cols, mines, seed):
+    """
+    Connects ``clients`` benchmark clients at once. Without ``address``, a server gets started on a free local port
+    in this event loop
+
+    :return: dict with requests, requests per second and latency percentiles in seconds
+    """
+    server = None
+    if address is None:
+        server = await GameServer().start(("127.0.0.1", 0))
+        address = server.sockets[0].getsockname()[:2]
+    latencies = []
+    tic = time.perf_counter()
+    clients = [play(address, games, rows, cols, mines, "{}:{}".format(seed, client), latencies)
+               for client in range(clients)]
+    counts = await asyncio.gather(*clients)
+    wall_time = time.perf_counter() - tic
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+    latencies.sort()
+    percentiles = quantiles(latencies, n=1000, method="inclusive") if len(latencies) > 1 else latencies * 999
+    return {"requests": sum(counts), "requests_per_second": sum(counts) / wall_time,
+            "latency_p50": percentiles[499], "latency_p99": percentiles[989], "latency_p999": percentiles[998],
+            "latency_max": latencies[-1]}
+
+
+async def serve(address):
+    server = await GameServer().start(address)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Game server for many concurrent games, speaking JSON lines")
+    parser.add_argument("command", choices=["serve", "bench"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="path of a Unix socket, instead of TCP")
+    parser.add_argument("--connect", action="store_true", help="bench against a running server instead of its own")
+    parser.add_argument("--clients", type=int, default=200, help="connections open at once")
+    parser.add_argument("--games", type=int, default=5, help="games per connection")
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--cols", type=int, default=30)
+    parser.add_argument("--mines", type=int, default=99)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    address = args.unix or (args.host, args.port)
+    if args.command == "serve":
+        asyncio.run(serve(address))
+        return None
+    result = asyncio.run(benchmark(address if args.connect else None, args.clients, args.games, args.rows,
+                                   args.cols, args.mines, args.seed))
+    print("{} requests from {} clients, {:.0f} requests/s".format(result["requests"], args.clients,
+                                                                  result["requests_per_second"]))
+    print("latency p50 {:.3f}ms, p99 {:.3f}ms, p99.9 {:.3f}ms, max {:.3f}ms".format(
+        *(result[key] * 1000 for key in ("latency_p50", "latency_p99", "latency_p999", "latency_max"))))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,72 @@
 import random
 
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for batched evaluation of assignments
+    np = None
+
+from minesweeper_bitboard import BitboardEngine
+from minesweeper_cache import canonical_signature, component_cache
+from minesweeper_linear import forced_values
+from minesweeper_probability import count_assignments, count_solutions, mine_probabilities
+from minesweeper_sat import SatSolver
+from minesweeper_stats import SolverStats, timed
+from minesweeper_tables import get_windows
+from minesweeper_topology import get_topology
+from minesweeper_trace import GUESS
+
+MAX_COMPONENT_SIZE = 24  # larger components are counted by dynamic programming instead of enumerating solutions
+MAX_BATCH_SIZE = 14  # batched evaluation checks all 2^n candidates, larger components are backtracked
+
 
 class MinesweeperSolver:
-    def __init__(self, game, starting_point=(0, 0), verbose=False):
+    def __init__(self, game, starting_point=(0, 0), verbose=False, bitboard=False, batched=False, sat=False,
+                 cache=None, store=None, tables=False, rng=None, stats=False):
         self.game = game
-        self.board = game.board
-        self.variables = [(x, y) for x in range(self.game.cols) for y in range(self.game.rows)]
+        self.topology = get_topology(self.game.rows, self.game.cols)
+        self.variables = list(self.topology.coordinates)
         self.domains = {(x, y): {0, 1} for x, y in self.variables}  # 0 is safe, 1 is unsafe/ mine
-        self.values = {(x, y): None for x, y in self.variables}
+        self.values = CellValues(self.topology)  # dict of values, that keeps counters for constraint checks
         self.constraints = set()
-        self.neighbors = {}
+        self.neighbors = self.topology.neighbors  # neighbors[(x, y)] as tuple, shared by all boards of this size
         self.unassigned = []
         start_x, start_y = starting_point
         self.cells_to_check = set()
         self.cells_to_check.add((start_x, start_y))
         self.checked = set()
-        self.cache = {}  # for efficiency when generating and checking possible solutions
+        # solution counts of components by canonical signature, shared between solvers unless a cache is given
+        self.cache = component_cache if cache is None else cache
+        if store is not None:  # persistent pattern store, loaded into the cache once
+            store.load(self.cache)
+        self.scope = {}  # uncovered neighbors of each unassigned cell, whose constraints get checked in backtracking
         self.verbose = verbose
+        self.rng = random if rng is None else rng  # for guesses, e.g. random.Random(seed) for reproducible games
+        self.stats = SolverStats() if stats else None  # optional metrics, see minesweeper_stats
+        # optional engine for trivial deductions over the whole board, AC3 then only revises the leftover cells
+        self.bitboard = BitboardEngine(self.game.cols, self.game.rows) if bitboard else None
+        # optional evaluation of whole blocks of assignments as matrix products instead of backtracking
+        if batched and np is None:
+            raise ImportError("batched evaluation of assignments requires numpy")
+        self.batched = batched
+        # optional SAT backend for components too large to enumerate
+        self.sat = sat
+        # optional lookup tables for local patterns around newly uncovered or decided cells
+        self.windows = get_windows() if tables else None
+        self.changed = set()  # cells uncovered or decided since the last table lookups
+
+    @property
+    def board(self):
+        """The game's board as ``board[x][y]`` view. Hot paths read ``game.constants`` directly"""""
+        return self.game.board
+
+    def residual(self, x, y):
+        """
+        :return: constant of uncovered cell ``(x, y)`` minus the mines already assigned around it
+        """""
+        index = x * self.game.rows + y
+        return self.game.constants[index] - self.values.mines_around[index]
 
-        for x, y in self.variables:
-            self.neighbors[(x, y)] = self.game.get_neighbors(x, y)
-
+    @timed("ac3")
     def ac3(self):
         """
         ``begin``
@@ -38,55 +84,141 @@ class MinesweeperSolver:
             ``end``
         ``end``
 
-        :return: False, when game over (won or lost), True, when no more progress possible yet
-        """""
-        self.uncover_cells()
-        queue = self.constraints
-        while queue:
-            xk, yk, xm, ym = queue.pop()
-            if self.revise(xk, yk, xm, ym):
-                self.values[(xk, yk)] = list(self.domains[(xk, yk)])[0]  # set value
-                for xi, yi in self.neighbors[(xk, yk)]:  # add edges from neighbors to queue
-                    if (xi, yi, xk, yk) not in queue:
-                        queue.add((xi, yi, xk, yk))
-                if self.values[(xk, yk)] == 1:  # if we have a mine, we flag it in game. just for GUI, isn't necessary
-                    self.game.flag(xk, yk)
-                if self.is_cell_consistent(xk, yk):  # can uncover every neighbor with value 0
-                    for x, y in self.neighbors[(xk, yk)]:
-                        if self.values[(x, y)] == 0 and (x, y) not in self.checked:
-                            self.cells_to_check.add((x, y))
-
-        if self.game.game_over:
-            return True
-        elif self.cells_to_check:  # can continue
-            self.ac3()
-        else:  # finished for now
-            return False
+        Uncovering cells and revising arcs is repeated in a loop, as long as there are new safe cells to uncover. With
+        the bitboard engine, trivial deductions are done for the whole board first and arcs of cells that are already
+        decided are skipped.
 
+        :return: True, when game over (won or lost), False, when no more progress possible yet
+        """""
+        while True:
+            self.uncover_cells()
+            if self.bitboard is not None and not self.game.game_over:
+                if self.bitboard_deductions():  # uncover new safe cells before revising
+                    continue
+            if self.windows is not None and not self.game.game_over:
+                if self.window_deductions():
+                    continue
+            queue = self.constraints
+            while queue:
+                xk, yk, xm, ym = queue.pop()
+                if self.bitboard is not None and len(self.domains[(xk, yk)]) == 1:
+                    continue
+                if self.revise(xk, yk, xm, ym):
+                    self.values[(xk, yk)] = list(self.domains[(xk, yk)])[0]  # set value
+                    for xi, yi in self.neighbors[(xk, yk)]:  # add edges from neighbors to queue
+                        if (xi, yi, xk, yk) not in queue:
+                            queue.add((xi, yi, xk, yk))
+                    if self.values[(xk, yk)] == 1:  # if we have a mine, we flag it in game. just for GUI
+                        self.mark_mine(xk, yk)
+                    if self.is_cell_consistent(xk, yk):  # can uncover every neighbor with value 0
+                        for x, y in self.neighbors[(xk, yk)]:
+                            if self.values[(x, y)] == 0 and (x, y) not in self.checked:
+                                self.cells_to_check.add((x, y))
+
+            if self.game.game_over:
+                return True
+            elif not self.cells_to_check:  # finished for now
+                return False
+
+    @timed("uncover_cells")
     def uncover_cells(self):
         """
-        Method uncovers cells in ``cells_to_check`` on the minesweeper board and updates domains and constraints for the
-        cell. When the cells constant is 0, we can safely add its neighbors to ``cells_to_check`` and uncover them
-        aswell. In case the game ends when uncovering a cell (either the last cell or a mine), we update domains and
-        constraints for consistency
+        Method uncovers cells in ``cells_to_check`` on the minesweeper board and updates domains and constraints for
+        every cell in the returned delta. The game flood-fills zeros itself, so the neighbors of zeros mostly come back
+        in the same delta. Cells uncovered outside of the solver (e.g. by a player) only get learned, their neighbors
+        get checked in the next round, when they are zeros. In case the game ends while uncovering (either the last
+        cell or a mine), the delta still holds the last cell, so domains and constraints stay consistent
         """""
         while self.cells_to_check:
-            x, y = self.cells_to_check.pop()
-            cell = self.board[x][y]
-            self.checked.add((x, y))
-            if self.game.uncover(x, y):  # game over
-                self.update_domains_constraints(x, y)  # update for last cell in case game is over - for consistency
-                if self.game.result == "Lost":  # to ensure solver ends. Without this it can somehow loop endlessly
+            cells = [cell for cell in self.cells_to_check if cell not in self.checked]
+            self.cells_to_check = set()
+            delta = [(x, y, self.game.constants[x * self.game.rows + y]) for x, y in cells
+                     if self.game.is_uncovered(x, y)]
+            opened, game_over = self.game.uncover_many(cells)
+            delta.extend(opened)
+            for x, y, constant in delta:
+                self.checked.add((x, y))
+                self.update_domains_constraints(x, y)
+                self.changed.add((x, y))
+                if self.bitboard is not None:
+                    self.bitboard.reveal(x, y, constant)
+            if game_over:
+                if self.game.result == "Lost":  # to ensure solver ends. Without this it can loop endlessly
                     self.constraints = set()
                 return
+            for x, y, constant in delta:
+                if constant == 0:  # neighbors, that the game didn't flood-fill in this call
+                    self.cells_to_check.update(n for n in self.neighbors[(x, y)] if n not in self.checked)
+
+    def bitboard_deductions(self):
+        """
+        Runs the trivial deductions of the bitboard engine over the whole board. Deduced mines get assigned and marked,
+        deduced safe cells get added to ``cells_to_check``
+
+        :return: True, when new safe cells have been found
+        """""
+        safe, mines = self.bitboard.deduce()
+        for x, y in self.bitboard.cells(mines):
+            self.mark_mine(x, y)
+        for x, y in self.bitboard.cells(safe):
+            if (x, y) not in self.checked:
+                self.cells_to_check.add((x, y))
+        return bool(self.cells_to_check)
+
+    def window_deductions(self):
+        """
+        Looks up the local patterns around every cell, that got uncovered or decided since the last call (see
+        ``minesweeper_tables``). Only windows containing such a cell can have changed: 3x3 windows around a single
+        uncovered cell and 4x3 and 3x4 windows around a pair of uncovered neighbors. Each window costs one table lookup
+        instead of revising arcs or backtracking. Deduced mines get assigned and marked, deduced safe cells get added to
+        ``cells_to_check``
 
-            self.update_domains_constraints(x, y)
-            if cell.constant == 0:  # uncover neighbors if constant is zero (all safe)
-                for n in self.game.get_neighbors(x, y):
-                    nx, ny = n
-                    if (nx, ny) not in self.checked:
-                        self.cells_to_check.add((nx, ny))
-                self.uncover_cells()
+        :return: True, when new cells have been decided
+        """""
+        lookups = {(window, (x - i, y - j)) for x, y in self.changed for window in self.windows
+                   for i, j in window.inner + window.outer}  # every window containing a changed cell
+        self.changed = set()
+        safe = set()
+        mines = set()
+        for window, (x, y) in lookups:
+            if (x, y) not in self.checked:  # the anchor is the first inner cell
+                continue
+            inner = [(x + i, y + j) for i, j in window.inner]
+            if not all(cell in self.checked for cell in inner):
+                continue
+            outer = [(x + i, y + j) for i, j in window.outer]
+            unknown = 0
+            for k, cell in enumerate(outer):
+                if cell in self.values and self.values[cell] is None:
+                    unknown |= 1 << k
+            if not unknown:
+                continue
+            residuals = [self.residual(i, j) for i, j in inner]
+            safe_bits, mine_bits = window.lookup(unknown, residuals)
+            safe.update(cell for k, cell in enumerate(outer) if safe_bits >> k & 1)
+            mines.update(cell for k, cell in enumerate(outer) if mine_bits >> k & 1)
+
+        if safe & mines:  # inconsistent state, don't trust any of it
+            return False
+        for x, y in mines:
+            self.mark_mine(x, y)
+        self.cells_to_check.update(safe)
+        return bool(safe or mines)
+
+    def mark_mine(self, x, y):
+        """
+        Assigns a mine to ``(x, y)`` and flags it in game
+
+        :param x: x of cell
+        :param y: y of cell
+        """""
+        self.domains[(x, y)] = {1}
+        self.values[(x, y)] = 1
+        self.changed.add((x, y))
+        if not self.game.is_marked(x, y):
+            self.game.flag(x, y)
+        if self.bitboard is not None:
+            self.bitboard.mark_mine(x, y)
 
     def update_domains_constraints(self, x, y):
         """
@@ -97,7 +229,7 @@ class MinesweeperSolver:
         :param x: x of cell
         :param y: y of cell
         """""
-        for i, j in self.game.get_neighbors(x, y):
+        for i, j in self.neighbors[(x, y)]:
             self.constraints.add((x, y, i, j))
             self.constraints.add((i, j, x, y))
             self.domains[(x, y)] = {0}
@@ -131,7 +263,9 @@ class MinesweeperSolver:
                 if not revised:  # domain can get empty by accident - bug?
                     self.domains[(xk, yk)] = {0, 1}
         self.values[(xk, yk)] = prev_val
-
+        if self.stats is not None:
+            self.stats.revise_calls += 1
+            self.stats.revisions += revised
         return revised
 
     def violates_constraints(self, x, y, value):
@@ -146,8 +280,7 @@ class MinesweeperSolver:
         """""
         prev_val = self.values[(x, y)]  # save previous value, so we can reset it after
         self.values[(x, y)] = value
-        for n in self.game.get_neighbors(x, y):
-            nx, ny = n
+        for nx, ny in self.neighbors[(x, y)]:
             if not self.meets_constraint(nx, ny, (nx, ny) in self.checked):
                 self.values[(x, y)] = prev_val
                 return True
@@ -163,7 +296,8 @@ class MinesweeperSolver:
 
         Possible violations of constraints are, when number of mines (cells with value of 1 in neighbors) would be
         higher than the constant of this cell or when amount of unknown values couldn't meet the amount of mines the
-        constant implies (too few mines)
+        constant implies (too few mines). Both numbers are running counters of ``values``, so this check is constant
+        time for uncovered cells
 
         :param x: x of cell
         :param y: y of cell
@@ -171,16 +305,11 @@ class MinesweeperSolver:
         :return: True, when constraints are met, False when violated
         """""
         if not checked:
-            open_neighbors = [(i, j) for i, j in self.neighbors[(x, y)] if (i, j) in self.checked]
-            res = True
-            for i, j in open_neighbors:
-                res = res and self.meets_constraint(i, j, True)
-            return res
-        const = self.board[x][y].constant
-        num_mines = sum(
-            self.values[(i, j)] for i, j in self.neighbors[(x, y)] if self.values[(i, j)] == 1)
-        unknown = len([self.values[(i, j)] for i, j in self.neighbors[(x, y)] if
-                       self.values[(i, j)] is None])
+            return all(self.meets_constraint(i, j, True) for i, j in self.neighbors[(x, y)] if (i, j) in self.checked)
+        index = x * self.game.rows + y
+        const = self.game.constants[index]
+        num_mines = self.values.mines_around[index]  # counters are kept up to date on every assignment
+        unknown = self.values.unknown_around[index]
         if num_mines > const:  # would be too many mines
             return False
         elif unknown < const - num_mines:  # would be too few mines
@@ -188,191 +317,501 @@ class MinesweeperSolver:
         else:
             return True
 
+    @timed("find_solutions")
     def find_solutions(self):
         """
-        This gets called when AC3 is finished, but the game isn't over/ solved. It calls ``backtrack`` to generate
-        every possible solution for those cells where no value is set. This gets highly complex very fast, so it uses
-        a heuristic to reduce search space and complexity (``O(2^n)``). This heuristic is to only take unassigned cells
-        which are next to safe ones (those with value of 0) and take a max of 10 of those.
+        This gets called when AC3 is finished, but the game isn't over/ solved. First the constraints get reduced (see
+        ``reduce_constraints``), which resolves most local patterns without any search. When that isn't enough, the
+        whole system of constraints is row-reduced (see ``linear_deductions``). With the SAT backend, every component
+        is checked for forced cells next (see ``sat_deductions``), which also finds cells, that only follow from
+        bounds like the amount of mines left and not from equations alone. Else the frontier (undecided
+        cells next to uncovered ones) is split into independent components (see ``split_components``), so the search
+        cost of ``backtrack`` (``O(2^n)``) grows with the largest component instead of the whole frontier. The
+        solutions of every component are counted per amount of mines and combined with the remaining undecided cells
+        against the amount of mines left (see ``minesweeper_probability``). This gives the exact mine probability of
+        every covered cell.
+
+        Cells with a probability of 0 are safe and get added to ``cells_to_check``, cells with a probability of 1 get
+        assigned and marked as mines. When there are neither, the cell with the lowest probability gets uncovered (see
+        ``apply_probabilities``). Only when no combination of solutions fits (inconsistent state), a random cell is
+        picked to uncover next
+
+        Cells, that AC3 already decided as safe without uncovering them, come first. ``revise`` sets their value to 0,
+        but only queues them, when a neighbor became consistent, and the frontier skips decided cells. Guessing while
+        such a cell is waiting would risk a mine for nothing
+
+        :return: True, when cells got queued or marked, so solving can go on, False, when no progress is possible
+        """""
+        known = self.known_safe_cells()
+        if known:
+            self.cells_to_check.update(known)
+            return True
 
-        When no solutions are found, a random cell is picked to uncover next and ``solve()`` gets called again. When
-        there is just one solution, we can assign those values and call ``solve()``. When there are multiple solutions,
-        we look for safe cells in every solution and add those to ``cells_to_check``. When there aren't any safe cells,
-        we take a corner as next cell, because it has the lowest probability to contain a mine, or assign the values
-        from the first solution, when no corners are available
+        safe, mines = self.reduce_constraints()
+        if not safe and not mines:
+            safe, mines = self.linear_deductions()
+        if not safe and not mines and self.sat:
+            safe, mines = self.sat_deductions(self.split_components(self.get_frontier()))
+        if safe or mines:  # deduction was enough, no need to enumerate anything
+            if self.verbose:
+                print("Deduction found {} safe cells and {} mines".format(len(safe), len(mines)))
+            for x, y in mines:
+                self.mark_mine(x, y)
+            self.cells_to_check.update(cell for cell in safe if cell not in self.checked)
+            return True
 
-        :return: return of solve()
-        """""
         if self.verbose:
             print("Generating solutions")
-        # heuristic to reduce search space: only take unassigned next to assigned/ safe ones and max length of 10
-        self.unassigned = [(x, y) for x, y in self.variables if len(self.domains[(x, y)]) > 1 and any(
-            self.values[(i, j)] == 0 for i, j in self.neighbors[(x, y)])][:10]
-        are_last_cells = len([(x, y) for x, y in self.variables if len(self.domains[(x, y)]) > 1]) <= 10
-        solutions = self.backtrack(self.game.mines - len(self.game.marked), are_last_cells)
-
-        if not solutions:  # no solution found -> pick a random cell to uncover
-            if not self.unassigned:
-                return self.solve()
+        mines_left = self.game.mines - len(self.game.marked)
+        frontier = self.get_frontier()
+        components = self.split_components(frontier)
+        bound = set(frontier)
+        # cells off the frontier aren't bound by any known constant
+        unconstrained = [(x, y) for x, y in self.variables if len(self.domains[(x, y)]) > 1
+                         and (x, y) not in self.checked and (x, y) not in bound]
+
+        component_counts = [self.count_component(component, mines_left) for component in components]
+        result = mine_probabilities(component_counts, len(unconstrained), mines_left)
+
+        if result is None:  # no consistent solution found -> pick a random cell to uncover
+            self.unassigned = frontier or unconstrained
+            if not self.unassigned:  # nothing left to pick, no more progress possible
+                return False
             self.pick_random_cell()
-            return self.solve()
+            return True
 
+        component_probabilities, free = result
+        probabilities = {cell: p for component, cell_probabilities in zip(components, component_probabilities)
+                         for cell, p in zip(component, cell_probabilities)}
+        probabilities.update((cell, free) for cell in unconstrained)
+        if not probabilities:
+            return False
         if self.verbose:
-            print("Solutions found: ", len(solutions))
-        if len(solutions) == 1:
-            if self.verbose:
-                print("One solution found. Assigning values")
-            self.assign_solution_values(solutions[0])
-            return self.solve()
+            print("Solutions found per component: ", [sum(total for total, _ in counts.values())
+                                                      for counts in component_counts])
+        self.apply_probabilities(probabilities)
+        return True
+
+    def known_safe_cells(self):
+        """
+        :return: list of covered cells with value 0, that are not checked yet
+        """""
+        return [cell for cell in self.variables if self.values[cell] == 0 and cell not in self.checked]
+
+    def reduce_constraints(self):
+        """
+        Propagation stage between AC3 and backtracking. Every uncovered cell with unknown neighbors is a constraint: its
+        unknown neighbors (scope) contain exactly ``constant - assigned mines`` mines. For two overlapping constraints A
+        and B, ``B - A`` contains at least ``count(B) - count(A)`` mines. When that is the size of ``B - A``, every
+        cell of ``B - A`` is a mine and every cell of ``A - B`` is safe. When A is a subset of B, ``B - A`` with
+        ``count(B) - count(A)`` mines is a new constraint.
+
+        Constraints are indexed by cell, so only overlapping constraints get compared. New constraints go to the
+        worklist until a fixpoint is reached. Constraints without mines (all safe) or with as many mines as cells (all
+        mines) are deduced directly
+
+        :return: tuple (set of safe cells, set of mines), both empty when nothing could be deduced
+        """""
+        constraints = {}  # scope -> amount of mines in it
+        for x, y in self.checked:
+            scope = frozenset(n for n in self.neighbors[(x, y)] if self.values[n] is None)
+            if scope:
+                constraints[scope] = self.residual(x, y)
+        index = {}  # cell -> scopes containing it
+        for scope in constraints:
+            for cell in scope:
+                index.setdefault(cell, set()).add(scope)
+
+        safe = set()
+        mines = set()
+        worklist = list(constraints)
+        while worklist:
+            a = worklist.pop()
+            if constraints[a] == 0:
+                safe |= a
+            elif constraints[a] == len(a):
+                mines |= a
+            for b in {scope for cell in a for scope in index[cell]}:
+                if b == a:
+                    continue
+                for first, second in ((a, b), (b, a)):
+                    rest = second - first
+                    if rest and constraints[second] - constraints[first] == len(rest):
+                        mines |= rest
+                        safe |= first - second
+                    if first < second and rest not in constraints:  # subset -> new constraint for the rest
+                        constraints[rest] = constraints[second] - constraints[first]
+                        for cell in rest:
+                            index[cell].add(rest)
+                        worklist.append(rest)
+
+        if safe & mines:  # inconsistent state, don't trust any of it
+            return set(), set()
+        return safe, mines
+
+    def linear_deductions(self):
+        """
+        Second deduction stage before backtracking. Every uncovered cell with unknown neighbors gives a linear equation
+        over 0/1 variables (sum of its unknown neighbors = ``constant - assigned mines``), the amount of mines left
+        gives one more equation over every unknown cell. The system gets row-reduced (see ``minesweeper_linear``), which
+        combines any amount of constraints at once instead of only pairs like ``reduce_constraints``. Every reduced row,
+        whose constant is the sum of its positive or its negative coefficients, forces all of its cells
 
-        # look for safe cells in every solution
-        any_safe = self.find_safe_cells(solutions)
+        :return: tuple (set of safe cells, set of mines), both empty when nothing could be deduced
+        """""
+        equations = []
+        for x, y in self.checked:
+            scope = [n for n in self.neighbors[(x, y)] if self.values[n] is None]
+            if scope:
+                constant = self.residual(x, y)
+                equations.append((dict.fromkeys(scope, 1), constant))
+        unknown = [cell for cell in self.variables if self.values[cell] is None and cell not in self.checked]
+        if unknown:
+            equations.append((dict.fromkeys(unknown, 1), self.game.mines - len(self.game.marked)))
+
+        forced = forced_values(equations)
+        if not forced:  # nothing forced or inconsistent state
+            return set(), set()
+        return ({cell for cell, value in forced.items() if value == 0},
+                {cell for cell, value in forced.items() if value == 1})
+
+    def sat_deductions(self, components):
+        """
+        Finds the forced cells of ``components`` with the SAT backend (see ``minesweeper_sat``), without enumerating
+        any solution. Every uncovered cell next to a component is an ``exactly k`` constraint over its unknown
+        neighbors and the component can't have more mines than are left. Each model found shows a possible value for
+        every cell, so only values not seen in any model yet get queried (as assumption). A value without model is
+        impossible, so the cell has the other value
+
+        :param components: list of components, each a list of cells
+        :return: tuple (set of safe cells, set of mines), both empty when nothing could be deduced
+        """""
+        mines_left = self.game.mines - len(self.game.marked)
+        safe = set()
+        mines = set()
+        for component in components:
+            sat = SatSolver()
+            variable = {cell: sat.new_var() for cell in component}
+            for x, y in {n for cell in component for n in self.neighbors[cell] if n in self.checked}:
+                scope = [n for n in self.neighbors[(x, y)] if self.values[n] is None]
+                constant = self.residual(x, y)
+                for n in scope:
+                    if n not in variable:
+                        variable[n] = sat.new_var()
+                sat.add_exactly([variable[n] for n in scope], constant)
+            if mines_left < len(variable):
+                sat.add_at_most(list(variable.values()), mines_left)
+            if not sat.solve():  # inconsistent state, don't trust any of it
+                return set(), set()
+
+            possible = {cell: {sat.model[var]} for cell, var in variable.items()}
+            for cell in component:
+                var = variable[cell]
+                for value in (False, True):
+                    if value in possible[cell]:
+                        continue
+                    if sat.solve([var if value else -var]):
+                        for other, other_var in variable.items():
+                            possible[other].add(sat.model[other_var])
+                    else:
+                        (mines if not value else safe).add(cell)
+                        sat.add_clause([-var if value else var])
+        return safe, mines
+
+    def count_component(self, component, mines_left):
+        """
+        Counts the solutions of ``component`` per amount of mines (see ``count_solutions``). Components larger than
+        ``MAX_COMPONENT_SIZE`` can have too many solutions to list, they get counted without enumerating them (see
+        ``count_assignments``). Results are cached by the canonical signature of the component (see
+        ``minesweeper_cache``), so a configuration only gets enumerated once, no matter where on the board and in which
+        game it shows up again. The amount of mines left is part of the key, when it limits the solutions
 
-        if not any_safe:  # take either first solution or a corner
-            self.no_safe_cells(solutions)
+        :param component: list of cells
+        :param mines_left: amount of mines left
+        :return: dict mapping amount of mines to a tuple (amount of solutions, list of mine counts per cell)
+        """""
+        members = set(component)
+        constraints = []
+        for x, y in {n for cell in component for n in self.neighbors[cell] if n in self.checked}:
+            scope = [n for n in self.neighbors[(x, y)] if self.values[n] is None]
+            inside = [n for n in scope if n in members]
+            constant = self.residual(x, y)
+            constraints.append((inside, constant, len(scope) - len(inside)))
+        signature, order = canonical_signature(component, constraints)
+        key = (signature, min(mines_left, len(component)))
+
+        canonical = self.cache.get(key)
+        if self.stats is not None:
+            self.stats.cache_hits += canonical is not None
+            self.stats.cache_misses += canonical is None
+        if canonical is None:
+            position = {cell: i for i, cell in enumerate(component)}
+            if len(component) > MAX_COMPONENT_SIZE:  # too many solutions to list, count them per state instead
+                bounds = [([position[n] for n in inside], constant - outside, constant)
+                          for inside, constant, outside in constraints]
+                counts = count_assignments(len(component), bounds, mines_left)
+            else:
+                self.unassigned = component
+                if self.batched and len(component) <= MAX_BATCH_SIZE:
+                    solutions = self.batch_solutions(mines_left)
+                else:
+                    solutions = self.backtrack(mines_left)
+                if self.stats is not None:
+                    self.stats.solutions += len(solutions)
+                counts = count_solutions(solutions, len(component))
+            canonical = {mines: (total, [cells[position[cell]] for cell in order])
+                         for mines, (total, cells) in counts.items()}
+            self.cache.put(key, canonical)
+
+        position = {cell: i for i, cell in enumerate(order)}
+        return {mines: (total, [cells[position[cell]] for cell in component])
+                for mines, (total, cells) in canonical.items()}
+
+    def get_frontier(self):
+        """
+        Collects the frontier of the board: every covered, undecided cell (domain with both values), that is a neighbor
+        of an uncovered cell. Only those cells are bound by a known constant
 
-        return self.solve()
+        :return: list of frontier cells
+        """""
+        return [(x, y) for x, y in self.variables if len(self.domains[(x, y)]) > 1 and (x, y) not in self.checked
+                and any((i, j) in self.checked for i, j in self.neighbors[(x, y)])]
+
+    def split_components(self, frontier):
+        """
+        Splits ``frontier`` into its connected components over the constraint graph. Two frontier cells are connected,
+        when they share an uncovered neighbor, because then they appear in the same constraint. Different components
+        don't share any constraint, so they can be enumerated independently
 
+        Cells of a component are kept in breadth-first order, so cells sharing a constraint are close to each other.
+        That way ``backtrack`` completes constraints early and can prune invalid prefixes sooner
+
+        :param frontier: list of frontier cells
+        :return: list of components, each a list of cells
+        """""
+        remaining = set(frontier)
+        components = []
+        for cell in frontier:
+            if cell not in remaining:
+                continue
+            remaining.remove(cell)
+            component = [cell]
+            for x, y in component:  # grows while iterating -> breadth-first
+                for i, j in self.neighbors[(x, y)]:
+                    if (i, j) not in self.checked:
+                        continue
+                    for n in self.neighbors[(i, j)]:
+                        if n in remaining:
+                            remaining.remove(n)
+                            component.append(n)
+            components.append(component)
+        return components
+
+    @timed("backtrack")
     def backtrack(self, mines_left, last_cells=False):
         """"
-        Calls recursive method ``backtrack_helper`` to generate solutions and returns those
-        
+        Calls recursive method ``backtrack_helper`` to generate solutions and returns those. Before searching, every
+        constraint in reach gets checked once, because constraints that are violated anyway would never be checked by
+        the helper. The helper only checks the uncovered neighbors of each cell it assigns, so those get collected here
+        as well
+
         :param mines_left: amount of mines left
         :param last_cells: True, when solution for last cells is required. Important for behavior of helper method
         :return: 2D array of solutions
         """""
+        if not all(self.meets_constraint(x, y, True) for x, y in self.constraint_scope()):
+            return []
+        self.scope = {cell: [n for n in self.neighbors[cell] if n in self.checked] for cell in self.unassigned}
         return self.backtrack_helper([], mines_left, [], last_cells)
 
-    def backtrack_helper(self, assignment, mines_left, solutions, last_cells=False):
+    def backtrack_helper(self, assignment, mines_left, solutions, last_cells=False, mines=0):
         """
-        Generates every possible assignment for the cells in ``unassigned``. Every valid assignment gets saved to
-        ``solutions``. When ``last_cells``, the sum of  ``assignment`` has to be equal to ``mines_left``, else it can
-        be between 1 and ```mines_left``
+        Generates every valid assignment for the cells in ``unassigned`` with forward checking. After each choice, the
+        value gets written and the constraints of the uncovered neighbors of that cell are checked (in constant time,
+        unassigned cells count as unknown). When one of them is violated (too many mines or not enough unknown cells
+        left), the whole subtree gets cut right away. ``mines`` keeps the running amount of mines in ``assignment``.
+        When ``last_cells``, the amount of mines has to be equal to ``mines_left``, else it can be between 0 and
+        ``mines_left``. Values are reset when going back up
 
         :param assignment: current assignment list for values (0 or 1) of unassigned cells
         :param mines_left: amount of mines left
         :param solutions: list to collect valid assignments
         :param last_cells: True, when we are trying to assign the last cells
+        :param mines: amount of mines in ``assignment``
         :return: solutions array of valid assignments
         """""
-        if len(assignment) > len(self.unassigned):
-            return
-        elif sum(assignment) > mines_left:
-            return
-        else:
-            for choice in [0, 1]:
+        if self.stats is not None:
+            self.stats.nodes += 1
+        depth = len(assignment)
+        if depth == len(self.unassigned):
+            if not last_cells or mines == mines_left:
+                solutions.append(assignment.copy())  # only valid solutions get this deep
+            return solutions
+
+        cell = self.unassigned[depth]
+        remaining = len(self.unassigned) - depth - 1
+        for choice in [0, 1]:
+            if mines + choice > mines_left:  # too many mines
+                break
+            if last_cells and mines + choice + remaining < mines_left:  # not enough cells left for the mines
+                continue
+            self.values[cell] = choice
+            if all(self.meets_constraint(x, y, True) for x, y in self.scope[cell]):
                 assignment.append(choice)
-                # when last cells, it has to be equal to mines_left, else it can be between 1 and mines_left
-                if ((last_cells and sum(assignment) == mines_left) or (0 < sum(assignment) <= mines_left)) and len(
-                        assignment) == len(self.unassigned):
-                    if self.is_solution_valid(assignment):
-                        # only keep valid solutions
-                        c = assignment.copy()
-                        solutions.append(c)
-                self.backtrack_helper(assignment, mines_left, solutions)
+                self.backtrack_helper(assignment, mines_left, solutions, last_cells, mines + choice)
                 assignment.pop()
-                self.cache.pop(tuple(assignment), None)  # remove possibly outdated assignment from cache
-            return solutions
+        self.values[cell] = None
+        return solutions
 
     def is_solution_valid(self, assignment):
         """
-        Checks if ``assignment`` is valid aka it doesn't violate constraints. First we check if the assignment is in
-        cache and return it to reduce computation time. Then we assign every value from the assignment and check for
-        constraint violation. Then every value (and domain) gets reset, result gets cached and validity of this
+        Checks if ``assignment`` is valid aka it doesn't violate constraints. We assign every value from the assignment
+        and check for constraint violation (see ``check_assignment``). Then every value gets reset and validity of this
         assignment is returned
 
         :param assignment: assignment of values for unassigned cells to check for
         :return: True, when assignment is valid, False else
         """
-        key = tuple(assignment)
-        if key in self.cache:
-            return self.cache[key]
-
-        all_valid = True
-        for (x, y), value in zip(self.unassigned, assignment):  # set every value and domains
-            self.values[(x, y)] = value
-            self.domains[(x, y)] = {value}
-        for (x, y), value in zip(self.unassigned, assignment):  # check for constraint violations and cell consistency
-            all_valid = all_valid and not self.violates_constraints(x, y, value)  # and self.is_cell_consistent(x, y)
-
-        # after checking validity, reset values and domains
-        for (x, y) in self.unassigned:
-            self.values[(x, y)] = None
-            self.domains[(x, y)] = {0, 1}
-        self.cache[key] = all_valid  # cache the result
+        all_valid = self.check_assignment(assignment, self.constraint_scope())
+        for cell in self.unassigned:  # after checking validity, reset values
+            self.values[cell] = None
         return all_valid
 
-    def pick_random_cell(self):
-        """Picks a random cell from ``unassigned`` and adds it to ``cells_to_check``."""""
-        rand_x, rand_y = self.unassigned[random.randint(0, len(self.unassigned) - 1)]
-        while (rand_x, rand_y) in self.checked:
-            rand_x, rand_y = self.unassigned[random.randint(0, len(self.unassigned) - 1)]
-        self.cells_to_check.add((rand_x, rand_y))
-        if self.verbose:
-            print("No solution found, picked random cell: ", rand_x, rand_y)
+    def constraint_scope(self):
+        """
+        Collects every uncovered cell, whose constraint can be violated by values of ``unassigned``. Those are the
+        uncovered neighbors of the unassigned cells and the uncovered neighbors of their covered neighbors, just like
+        ``violates_constraints`` checks them
 
-    def assign_solution_values(self, solution):
+        :return: list of uncovered cells
+        """""
+        scope = set()
+        for cell in self.unassigned:
+            for n in self.neighbors[cell]:
+                if n in self.checked:
+                    scope.add(n)
+                else:
+                    scope.update(i for i in self.neighbors[n] if i in self.checked)
+        return sorted(scope)
+
+    def check_assignment(self, assignment, scope):
         """
-        Assigns values from ``solution`` to ``unassigned``, adds the safe cells to ``cells_to_check`` and marks mines.
-        
-        :param solution: list of values for assignment
+        Writes ``assignment`` to the values of ``unassigned`` and checks the constraints of every cell in ``scope`` in
+        constant time each. Only values that differ from the current ones get written, so consecutive assignments of
+        the search only update the counters of the cells that actually changed. Values are not reset afterwards
+
+        :param assignment: assignment of values for unassigned cells
+        :param scope: uncovered cells to check, see ``constraint_scope``
+        :return: True, when no constraint is violated, False else
         """""
-        for i in range(len(solution)):
-            x, y = self.unassigned[i]
-            if solution[i] == 0 and (x, y) not in self.checked:
-                self.cells_to_check.add((x, y))
-            else:
-                self.domains[(x, y)] = {1}
-                self.values[(x, y)] = 1
-                self.game.flag(x, y)
+        values = self.values
+        for cell, value in zip(self.unassigned, assignment):
+            if values[cell] != value:
+                values[cell] = value
+        return all(self.meets_constraint(x, y, True) for x, y in scope)
 
-    def find_safe_cells(self, solutions):
+    def constraint_matrix(self):
         """
-        Looks for cells, which values are 0 in every generated valid solution in ``solutions``. If there are safe cells,
-        the can be added to ``cells_to_check``.
+        Builds the constraints of the uncovered neighbors of ``unassigned`` as a matrix with one row per uncovered cell
+        and one column per unassigned cell (1, when they are neighbors). For every row, the amount of mines among the
+        unassigned cells has to be at most ``upper`` (constant minus assigned mines) and at least ``lower`` (``upper``
+        minus other unknown neighbors), just like in ``meets_constraint``
 
-        :param solutions: 2D array of valid assignments
-        :return: True, when there have been any safe cells, False else
+        :return: tuple (matrix, lower, upper)
         """""
-        # sum of values for every solution
-        sum_sol = [sum(row[i] for row in solutions) for i in range(len(solutions[0]))]
-        any_safe = False
-        if self.verbose:
-            print("Looking for a safe cell in any solution")
-        for i in range(len(sum_sol)):
-            if sum_sol[i] == 0:  # safe cell in every solution
-                x, y = self.unassigned[i]
-                if (x, y) not in self.checked:
-                    self.cells_to_check.add((x, y))
-                    any_safe = True
-                    if self.verbose:
-                        print("Found safe cell: ", x, y)
-        return any_safe
+        columns = {cell: i for i, cell in enumerate(self.unassigned)}
+        numbered = sorted({n for cell in self.unassigned for n in self.neighbors[cell] if n in self.checked})
+        matrix = np.zeros((len(numbered), len(self.unassigned)), dtype=np.int16)
+        lower = np.zeros(len(numbered), dtype=np.int16)
+        upper = np.zeros(len(numbered), dtype=np.int16)
+        for row, (x, y) in enumerate(numbered):
+            mines = unknown = 0
+            for n in self.neighbors[(x, y)]:
+                if n in columns:
+                    matrix[row, columns[n]] = 1
+                elif self.values[n] == 1:
+                    mines += 1
+                elif self.values[n] is None:
+                    unknown += 1
+            upper[row] = self.game.constants[x * self.game.rows + y] - mines
+            lower[row] = upper[row] - unknown
+        return matrix, lower, upper
+
+    def are_solutions_valid(self, assignments):
+        """
+        Batched version of ``is_solution_valid``. Checks every assignment (row) with a single matrix product against
+        the constraints of ``constraint_matrix``, without writing any values
+
+        :param assignments: 2D array of assignments for ``unassigned``
+        :return: boolean array, True for every valid assignment
+        """""
+        matrix, lower, upper = self.constraint_matrix()
+        mines = np.asarray(assignments, dtype=np.int16).reshape(-1, len(self.unassigned)) @ matrix.T
+        return np.all((mines >= lower) & (mines <= upper), axis=1)
 
-    def no_safe_cells(self, solutions):
+    def batch_solutions(self, mines_left, last_cells=False, block_size=4096):
         """
-        When no safe cells have been found, we have to continue somehow. We first look if there are covered corner cells
-        and add one to ``cells_to_check``, as they are most probably safe. Else we take the assignment from the first
-        solution and add safe cells to ``cells_to_check``
-        
-        :param solutions: 2D array of valid assignments
+        Generates every valid assignment for ``unassigned`` like ``backtrack``, but evaluates blocks of
+        ``block_size`` candidates at once. Candidates are the binary representations of consecutive numbers, with the
+        first cell as most significant bit, so the solutions come in the same order as from ``backtrack``
+
+        :param mines_left: amount of mines left
+        :param last_cells: True, when the sum of an assignment has to be equal to ``mines_left``
+        :param block_size: amount of candidates per matrix product
+        :return: 2D array of solutions
         """""
+        matrix, lower, upper = self.constraint_matrix()
+        size = len(self.unassigned)
+        bits = 1 << np.arange(size - 1, -1, -1, dtype=np.int64)
+        solutions = []
+        for start in range(0, 1 << size, block_size):
+            numbers = np.arange(start, min(start + block_size, 1 << size), dtype=np.int64)
+            candidates = ((numbers[:, None] & bits) > 0).astype(np.int16)
+            mines = candidates @ matrix.T
+            totals = candidates.sum(axis=1)
+            valid = np.all((mines >= lower) & (mines <= upper), axis=1)
+            valid &= (totals == mines_left) if last_cells else (totals <= mines_left)
+            solutions.extend(candidates[valid].tolist())
+        return solutions
+
+    def pick_random_cell(self):
+        """Picks a random cell from ``unassigned`` and adds it to ``cells_to_check``."""""
+        rand_x, rand_y = self.unassigned[self.rng.randint(0, len(self.unassigned) - 1)]
+        while (rand_x, rand_y) in self.checked:
+            rand_x, rand_y = self.unassigned[self.rng.randint(0, len(self.unassigned) - 1)]
+        self.cells_to_check.add((rand_x, rand_y))
+        self.game.trace.emit(GUESS, x=rand_x, y=rand_y, probability=None)
+        if self.stats is not None:
+            self.stats.guesses += 1
         if self.verbose:
-            print("No safe cells found.")
-        self.ac3()
-        # if self.get_corners():
-        #     if self.verbose:
-        #         print("Taking corner")
-        #     self.cells_to_check.add(self.get_corners()[0])
-        # else:
-        if self.verbose:
-            print("Taking first solution")
-        first_sol = solutions[0]
-        for i in range(len(first_sol)):
-            if first_sol[i] == 0:
-                x, y = self.unassigned[i]
-                if (x, y) not in self.checked:
-                    self.cells_to_check.add((x, y))
+            print("No solution found, picked random cell: ", rand_x, rand_y)
+
+    def apply_probabilities(self, probabilities):
+        """
+        Adds every cell with a mine probability of 0 to ``cells_to_check`` and assigns and marks every cell with a
+        probability of 1 as mine. When there are no certain cells, we have to guess and add the cell with the lowest
+        mine probability to ``cells_to_check``
+
+        :param probabilities: dict mapping covered, undecided cells to their mine probability
+        """""
+        any_certain = False
+        for (x, y), p in probabilities.items():
+            if p == 0:
+                self.cells_to_check.add((x, y))
+                any_certain = True
+            elif p == 1:
+                self.mark_mine(x, y)
+                any_certain = True
+
+        if not any_certain:
+            x, y = min(probabilities, key=probabilities.get)
+            self.cells_to_check.add((x, y))
+            self.game.trace.emit(GUESS, x=x, y=y, probability=float(probabilities[(x, y)]))
+            if self.stats is not None:
+                self.stats.guesses += 1
+            if self.verbose:
+                print("No safe cells found. Guessing cell {}, {} with mine probability {:.3f}".format(
+                    x, y, float(probabilities[(x, y)])))
 
     def get_corners(self):
         """
@@ -394,9 +833,9 @@ class MinesweeperSolver:
         :param y: y of cell
         :return: True, when either safe- or mine-consistent, False else
         """""
-        safe_consistent = all(self.values[(i, j)] is not None for i, j in self.neighbors[(x, y)]) and (
-                (x, y) not in self.checked or sum(
-            self.values[(i, j)] for i, j in self.neighbors[(x, y)]) == self.board[x][y].constant)
+        index = x * self.game.rows + y
+        safe_consistent = self.values.unknown_around[index] == 0 and (
+                (x, y) not in self.checked or self.values.mines_around[index] == self.game.constants[index])
         mine_consistent = self.values[(x, y)] == 1 and self.domains[(x, y)] == {1}
         return safe_consistent or mine_consistent
 
@@ -417,13 +856,13 @@ class MinesweeperSolver:
         When game is over or solver is consistent, there could still be covered cells. This method collects and uncovers
         those. This is for consistency of solver
         """""
-        cells = [(x, y) for x, y in self.variables if self.values[(x, y)] == 0 or self.values[(x, y)] is None]
-        for x, y in cells:
-            if (x, y) not in self.checked:
-                self.game.uncover(x, y)
-                self.checked.add((x, y))
+        cells = [(x, y) for x, y in self.variables if (self.values[(x, y)] == 0 or self.values[(x, y)] is None)
+                 and (x, y) not in self.checked]
+        self.game.uncover_many(cells, flood=False)  # one batch, a single round trip for a remote game
+        self.checked.update(cells)
         self.constraints = set()
 
+    @timed("solve")
     def solve(self):
         """
         Main method to call on this solver to start solving process.
@@ -432,49 +871,53 @@ class MinesweeperSolver:
         2a. game finished by minesweeper rules
         2b. game finished by consistent state of solver
         3a. Every mine is marked, can uncover the rest of the cells --> back to 1.
-        3b. find valid solutions by backtracking
-        4a. No solution found, uncovering random cell --> back to 1.
-        4b. Adding safe cells to uncover, which are 0 in every valid solution
-        4c. No safe cells found --> take first of valid solutions as assignment and try
+        3b. find valid solutions by backtracking and calculate mine probabilities
+        4a. No consistent solution found, uncovering random cell --> back to 1.
+        4b. Adding safe cells (probability 0) to uncover and marking mines (probability 1)
+        4c. No certain cells found --> uncover the cell with the lowest mine probability
         5. back to 1.
 
+        The steps repeat in a loop, ``find_solutions`` only tells whether there was progress, so huge boards with
+        thousands of rounds need no deep recursion
+
         :return: True, when finished and successful, False else
         """""
         if self.verbose:
             print("Starting solve with AC3 and revise")
-        mines_left = self.game.mines - len(self.game.marked)
-        cells_left = self.game.cols * self.game.rows - len(self.game.uncovered) - len(self.game.marked)
-        if self.verbose:
-            print("Mines left: {}, Cells left: {}".format(str(mines_left), str(cells_left)))
-
-        if self.ac3() or self.is_solver_consistent():  # ac3 is finished and game is over or solver is consistent
-            print("Game over")
-            # for consistency of solver and more convincing GUI
-            if self.is_solver_consistent():
-                self.game.game_over = True
-                self.game.result = "Won"
-            if self.game.result == "Won":
-                if self.verbose:
-                    print("Uncovering and marking last cells")
-                self.uncover_and_mark_remaining_cells()
-            print("Game result: ", self.game.result)
-            self.print()
-            return self.game.game_over
+        while True:  # one round per iteration, so the call depth doesn't grow with the amount of rounds
+            mines_left = self.game.mines - len(self.game.marked)
+            cells_left = self.game.cols * self.game.rows - len(self.game.uncovered) - len(self.game.marked)
+            if self.verbose:
+                print("Mines left: {}, Cells left: {}".format(str(mines_left), str(cells_left)))
 
-        mines_left = self.game.mines - len(self.game.marked)
-        cells_left = self.game.cols * self.game.rows - len(self.game.uncovered) - len(self.game.marked)
-        if self.verbose:
-            print("Mines left: {}, Cells left: {}".format(str(mines_left), str(cells_left)))
+            if self.ac3() or self.is_solver_consistent():  # ac3 is finished and game is over or solver is consistent
+                if self.verbose:
+                    print("Game over")
+                # for consistency of solver and more convincing GUI
+                if self.is_solver_consistent():
+                    self.game.finish("Won")
+                if self.game.result == "Won":
+                    if self.verbose:
+                        print("Uncovering and marking last cells")
+                    self.uncover_and_mark_remaining_cells()
+                if self.verbose:
+                    print("Game result: ", self.game.result)
+                    self.print()
+                return self.game.game_over
 
-        if mines_left == 0 and cells_left > 0:
+            mines_left = self.game.mines - len(self.game.marked)
+            cells_left = self.game.cols * self.game.rows - len(self.game.uncovered) - len(self.game.marked)
             if self.verbose:
-                print("No more mines left, can uncover rest of cells")
-            for x, y in self.variables:
-                if (x, y) not in self.checked and self.values[(x, y)] != 1:
-                    self.cells_to_check.add((x, y))
-            return self.ac3()
+                print("Mines left: {}, Cells left: {}".format(str(mines_left), str(cells_left)))
 
-        return self.find_solutions()
+            if mines_left == 0 and cells_left > 0:
+                if self.verbose:
+                    print("No more mines left, can uncover rest of cells")
+                for x, y in self.variables:
+                    if (x, y) not in self.checked and self.values[(x, y)] != 1:
+                        self.cells_to_check.add((x, y))
+            elif not self.find_solutions():
+                return False
 
     def print(self):
         """
@@ -491,3 +934,33 @@ class MinesweeperSolver:
                 else:
                     print("|", "-", end="")
             print("|")
+
+
+class CellValues(dict):
+    """
+    Values of the cells (0, 1 or None), keyed by coordinates like a plain dict. Every assignment updates two running
+    counters for each neighbor of the assigned cell: the amount of neighbors with a mine (``mines_around``) and the
+    amount of neighbors without a value (``unknown_around``). Counters are lists indexed by the flat index of the
+    topology, so a constraint can be checked without looking at the neighbors again
+    """""
+
+    def __init__(self, topology):
+        super().__init__((cell, None) for cell in topology.coordinates)
+        self.rows = topology.rows
+        self.offsets = topology.offsets
+        self.indices = topology.indices
+        self.mines_around = [0] * topology.size
+        self.unknown_around = [topology.degree(index) for index in range(topology.size)]
+
+    def __setitem__(self, cell, value):
+        old = self[cell]
+        dict.__setitem__(self, cell, value)
+        mines = (value == 1) - (old == 1)
+        unknown = (value is None) - (old is None)
+        if mines or unknown:
+            mines_around = self.mines_around
+            unknown_around = self.unknown_around
+            index = cell[0] * self.rows + cell[1]
+            for n in self.indices[self.offsets[index]:self.offsets[index + 1]]:
+                mines_around[n] += mines
+                unknown_around[n] += unknown
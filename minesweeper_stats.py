@@ -0,0 +1,129 @@
+import cProfile
+import time
+import tracemalloc
+from functools import wraps
+
+PHASES = ("solve", "uncover_cells", "ac3", "find_solutions", "backtrack")
+COUNTERS = ("revise_calls", "revisions", "nodes", "solutions", "cache_hits", "cache_misses", "guesses")
+
+
+class SolverStats:
+    """
+    Metrics of one or more solves. Phase times are exclusive: when a phase starts inside another one (e.g. ``backtrack``
+    inside ``find_solutions``), the outer phase is paused, so the times of all phases add
+    up to the time of the whole solve. Counters are plain attributes, the solver increments them directly.
+
+    Stats of many games can be added up with ``+=`` or ``merge``
+    """
+
+    def __init__(self):
+        self.times = dict.fromkeys(PHASES, 0.0)
+        for counter in COUNTERS:
+            setattr(self, counter, 0)
+        self.games = 1
+        self.memory_peak = 0  # bytes, only measured by ``profile_solve`` with ``memory``
+        self.stack = []
+        self.mark = 0.0
+
+    def enter(self, phase):
+        now = time.perf_counter()
+        if self.stack:
+            self.times[self.stack[-1]] += now - self.mark
+        self.stack.append(phase)
+        self.mark = now
+
+    def exit(self):
+        now = time.perf_counter()
+        self.times[self.stack.pop()] += now - self.mark
+        self.mark = now
+
+    def merge(self, other):
+        """
+        Adds ``other`` to these stats
+
+        :param other: SolverStats or dict (see ``to_dict``)
+        :return: self
+        """
+        if isinstance(other, SolverStats):
+            other = other.to_dict()
+        for phase, seconds in other["times"].items():
+            self.times[phase] = self.times.get(phase, 0.0) + seconds
+        for counter in COUNTERS:
+            setattr(self, counter, getattr(self, counter) + other[counter])
+        self.games += other["games"]
+        self.memory_peak = max(self.memory_peak, other["memory_peak"])
+        return self
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    def to_dict(self):
+        result = {counter: getattr(self, counter) for counter in COUNTERS}
+        result.update(times=dict(self.times), games=self.games, memory_peak=self.memory_peak)
+        return result
+
+    @classmethod
+    def aggregate(cls, stats):
+        """
+        Adds up the stats of many games
+
+        :param stats: iterable of SolverStats or dicts
+        :return: SolverStats or None, when there are no stats
+        """
+        result = None
+        for other in stats:
+            if result is None:
+                result = cls()
+                result.games = 0
+            result.merge(other)
+        return result
+
+    def __str__(self):
+        times = ", ".join("{} {:.4f}s".format(phase, seconds) for phase, seconds in self.times.items())
+        counters = ", ".join("{} {}".format(counter, getattr(self, counter)) for counter in COUNTERS)
+        memory = "; memory peak {} bytes".format(self.memory_peak) if self.memory_peak else ""
+        return "{} games: {}; {}{}".format(self.games, times, counters, memory)
+
+
+def timed(phase):
+    """
+    Decorator for solver methods, that counts their time into ``phase`` of the solver's stats. Without stats it only
+    costs one extra call
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.stats is None:
+                return method(self, *args, **kwargs)
+            self.stats.enter(phase)
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.stats.exit()
+        return wrapper
+    return decorator
+
+
+def profile_solve(solver, path=None, memory=False):
+    """
+    Runs ``solver.solve()`` with cProfile and optionally tracemalloc
+
+    :param solver: MinesweeperSolver
+    :param path: file to dump the cProfile stats to (readable with ``pstats``), None to only run it
+    :param memory: True to trace allocations, the peak gets stored in the solver's stats
+    :return: tuple (result of solve, cProfile.Profile)
+    """
+    if memory:
+        tracemalloc.start()
+    profile = cProfile.Profile()
+    try:
+        result = profile.runcall(solver.solve)
+    finally:
+        if memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            if solver.stats is not None:
+                solver.stats.memory_peak = max(solver.stats.memory_peak, peak)
+    if path is not None:
+        profile.dump_stats(path)
+    return result, profile
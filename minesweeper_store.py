@@ -0,0 +1,127 @@
+import argparse
+import ast
+import json
+import random
+import sqlite3
+import weakref
+
+from minesweeper_cache import ComponentCache
+
+MAX_ENTRIES = 100000
+
+
+class PatternStore:
+    """
+    Persistent store for solution counts of frontier components (see ``minesweeper_cache``) in a sqlite file. Keys are
+    the canonical signatures, so entries are valid for every board and every game. Each entry remembers the last save
+    that contained it, the store keeps at most ``max_entries`` of the most recently used ones.
+
+    ``load`` fills a ``ComponentCache`` (``MinesweeperSolver`` does that once per cache at startup), ``save`` writes
+    the entries of a cache back, e.g. after a run of the performance tester
+    """
+
+    def __init__(self, path, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.connection = sqlite3.connect(path, timeout=60)  # workers of the performance tester share the file
+        self.connection.execute("CREATE TABLE IF NOT EXISTS patterns "
+                                "(key TEXT PRIMARY KEY, counts TEXT NOT NULL, used INTEGER NOT NULL)")
+        self.loaded = weakref.WeakSet()  # caches, that already got the entries
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM patterns").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def load(self, cache):
+        """
+        Puts the most recently used entries (as many as fit) into ``cache``. Every cache only gets loaded once
+
+        :param cache: ComponentCache
+        :return: amount of loaded entries
+        """
+        if cache in self.loaded:
+            return 0
+        self.loaded.add(cache)
+        rows = self.connection.execute("SELECT key, counts FROM patterns ORDER BY used DESC LIMIT ?",
+                                       (cache.maxsize,)).fetchall()
+        for key, counts in reversed(rows):  # most recently used last, like in the LRU order of the cache
+            counts = {int(mines): (total, cells) for mines, (total, cells) in json.loads(counts).items()}
+            cache.put(ast.literal_eval(key), counts)
+        return len(rows)
+
+    def save(self, cache):
+        """
+        Writes every entry of ``cache`` into the store and drops the least recently used entries above the limit
+
+        :param cache: ComponentCache
+        :return: amount of entries in the store
+        """
+        with self.connection:
+            used = self.connection.execute("SELECT COALESCE(MAX(used), 0) + 1 FROM patterns").fetchone()[0]
+            self.connection.executemany(
+                "INSERT INTO patterns (key, counts, used) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET used = excluded.used",
+                [(repr(key), json.dumps(counts), used) for key, counts in cache.entries.items()])
+            self.connection.execute("DELETE FROM patterns WHERE key NOT IN "
+                                    "(SELECT key FROM patterns ORDER BY used DESC LIMIT ?)", (self.max_entries,))
+        return len(self)
+
+    def clear(self):
+        with self.connection:
+            self.connection.execute("DELETE FROM patterns")
+        self.connection.execute("VACUUM")
+
+
+def rebuild(path, rows, cols, mines, games, seed=None, max_entries=MAX_ENTRIES):
+    """
+    Empties the store at ``path`` and warms it again by solving ``games`` random games
+
+    :return: amount of entries in the store
+    """
+    from minesweeper import Minesweeper
+    from minesweeper_solver import MinesweeperSolver
+
+    store = PatternStore(path, max_entries)
+    store.clear()
+    cache = ComponentCache(maxsize=max_entries)
+    rng = random.Random(seed)
+    for _ in range(games):
+        game = Minesweeper(rows=rows, cols=cols, mines=mines, rng=rng)
+        solver = MinesweeperSolver(game, starting_point=(rng.randrange(cols), rng.randrange(rows)), bitboard=True,
+                                   cache=cache, rng=rng)
+        solver.solve()
+    size = store.save(cache)
+    store.close()
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the persistent pattern store of the minesweeper solver")
+    parser.add_argument("path", help="sqlite file of the store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("info", help="show the amount of stored entries")
+    commands.add_parser("clear", help="remove every entry")
+    build = commands.add_parser("rebuild", help="clear the store and warm it with random games")
+    build.add_argument("--rows", type=int, default=16)
+    build.add_argument("--cols", type=int, default=30)
+    build.add_argument("--mines", type=int, default=99)
+    build.add_argument("--games", type=int, default=100)
+    build.add_argument("--seed", type=int)
+    build.add_argument("--max-entries", type=int, default=MAX_ENTRIES)
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        size = rebuild(args.path, args.rows, args.cols, args.mines, args.games, args.seed, args.max_entries)
+    else:
+        store = PatternStore(args.path)
+        if args.command == "clear":
+            store.clear()
+        size = len(store)
+        store.close()
+    print("{} entries in {}".format(size, args.path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import os
+import struct
+import sys
+from array import array
+from functools import lru_cache
+
+TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "window_tables.bin")
+TABLE_VERSION = 1  # bump, when windows or the table layout change
+HEADER = struct.Struct("<4sII")  # magic, version, amount of table entries
+MAGIC = b"MSWT"
+
+
+class Window:
+    """
+    Lookup table for a small window of the board around one or two uncovered cells (inner cells). Every other cell of
+    the window (outer cell) is either unknown (covered and undecided) or known (uncovered, decided or off the board).
+    The window state is the bitmask of unknown outer cells plus the residual constant (constant minus known mines) of
+    every inner cell. For every state, the table holds the outer cells that are safe or mines in all assignments, that
+    satisfy the constants of the inner cells.
+
+    The neighborhood of an inner cell lies completely in the window, so the deductions are exact. Cells off the board
+    are just known cells, so the same table works at the edges and in the corners of the board
+
+    :param width: width of the window
+    :param height: height of the window
+    :param inner: positions of the inner cells in the window, the first one is the anchor
+    """
+
+    def __init__(self, width, height, inner):
+        anchor_x, anchor_y = inner[0]
+        self.inner = [(x - anchor_x, y - anchor_y) for x, y in inner]
+        self.outer = [(x - anchor_x, y - anchor_y) for y in range(height) for x in range(width) if (x, y) not in inner]
+        # bits of the outer cells, that are neighbors of each inner cell
+        self.masks = [sum(1 << k for k, (i, j) in enumerate(self.outer) if max(abs(i - x), abs(j - y)) == 1)
+                      for x, y in self.inner]
+        self.safe = None
+        self.mines = None
+
+    def index(self, unknown, residuals):
+        for residual in residuals:
+            unknown = unknown * 9 + residual
+        return unknown
+
+    def generate(self):
+        """
+        Fills the table by enumerating every subset of every unknown mask, so the whole table only costs
+        ``3 ** len(outer)`` steps. For each mask, the subsets get grouped by the amount of mines they put next to every
+        inner cell. A cell, that is in no subset of a group, is safe for those residuals, a cell in every subset is a
+        mine. Inconsistent states deduce nothing
+        """
+        size = table_size(self)
+        self.safe = array('H', bytes(2 * size))
+        self.mines = array('H', bytes(2 * size))
+        for unknown in range(1 << len(self.outer)):
+            groups = {}  # residuals -> (union, intersection) of the subsets
+            subset = unknown
+            while True:
+                residuals = tuple((subset & mask).bit_count() for mask in self.masks)
+                union, intersection = groups.get(residuals, (0, subset))
+                groups[residuals] = (union | subset, intersection & subset)
+                if not subset:
+                    break
+                subset = (subset - 1) & unknown
+            for residuals, (union, intersection) in groups.items():
+                index = self.index(unknown, residuals)
+                self.safe[index] = unknown & ~union
+                self.mines[index] = intersection
+
+    def lookup(self, unknown, residuals):
+        """
+        :param unknown: bitmask of the unknown outer cells
+        :param residuals: residual constant of every inner cell
+        :return: tuple (bitmask of safe outer cells, bitmask of mines)
+        """
+        if not all(0 <= residual <= 8 for residual in residuals):  # inconsistent state
+            return 0, 0
+        index = self.index(unknown, residuals)
+        return self.safe[index], self.mines[index]
+
+
+def windows():
+    # single cell in a 3x3 window, horizontal pair in a 4x3 window and vertical pair in a 3x4 window
+    return [Window(3, 3, [(1, 1)]), Window(4, 3, [(1, 1), (2, 1)]), Window(3, 4, [(1, 1), (1, 2)])]
+
+
+@lru_cache(maxsize=None)
+def get_windows(path=TABLE_FILE):
+    """
+    Returns the windows with their tables. Tables get read from ``path``, when it has been written by ``save_tables``
+    before, else they are generated (which takes a moment) and kept for the rest of the process. A file with another
+    version or length (stale or truncated) gets rebuilt
+
+    :param path: file of the generated tables
+    :return: list of Window
+    """
+    result = windows()
+    if not load_tables(result, path):
+        for window in result:
+            window.generate()
+        if os.path.exists(path):
+            try:
+                write_tables(result, path)
+            except OSError:  # keep the generated tables for this process only
+                pass
+    return result
+
+
+def table_size(window):
+    return 9 ** len(window.inner) << len(window.outer)
+
+
+def load_tables(result, path):
+    """
+    Reads the tables of the windows in ``result`` from ``path``
+
+    :return: True, when the file exists and its header matches the version and size of the tables, False else
+    """
+    if not os.path.exists(path):
+        return False
+    entries = sum(2 * table_size(window) for window in result)
+    if os.path.getsize(path) != HEADER.size + entries * array('H').itemsize:
+        return False
+    with open(path, "rb") as file:
+        if HEADER.unpack(file.read(HEADER.size)) != (MAGIC, TABLE_VERSION, entries):
+            return False
+        for window in result:
+            window.safe = array('H')
+            window.mines = array('H')
+            window.safe.fromfile(file, table_size(window))
+            window.mines.fromfile(file, table_size(window))
+    return True
+
+
+def write_tables(result, path):
+    """Writes the generated tables of the windows in ``result`` to ``path``, after a header with version and size"""
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, TABLE_VERSION, sum(2 * table_size(window) for window in result)))
+        for window in result:
+            window.safe.tofile(file)
+            window.mines.tofile(file)
+
+
+def save_tables(path=TABLE_FILE):
+    """Generates the tables of every window and writes them to ``path``"""
+    result = windows()
+    for window in result:
+        window.generate()
+    write_tables(result, path)
+
+
+if __name__ == "__main__":
+    save_tables(sys.argv[1] if len(sys.argv) > 1 else TABLE_FILE)
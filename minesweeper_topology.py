@@ -0,0 +1,123 @@
+from array import array
+from functools import lru_cache
+
+
+class Topology:
+    """
+    Neighborhood structure of a board with ``rows`` and ``cols``. Every cell ``(x, y)`` has the flat index
+    ``x * rows + y``, which is the same order as the solver's variables. Neighbors are precomputed once in CSR form:
+    the neighbors of cell ``i`` are ``indices[offsets[i]:offsets[i + 1]]``. That is about 40 bytes per cell, so even
+    a 1000 x 1000 board stays small. Neighbor coordinates are built per cell on first access and then kept (see
+    ``neighbor_coordinates``), all tuples share one ``(x, y)`` per cell. Only cells, that games and solvers actually
+    touch, cost memory for them, about 300 bytes per cell.
+
+    Topologies are shared between all games and solvers of the same size, see ``get_topology``
+    """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.coordinates = Coordinates(rows, cols)
+        self.offsets = array('i', [0])
+        self.indices = array('i')
+        self.cell_tuples = [None] * self.size  # one (x, y) per cell, that all neighbor tuples share
+        self.neighbor_tuples = [None] * self.size  # neighbor coordinates by flat index, filled on first access
+        self.neighbors = NeighborMap(self)
+
+        for x in range(cols):
+            xs = [i for i in (x - 1, x, x + 1) if 0 <= i < cols]
+            for y in range(rows):
+                # same order as Minesweeper.get_neighbors always had
+                self.indices.extend([i * rows + j for i in xs for j in (y - 1, y, y + 1)
+                                     if 0 <= j < rows and (i != x or j != y)])
+                self.offsets.append(len(self.indices))
+
+    def index(self, x, y):
+        return x * self.rows + y
+
+    def degree(self, index):
+        """
+        :return: amount of neighbors of the cell with flat ``index``
+        """
+        return self.offsets[index + 1] - self.offsets[index]
+
+    def neighbor_indices(self, index):
+        """
+        :return: flat indices of the neighbors of the cell with flat ``index``
+        """
+        return self.indices[self.offsets[index]:self.offsets[index + 1]]
+
+    def cell(self, index):
+        """
+        :return: coordinates of the cell with flat ``index`` as (x, y), the same tuple on every call
+        """
+        cell = self.cell_tuples[index]
+        if cell is None:
+            cell = self.cell_tuples[index] = divmod(index, self.rows)
+        return cell
+
+    def neighbor_coordinates(self, index):
+        """
+        :return: tuple of the neighbors of the cell with flat ``index`` as (x, y), the same tuple on every call
+        """
+        neighbors = self.neighbor_tuples[index]
+        if neighbors is None:
+            cell = self.cell
+            neighbors = self.neighbor_tuples[index] = tuple(
+                cell(n) for n in self.indices[self.offsets[index]:self.offsets[index + 1]])
+        return neighbors
+
+
+class Coordinates:
+    """
+    Coordinates ``(x, y)`` of a board by flat index, computed on access instead of stored
+    """
+    __slots__ = ("rows", "cols")
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+
+    def __len__(self):
+        return self.rows * self.cols
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.rows * self.cols:
+            raise IndexError(index)
+        return divmod(index, self.rows)
+
+    def __iter__(self):
+        return ((x, y) for x in range(self.cols) for y in range(self.rows))
+
+
+class NeighborMap(dict):
+    """
+    Neighbors of cells as ``neighbors[(x, y)]``, like a plain dict of tuples. Entries get added on first lookup and
+    point to the tuples of the topology, every topology has one map, that all its solvers share
+    """
+
+    def __init__(self, topology):
+        super().__init__()
+        self.topology = topology
+
+    def __missing__(self, cell):
+        x, y = cell
+        topology = self.topology
+        if not (0 <= x < topology.cols and 0 <= y < topology.rows):
+            raise KeyError(cell)
+        index = x * topology.rows + y
+        neighbors = self[topology.cell(index)] = topology.neighbor_coordinates(index)  # key shared, not the lookup's
+        return neighbors
+
+
+@lru_cache(maxsize=4)
+def get_topology(rows, cols):
+    """
+    Returns the shared topology for a board with ``rows`` and ``cols``. Only the last few sizes are kept
+
+    :param rows: amount of rows
+    :param cols: amount of columns
+    :return: cached Topology
+    """
+    return Topology(rows, cols)
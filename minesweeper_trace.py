@@ -0,0 +1,74 @@
+import json
+import sys
+
+# events and their data
+BOARD_GENERATED = "board_generated"  # rows, cols, mines, mine coordinates
+MINES_MOVED = "mines_moved"  # moves as list of (from, to) coordinates, when the first click clears its cell
+UNCOVERED = "uncovered"  # x, y, constant
+FLAG = "flag"  # x, y, marked
+GUESS = "guess"  # x, y, probability (None for a random pick)
+GAME_OVER = "game_over"  # result
+
+
+class TraceSink:
+    """
+    Receives the events of a game (see the constants above). This base sink ignores everything, so tracing costs one
+    method call per event, when nobody listens. Sinks are opt-in: pass one as ``trace`` to ``Minesweeper``, the solver
+    uses the sink of its game
+    """
+
+    def emit(self, event, **data):
+        pass
+
+
+NULL_SINK = TraceSink()
+
+
+class ConsoleSink(TraceSink):
+    """Prints every event as a readable line"""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def emit(self, event, **data):
+        if event == BOARD_GENERATED:
+            text = "Board generated: {} rows, {} columns, {} mines".format(data["rows"], data["cols"], data["mines"])
+        elif event == MINES_MOVED:
+            text = "Mines moved for the first click: {}".format(
+                ", ".join("{} -> {}".format(source, target) for source, target in data["moves"]))
+        elif event == UNCOVERED:
+            text = "Uncovered ({}, {}): {}".format(data["x"], data["y"], data["constant"])
+        elif event == FLAG:
+            text = "{} ({}, {})".format("Flagged" if data["marked"] else "Unflagged", data["x"], data["y"])
+        elif event == GUESS:
+            probability = "random" if data["probability"] is None else "{:.3f}".format(data["probability"])
+            text = "Guess ({}, {}): {}".format(data["x"], data["y"], probability)
+        elif event == GAME_OVER:
+            text = "Game result: {}".format(data["result"])
+        else:
+            text = "{}: {}".format(event, data)
+        print(text, file=self.stream or sys.stdout)
+
+
+class JsonLinesSink(TraceSink):
+    """Writes every event as one JSON object per line, with the event name in ``event``"""
+
+    def __init__(self, file):
+        self.file = file
+
+    def emit(self, event, **data):
+        self.file.write(json.dumps(dict(data, event=event)) + "\n")
+
+
+class MemorySink(TraceSink):
+    """Collects the events as tuples (event, data) in ``events``"""
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event, **data):
+        self.events.append((event, data))
+
+    def of(self, event):
+        """Returns the data of every collected ``event``"""
+        return [data for name, data in self.events if name == event]
@@ -1,40 +1,190 @@
+import argparse
+import csv
+import json
+import os
 import random
+import sys
 import time
-from statistics import mean
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from statistics import mean, quantiles
 
 from minesweeper import Minesweeper
+from minesweeper_cache import component_cache
 from minesweeper_solver import MinesweeperSolver
+from minesweeper_stats import SolverStats, profile_solve
+from minesweeper_store import PatternStore
 
-RUNS = 100
-HEIGHT = 5
-WIDTH = 5
-MINES = 3
-
-success = 0
-failure = 0
-times = []
-progresses = []
-
-for x in range(RUNS):
-    game = Minesweeper(rows=HEIGHT, cols=WIDTH, mines=MINES)
-    rand_x = random.randint(0, WIDTH - 1)
-    rand_y = random.randint(0, HEIGHT - 1)
-    print("Starting point: ", rand_x, rand_y)
-    ai = MinesweeperSolver(game, starting_point=(rand_x, rand_y))
+PRESETS = {
+    "beginner": (9, 9, 10),
+    "intermediate": (16, 16, 40),
+    "expert": (16, 30, 99),
+}
+SOLVER_OPTIONS = ("bitboard", "batched", "sat", "tables", "stats")
+
+
+def game_rng(seed, index):
+    """Independent random generator for game ``index`` of a run with ``seed``, the same in every process"""
+    return random.Random("{}:{}".format(seed, index))
+
+
+def play_game(rows, cols, mines, seed, index, options, store=None, profile=None):
+    """
+    Plays one game with its own random generator for the board, the starting point and the guesses of the solver
+
+    :param profile: dict with ``directory`` to dump a cProfile file per game into and ``memory`` to trace
+        allocations, None to play without profiler
+    :return: dict with index, result, solving time in seconds, progress (share of decided cells) and the solver's
+        stats, when enabled
+    """
+    rng = game_rng(seed, index)
+    game = Minesweeper(rows=rows, cols=cols, mines=mines, rng=rng)
+    solver = MinesweeperSolver(game, starting_point=(rng.randrange(cols), rng.randrange(rows)), rng=rng, store=store,
+                               **options)
     tic = time.perf_counter()
-    ai.solve()
+    if profile is None:
+        solver.solve()
+    else:
+        path = os.path.join(profile["directory"], "game-{}.prof".format(index)) if profile["directory"] else None
+        profile_solve(solver, path, profile["memory"])
     toc = time.perf_counter()
-    times.append((tic, toc))
-    progresses.append(len([(x, y) for x, y in ai.variables if ai.values[(x, y)] is not None]) / (HEIGHT * WIDTH))
+    progress = len([cell for cell in solver.variables if solver.values[cell] is not None]) / (rows * cols)
+    result = {"index": index, "won": game.result == "Won", "time": toc - tic, "progress": progress}
+    if solver.stats is not None:
+        result["stats"] = solver.stats.to_dict()
+    return result
 
-    if game.result == "Won":
-        success += 1
+
+def play_chunk(rows, cols, mines, seed, indices, options, store_path=None, profile=None):
+    """
+    Plays the games ``indices`` in a worker process. With a pattern store, the worker loads it before and writes its
+    cache back after the chunk
+
+    :return: list of game results (see ``play_game``)
+    """
+    store = PatternStore(store_path) if store_path else None
+    results = [play_game(rows, cols, mines, seed, index, options, store, profile) for index in indices]
+    if store is not None:
+        store.save(component_cache)
+        store.close()
+    return results
+
+
+def run(rows, cols, mines, runs, seed, options, workers=None, store_path=None, progress=True, profile=None):
+    """
+    Plays ``runs`` games spread over a process pool. Games get split into chunks, so workers don't idle at the end
+
+    :return: tuple (list of game results ordered by index, wall time in seconds)
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, min(1000, runs // (workers * 8)))
+    chunks = [range(start, min(start + chunk_size, runs)) for start in range(0, runs, chunk_size)]
+    results = []
+    tic = time.perf_counter()
+    if workers == 1:
+        for chunk in chunks:
+            results.extend(play_chunk(rows, cols, mines, seed, chunk, options, store_path, profile))
+            if progress:
+                print_progress(len(results), runs, tic)
     else:
-        failure += 1
-
-print("Result for {} runs with {} rows, {} columns and {} mines:".format(str(RUNS), str(HEIGHT), str(WIDTH), str(MINES)))
-print("Successful solves: {}".format(str(success)))
-print("Failed solves: {}".format(str(failure)))
-print("Solving rate: {}".format(str(success / RUNS)))
-print("Average solving time: {:0.4f}s".format(mean([y - x for x, y in times])))
-print("Average progress per solve: {}".format(str(mean(progresses))))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(play_chunk, rows, cols, mines, seed, chunk, options, store_path, profile)
+                       for chunk in chunks]
+            for future in as_completed(futures):
+                results.extend(future.result())
+                if progress:
+                    print_progress(len(results), runs, tic)
+    toc = time.perf_counter()
+    if progress:
+        print(file=sys.stderr)
+    return sorted(results, key=lambda result: result["index"]), toc - tic
+
+
+def print_progress(done, runs, tic):
+    elapsed = time.perf_counter() - tic
+    print("\r{}/{} games, {:.1f} games/s".format(done, runs, done / elapsed if elapsed else 0.0), end="",
+          file=sys.stderr, flush=True)
+
+
+def summarize(results, wall_time):
+    """
+    :param results: list of game results
+    :param wall_time: duration of the whole run in seconds
+    :return: dict with win rate, solving time percentiles, games per second, mean progress and the added up stats of
+        the solver, when enabled
+    """
+    times = sorted(result["time"] for result in results)
+    percentiles = quantiles(times, n=100, method="inclusive") if len(times) > 1 else times * 99
+    summary = {
+        "games": len(results),
+        "won": sum(result["won"] for result in results),
+        "win_rate": mean(result["won"] for result in results),
+        "time_mean": mean(times),
+        "time_p50": percentiles[49],
+        "time_p95": percentiles[94],
+        "time_p99": percentiles[98],
+        "time_max": times[-1],
+        "games_per_second": len(results) / wall_time if wall_time else 0.0,
+        "progress_mean": mean(result["progress"] for result in results),
+    }
+    stats = SolverStats.aggregate(result["stats"] for result in results if "stats" in result)
+    if stats is not None:
+        summary["stats"] = stats.to_dict()
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plays many seeded games with the solver and reports statistics")
+    parser.add_argument("--preset", choices=PRESETS, help="standard board size, overrides rows, cols and mines")
+    parser.add_argument("--rows", type=int, default=9)
+    parser.add_argument("--cols", type=int, default=9)
+    parser.add_argument("--mines", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0, help="base seed, every game gets its own seed from it")
+    parser.add_argument("--workers", type=int, help="amount of processes, defaults to the amount of CPUs")
+    for option in SOLVER_OPTIONS:
+        parser.add_argument("--" + option, action="store_true", help="solver option " + option)
+    parser.add_argument("--store", help="pattern store to load and warm (sqlite file)")
+    parser.add_argument("--profile", metavar="DIRECTORY", help="dump a cProfile file per game into this directory")
+    parser.add_argument("--memory", action="store_true", help="trace allocations and report the peak (with --stats)")
+    parser.add_argument("--json", help="write the summary (and the configuration) as JSON to this file")
+    parser.add_argument("--csv", help="write one row per game as CSV to this file")
+    parser.add_argument("--quiet", action="store_true", help="don't show progress")
+    args = parser.parse_args(argv)
+
+    rows, cols, mines = PRESETS[args.preset] if args.preset else (args.rows, args.cols, args.mines)
+    options = {option: True for option in SOLVER_OPTIONS if getattr(args, option)}
+    profile = None
+    if args.profile or args.memory:
+        if args.profile:
+            os.makedirs(args.profile, exist_ok=True)
+        profile = {"directory": args.profile, "memory": args.memory}
+    results, wall_time = run(rows, cols, mines, args.runs, args.seed, options, args.workers, args.store,
+                             not args.quiet, profile)
+    summary = summarize(results, wall_time)
+
+    print("Result for {} runs with {} rows, {} columns and {} mines (seed {}):".format(args.runs, rows, cols, mines,
+                                                                                        args.seed))
+    print("Successful solves: {}".format(summary["won"]))
+    print("Failed solves: {}".format(summary["games"] - summary["won"]))
+    print("Solving rate: {:0.4f}".format(summary["win_rate"]))
+    print("Solving time: mean {:0.4f}s, p50 {:0.4f}s, p95 {:0.4f}s, p99 {:0.4f}s, max {:0.4f}s".format(
+        summary["time_mean"], summary["time_p50"], summary["time_p95"], summary["time_p99"], summary["time_max"]))
+    print("Games per second: {:0.1f}".format(summary["games_per_second"]))
+    print("Average progress per solve: {:0.4f}".format(summary["progress_mean"]))
+    if "stats" in summary:
+        print("Solver stats: {}".format(SolverStats.aggregate([summary["stats"]])))
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"rows": rows, "cols": cols, "mines": mines, "runs": args.runs, "seed": args.seed,
+                       "options": sorted(options), "summary": summary}, file, indent=2)
+    if args.csv:
+        with open(args.csv, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=["index", "won", "time", "progress"], extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(results)
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,175 @@
+import argparse
 import random
+import threading
 
 import pygame
 import sys
-import time
 
 from minesweeper import Minesweeper
 from minesweeper_solver import MinesweeperSolver
+from minesweeper_trace import TraceSink, NULL_SINK, ConsoleSink, BOARD_GENERATED, UNCOVERED, FLAG, GAME_OVER
 
 # adapted from: https://cs50.harvard.edu/ai/2020/projects/1/minesweeper/
 
 HEIGHT = 8
 WIDTH = 8
 MINES = 10
+FPS = 30  # frame cap, idle frames only poll the events
+
+# Zoom: cells get drawn one by one down to OVERVIEW_CELL_SIZE pixels, smaller cells come from the overview surface
+MAX_CELL_SIZE = 80
+OVERVIEW_CELL_SIZE = 10
+GLYPH_CELL_SIZE = 12  # smaller cells show no number
+ZOOM_STEP = 1.25
+SCROLL_STEP = 60  # pixels per arrow key
 
 # Colors
 BLACK = (0, 0, 0)
 GRAY = (180, 180, 180)
 WHITE = (255, 255, 255)
+# colors of the overview, covered cells are gray
+UNCOVERED_COLOR = (235, 235, 235)
+FLAG_COLOR = (220, 40, 40)
+MINE_COLOR = BLACK
+
+parser = argparse.ArgumentParser(description="Minesweeper GUI with AI solver. Mouse wheel zooms, arrow keys or the "
+                                             "middle mouse button scroll, o toggles the overview of the whole board")
+parser.add_argument("--rows", type=int, default=HEIGHT)
+parser.add_argument("--cols", type=int, default=WIDTH)
+parser.add_argument("--mines", type=int, default=MINES)
+parser.add_argument("--quiet", action="store_true", help="don't print the game events, e.g. for huge boards")
+args = parser.parse_args()
+
+
+class ChangeTracker(TraceSink):
+    """
+    Collects what the events of a game changed on screen, so a frame only redraws that. Every event gets passed on to
+    ``forward``. Moves of the player come with their delta (see ``add``), the solver runs in its own thread and is
+    followed through its events, so changes are guarded by a lock
+    """
+
+    def __init__(self, forward):
+        self.forward = forward
+        self.lock = threading.Lock()
+        self.cells = set()  # cells to redraw
+        self.board = True  # redraw the whole board, e.g. for a new game or all mines at the end
+        self.panel = True  # redraw the side panel with mine counter and result
+
+    def emit(self, event, **data):
+        with self.lock:
+            if event == UNCOVERED:
+                self.cells.add((data["x"], data["y"]))
+            elif event == FLAG:
+                self.cells.add((data["x"], data["y"]))
+                self.panel = True
+            elif event == BOARD_GENERATED or event == GAME_OVER and data["result"] == "Lost":  # lost shows every mine
+                self.board = True
+                self.panel = True
+            elif event == GAME_OVER:
+                self.panel = True
+        self.forward.emit(event, **data)
+
+    def add(self, delta):
+        """
+        :param delta: list of (x, y, constant) of uncovered cells, as returned by ``Minesweeper.uncover_many``
+        """
+        with self.lock:
+            self.cells.update((x, y) for x, y, _ in delta)
+
+    def take(self):
+        """
+        :return: tuple (changed cells, whole board changed, panel changed) since the last call
+        """
+        with self.lock:
+            changes = self.cells, self.board, self.panel
+            self.cells, self.board, self.panel = set(), False, False
+        return changes
+
+
+class Viewport:
+    """
+    Visible part of the board inside ``rect`` on screen, the x of the game is the row on screen. ``cell_size`` is the
+    zoom in pixels per cell and ``left``/ ``top`` scroll the zoomed board in pixels. Only cells inside the viewport get
+    iterated and drawn, so the cost of a frame doesn't grow with the size of the board
+    """
+
+    def __init__(self, rect, rows, cols):
+        self.rect = rect
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = self.left = self.top = 0
+        self.previous = None  # view before switching to the overview
+        self.fit()
+
+    def fit(self):
+        """Zooms out until the whole board fits"""
+        self.cell_size = min(MAX_CELL_SIZE, self.rect.width / self.rows, self.rect.height / self.cols)
+        if self.cell_size >= OVERVIEW_CELL_SIZE:
+            self.cell_size = int(self.cell_size)
+        self.left = self.top = 0
+
+    def toggle_overview(self):
+        if self.previous is None:
+            self.previous = self.cell_size, self.left, self.top
+            self.fit()
+        else:
+            self.cell_size, self.left, self.top = self.previous
+            self.previous = None
+
+    @property
+    def overview(self):
+        return self.cell_size < OVERVIEW_CELL_SIZE
+
+    def clamp(self):
+        self.left = min(max(0, self.left), max(0, self.rows * self.cell_size - self.rect.width))
+        self.top = min(max(0, self.top), max(0, self.cols * self.cell_size - self.rect.height))
+
+    def scroll(self, dx, dy):
+        self.left += dx
+        self.top += dy
+        self.clamp()
+
+    def zoom(self, factor, position):
+        """Zooms by ``factor``, the point of the board under the screen ``position`` stays in place"""
+        lowest = min(1, self.rect.width / self.rows, self.rect.height / self.cols)
+        cell_size = min(MAX_CELL_SIZE, max(lowest, self.cell_size * factor))
+        if cell_size >= OVERVIEW_CELL_SIZE:
+            cell_size = int(cell_size) if factor < 1 else max(int(cell_size), int(self.cell_size) + 1)
+        px, py = position[0] - self.rect.x, position[1] - self.rect.y
+        self.left = (self.left + px) / self.cell_size * cell_size - px
+        self.top = (self.top + py) / self.cell_size * cell_size - py
+        self.cell_size = cell_size
+        self.previous = None
+        self.clamp()
+
+    def visible(self):
+        """
+        :return: tuple (range of visible x, range of visible y)
+        """
+        xs = range(max(0, int(self.top // self.cell_size)),
+                   min(self.cols, int((self.top + self.rect.height) // self.cell_size) + 1))
+        ys = range(max(0, int(self.left // self.cell_size)),
+                   min(self.rows, int((self.left + self.rect.width) // self.cell_size) + 1))
+        return xs, ys
+
+    def cell_rect(self, x, y):
+        return pygame.Rect(self.rect.x + y * self.cell_size - self.left, self.rect.y + x * self.cell_size - self.top,
+                           self.cell_size, self.cell_size)
+
+    def cell_at(self, position):
+        """Cell under the screen ``position`` or None"""
+        if not self.rect.collidepoint(position):
+            return None
+        x = int((position[1] - self.rect.y + self.top) // self.cell_size)
+        y = int((position[0] - self.rect.x + self.left) // self.cell_size)
+        return (x, y) if x < self.cols and y < self.rows else None
+
 
 # Create game
 pygame.init()
 size = width, height = 900, 600
 screen = pygame.display.set_mode(size)
+clock = pygame.time.Clock()
 
 # Fonts
 OPEN_SANS = "assets/fonts/OpenSans-Regular.ttf"
@@ -33,155 +181,220 @@ largeFont = pygame.font.Font(OPEN_SANS, 40)
 BOARD_PADDING = 20
 board_width = ((2 / 3) * width) - (BOARD_PADDING * 2)
 board_height = height - (BOARD_PADDING * 2)
-cell_size = int(min(board_width / WIDTH, board_height / HEIGHT))
-board_origin = (BOARD_PADDING, BOARD_PADDING)
+board_rect = pygame.Rect(BOARD_PADDING, BOARD_PADDING, board_width, board_height)
+panel_rect = pygame.Rect((2 / 3) * width, 0, width / 3, height)
 
 # Add images
 flag = pygame.image.load("assets/images/flag.png")
-flag = pygame.transform.scale(flag, (cell_size, cell_size))
 mine = pygame.image.load("assets/images/mine.png")
-mine = pygame.transform.scale(mine, (cell_size, cell_size))
-
-# Create game and AI agent
-game = Minesweeper(rows=HEIGHT, cols=WIDTH, mines=MINES)
-rand_x = random.randint(0, WIDTH - 1)
-rand_y = random.randint(0, HEIGHT - 1)
-print("Starting point: ", rand_x, rand_y)
-ai = MinesweeperSolver(game, starting_point=(rand_x, rand_y))
-
-# Keep track of revealed cells, flagged cells, and if a mine was hit
-revealed = set()
-flags = set()
-game_over = game.game_over
-result = game.result
-
-while True:
 
-    # Check if game quit
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            sys.exit()
-
-    screen.fill(BLACK)
-
-    # Draw board
-    flags = game.marked_to_coordinates()
-    revealed = game.uncovered_to_coordinates()
-    result = game.result
-
-    cells = []
-    for i in range(HEIGHT):
-        row = []
-        for j in range(WIDTH):
-
-            # Draw rectangle for cell
-            rect = pygame.Rect(
-                board_origin[0] + j * cell_size,
-                board_origin[1] + i * cell_size,
-                cell_size, cell_size
-            )
-            pygame.draw.rect(screen, GRAY, rect)
-            pygame.draw.rect(screen, WHITE, rect, 3)
-
-            if game_over:
-                # Result text
-                text = result
-                text = mediumFont.render(text, True, WHITE)
-                textRect = text.get_rect()
-                textRect.center = ((5 / 6) * width, (4 / 5) * height)
-                screen.blit(text, textRect)
-
-            # Add a mine, flag, or number if needed
-            if (i, j) in flags:
-                screen.blit(flag, rect)
-            elif result == "Lost" and game.is_mine(i, j):
-                screen.blit(mine, rect)
-            elif (i, j) in revealed:
-                val = smallFont.render(
-                    str(game.board[i][j].constant),
-                    True, BLACK
-                )
-                valTextRect = val.get_rect()
-                valTextRect.center = rect.center
-                screen.blit(val, valTextRect)
-
-            row.append(rect)
-        cells.append(row)
+# Pre-rendered buttons
+aiButton = pygame.Rect(
+    (2 / 3) * width + BOARD_PADDING, (1 / 5) * height - 50,
+    (width / 3) - BOARD_PADDING * 2, 50
+)
+aiText = mediumFont.render("AI Solve", True, BLACK)
+resetButton = pygame.Rect(
+    (2 / 3) * width + BOARD_PADDING, (1 / 5) * height + 20,
+    (width / 3) - BOARD_PADDING * 2, 50
+)
+resetText = mediumFont.render("Reset", True, BLACK)
+
+# glyphs of the constants 0 to 8 and scaled images per cell size
+sprites = {}
+
+
+def get_sprites(cell_size):
+    """
+    :return: tuple (list of the glyphs 0 to 8 or None for small cells, flag, mine) for ``cell_size``
+    """
+    if cell_size not in sprites:
+        glyphs = None
+        if cell_size >= GLYPH_CELL_SIZE:
+            font = smallFont if cell_size >= 34 else pygame.font.Font(OPEN_SANS, int(cell_size * 0.6))
+            glyphs = [font.render(str(constant), True, BLACK) for constant in range(9)]
+        sprites[cell_size] = (glyphs, pygame.transform.scale(flag, (cell_size, cell_size)),
+                              pygame.transform.scale(mine, (cell_size, cell_size)))
+    return sprites[cell_size]
+
+
+def new_game():
+    """Creates game, AI agent, the tracker of their changes and the overview surface with one pixel per cell"""
+    tracker = ChangeTracker(NULL_SINK if args.quiet else ConsoleSink())
+    game = Minesweeper(rows=args.rows, cols=args.cols, mines=args.mines, trace=tracker)
+    rand_x = random.randint(0, args.cols - 1)
+    rand_y = random.randint(0, args.rows - 1)
+    print("Starting point: ", rand_x, rand_y)
+    overview = pygame.Surface((game.rows, game.cols))
+    return game, MinesweeperSolver(game, starting_point=(rand_x, rand_y)), tracker, overview
+
+
+def cell_color(x, y):
+    if game.is_marked(x, y):
+        return FLAG_COLOR
+    elif game.result == "Lost" and game.is_mine(x, y):
+        return MINE_COLOR
+    elif game.is_uncovered(x, y):
+        return UNCOVERED_COLOR
+    return GRAY
+
+
+def paint_overview(cells=None):
+    """Paints ``cells`` into the overview surface, None repaints every cell, that isn't covered"""
+    if cells is None:
+        overview.fill(GRAY)
+        cells = [divmod(index, game.rows) for index, state in enumerate(game.state) if state]
+        if game.result == "Lost":
+            cells.extend(divmod(index, game.rows) for index, constant in enumerate(game.constants) if constant == 9)
+    for x, y in cells:
+        overview.set_at((y, x), cell_color(x, y))
+
+
+def draw_overview():
+    """Draws the visible part of the overview surface scaled to the zoom, smoothed when it gets downsampled"""
+    screen.fill(BLACK, view.rect)
+    xs, ys = view.visible()
+    if not xs or not ys:
+        return
+    source = pygame.Rect(ys.start, xs.start, len(ys), len(xs))
+    target = (max(1, round(source.width * view.cell_size)), max(1, round(source.height * view.cell_size)))
+    scale = pygame.transform.smoothscale if view.cell_size < 1 else pygame.transform.scale
+    screen.blit(scale(overview.subsurface(source), target), view.cell_rect(xs.start, ys.start).topleft)
+
+
+def draw_cell(x, y):
+    rect = view.cell_rect(x, y)
+    glyphs, flag_image, mine_image = get_sprites(view.cell_size)
+    pygame.draw.rect(screen, GRAY, rect)
+    pygame.draw.rect(screen, WHITE, rect, 3 if view.cell_size >= GLYPH_CELL_SIZE else 1)
+
+    # Add a mine, flag, or number if needed
+    if game.is_marked(x, y):
+        screen.blit(flag_image, rect)
+    elif game.result == "Lost" and game.is_mine(x, y):
+        screen.blit(mine_image, rect)
+    elif game.is_uncovered(x, y):
+        if glyphs is None:
+            screen.fill(UNCOVERED_COLOR, rect.inflate(-2, -2))
+        else:
+            glyph = glyphs[game.constants[x * game.rows + y]]
+            screen.blit(glyph, glyph.get_rect(center=rect.center))
+    return rect
+
+
+def draw_board():
+    screen.fill(BLACK, view.rect)
+    xs, ys = view.visible()
+    for x in xs:
+        for y in ys:
+            draw_cell(x, y)
+
+
+def draw_panel():
+    screen.fill(BLACK, panel_rect)
 
     # AI Move button
-    aiButton = pygame.Rect(
-        (2 / 3) * width + BOARD_PADDING, (1 / 5) * height - 50,
-        (width / 3) - BOARD_PADDING * 2, 50
-    )
-    buttonText = mediumFont.render("AI Solve", True, BLACK)
-    buttonRect = buttonText.get_rect()
-    buttonRect.center = aiButton.center
     pygame.draw.rect(screen, WHITE, aiButton)
-    screen.blit(buttonText, buttonRect)
+    screen.blit(aiText, aiText.get_rect(center=aiButton.center))
 
     # Reset button
-    resetButton = pygame.Rect(
-        (2 / 3) * width + BOARD_PADDING, (1 / 5) * height + 20,
-        (width / 3) - BOARD_PADDING * 2, 50
-    )
-    buttonText = mediumFont.render("Reset", True, BLACK)
-    buttonRect = buttonText.get_rect()
-    buttonRect.center = resetButton.center
     pygame.draw.rect(screen, WHITE, resetButton)
-    screen.blit(buttonText, buttonRect)
+    screen.blit(resetText, resetText.get_rect(center=resetButton.center))
 
     # Num mines
-    numMines = "Mines: " + str(game.mines - len(game.marked))
-    numMines = mediumFont.render(numMines, True, WHITE)
-    numMinesRect = numMines.get_rect()
-    numMinesRect.center = ((5 / 6) * width, (3 / 5) * height)
-    screen.blit(numMines, numMinesRect)
-
-    move = None
-
-    left, _, right = pygame.mouse.get_pressed()
-
-    # Check for a right-click to toggle flagging
-    if right == 1 and not game_over:
-        mouse = pygame.mouse.get_pos()
-        for i in range(HEIGHT):
-            for j in range(WIDTH):
-                if cells[i][j].collidepoint(mouse) and (i, j) not in revealed:
-                    game.flag(i, j)
-                    time.sleep(0.2)
-
-    elif left == 1:
-        mouse = pygame.mouse.get_pos()
-
-        # potential TODO
-        # If AI button clicked, let AI solve
-        if aiButton.collidepoint(mouse) and not game_over:
-            ai.solve()
-            revealed = game.uncovered_to_coordinates()
-            flags = game.marked_to_coordinates()
-            time.sleep(0.2)
-
-        # Reset game state
-        elif resetButton.collidepoint(mouse):
-            game = Minesweeper(rows=HEIGHT, cols=WIDTH, mines=MINES)
-            ai = MinesweeperSolver(game)
-            revealed = set()
-            flags = set()
-            game_over = game.game_over
-            result = game.result
-            continue
-
-        # User-made move
-        elif not game_over:
-            for i in range(HEIGHT):
-                for j in range(WIDTH):
-                    if (cells[i][j].collidepoint(mouse)
-                            and (i, j) not in flags
-                            and (i, j) not in revealed):
-                        move = (i, j)
-
-    # Make move and update AI knowledge
-    if move:
-        game_over = game.uncover(move[0], move[1])
-
-    pygame.display.flip()
+    numMines = mediumFont.render("Mines: " + str(game.mines - len(game.marked)), True, WHITE)
+    screen.blit(numMines, numMines.get_rect(center=((5 / 6) * width, (3 / 5) * height)))
+
+    if game.game_over or solving():
+        # Result text
+        text = mediumFont.render(game.result if game.game_over else "Solving...", True, WHITE)
+        screen.blit(text, text.get_rect(center=((5 / 6) * width, (4 / 5) * height)))
+    return panel_rect
+
+
+def solving():
+    return solver_thread is not None and solver_thread.is_alive()
+
+
+# Create game and AI agent
+game, ai, tracker, overview = new_game()
+view = Viewport(board_rect, game.rows, game.cols)
+solver_thread = None
+was_solving = False
+screen.fill(BLACK)
+
+while True:
+
+    moved = False  # the view moved, everything visible needs a redraw
+    for event in pygame.event.get():
+        # Check if game quit
+        if event.type == pygame.QUIT:
+            sys.exit()
+
+        # Zoom around the mouse and scroll
+        elif event.type == pygame.MOUSEWHEEL:
+            view.zoom(ZOOM_STEP if event.y > 0 else 1 / ZOOM_STEP, pygame.mouse.get_pos())
+            moved = True
+        elif event.type == pygame.MOUSEMOTION and event.buttons[1]:
+            view.scroll(-event.rel[0], -event.rel[1])
+            moved = True
+        elif event.type == pygame.KEYDOWN:
+            steps = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0), pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+            if event.key in steps:
+                view.scroll(steps[event.key][0] * SCROLL_STEP, steps[event.key][1] * SCROLL_STEP)
+            elif event.key == pygame.K_o:
+                view.toggle_overview()
+            moved = True
+
+        elif event.type == pygame.MOUSEBUTTONDOWN and not solving():
+            cell = view.cell_at(event.pos)
+
+            # Check for a right-click to toggle flagging
+            if event.button == 3 and not game.game_over:
+                if cell and not game.is_uncovered(*cell):
+                    game.flag(*cell)
+
+            elif event.button == 1:
+                # If AI button clicked, let AI solve in the background, so it can be watched
+                if aiButton.collidepoint(event.pos):
+                    if not game.game_over:
+                        solver_thread = threading.Thread(target=ai.solve, daemon=True)
+                        solver_thread.start()
+
+                # Reset game state
+                elif resetButton.collidepoint(event.pos):
+                    game, ai, tracker, overview = new_game()
+                    view = Viewport(board_rect, game.rows, game.cols)
+                    screen.fill(BLACK)
+
+                # User-made move, opens the whole region, when the cell is a zero
+                elif cell and not game.game_over and not game.is_marked(*cell) and not game.is_uncovered(*cell):
+                    delta, _ = game.uncover_many([cell])
+                    tracker.add(delta)
+
+    # Draw only, what changed since the last frame and is visible
+    cells, board, panel = tracker.take()
+    dirty = []
+    if board:
+        paint_overview()
+    elif cells:
+        paint_overview(cells)
+    screen.set_clip(view.rect)
+    if view.overview:
+        if board or cells or moved:
+            draw_overview()
+            dirty.append(view.rect)
+    elif board or moved:
+        draw_board()
+        dirty.append(view.rect)
+    else:
+        xs, ys = view.visible()
+        dirty.extend(draw_cell(x, y).clip(view.rect) for x, y in cells if x in xs and y in ys)
+    screen.set_clip(None)
+    if panel or solving() != was_solving:
+        was_solving = solving()
+        dirty.append(draw_panel())
+    if dirty:
+        pygame.display.update(dirty)
+
+    clock.tick(FPS)
@@ -236,3 +236,35 @@ class BasicPatternGenerator:
                     self.solver.cells_to_check.add((x, y))
 
         self.game.print()
+
+    def pattern_1_2_1(self):
+        """
+        Needs a game with 3 rows and 5 cols
+
+        | ?| 1| 2| 1| ?|
+        | ?| *| ?| *| ?|
+        | ?| ?| ?| ?| ?|
+        """
+        self.place_mines([(1, 1), (3, 1)])
+        self.solver.cells_to_check = {(1, 0), (2, 0), (3, 0)}
+        self.game.print()
+
+    def pattern_1_1_edge(self):
+        """
+        Needs a game with 3 rows and 5 cols
+
+        | 1| 1| ?| ?| ?|
+        | ?| *| ?| ?| ?|
+        | ?| ?| ?| ?| ?|
+        """
+        self.place_mines([(1, 1)])
+        self.solver.cells_to_check = {(0, 0), (1, 0)}
+        self.game.print()
+
+    def place_mines(self, mines):
+        """Sets the amount of mines and the constant of every cell for ``mines`` as list of (x, y)"""
+        self.game.mines = len(mines)
+        for x in range(self.game.cols):
+            for y in range(self.game.rows):
+                near = sum((i, j) in mines for i in range(x - 1, x + 2) for j in range(y - 1, y + 2))
+                self.game.board[x][y] = Cell(x, y, 9 if (x, y) in mines else near)
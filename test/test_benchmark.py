@@ -0,0 +1,41 @@
+from statistics import median
+from unittest import TestCase
+
+from benchmark import BENCHMARKS, compare, measure, random_game, run_get_neighbors, sample
+
+
+def rebuild_neighbors(game):
+    """Same passes as ``run_get_neighbors``, but every call builds a new list, like ``get_neighbors`` used to"""
+    for _ in range(10):
+        for x in range(game.cols):
+            for y in range(game.rows):
+                [(i, j) for i in (x - 1, x, x + 1) for j in (y - 1, y, y + 1)
+                 if (i != x or j != y) and 0 <= i < game.cols and 0 <= j < game.rows]
+
+
+class TestBenchmark(TestCase):
+
+    def test_compare(self):
+        baseline = {"ac3": {"best": 1.0, "median": 1.0}, "revise": {"best": 1.0, "median": 1.0}}
+        results = {"ac3": {"best": 1.3, "median": 1.2}, "revise": {"best": 1.2, "median": 1.3},
+                   "backtrack": {"best": 9.0, "median": 9.0}}  # no baseline for backtrack
+        self.assertEqual(compare(results, baseline, 0.25), [("revise", 1.0, 1.3)])
+
+    def test_measure(self):
+        for name in ("get_neighbors", "violates_constraints", "backtrack"):
+            result = measure(name, repeat=2, min_time=0.01)
+            self.assertGreater(result["best"], 0)
+            self.assertGreaterEqual(result["median"], result["best"])
+            self.assertGreaterEqual(result["number"], 1)
+        self.assertIn("find_solutions", BENCHMARKS)
+        self.assertIn("solve", BENCHMARKS)
+
+    def test_get_neighbors_cached(self):
+        game = random_game(0)
+        self.assertIs(game.get_neighbors(3, 4), game.get_neighbors(3, 4))
+        # both in this process and interleaved, so a slow machine or process slows down both alike
+        cached, rebuilt = [], []
+        for _ in range(5):
+            cached.append(sample(lambda: game, run_get_neighbors, 5))
+            rebuilt.append(sample(lambda: game, rebuild_neighbors, 5))
+        self.assertLess(median(cached) * 3, median(rebuilt))
@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from minesweeper import Minesweeper
+from minesweeper_bitboard import BitboardEngine
+from minesweeper_solver import MinesweeperSolver
+from BasicPatternGenerator import BasicPatternGenerator
+
+
+class TestBitboardEngine(TestCase):
+
+    def test_count(self):
+        engine = BitboardEngine(3, 3)
+        counts = engine.count(engine.bit(1, 1) | engine.bit(2, 2))
+        value = lambda x, y: sum(1 << i for i, plane in enumerate(counts) if plane & engine.bit(x, y))
+        self.assertEqual(value(0, 0), 1)
+        self.assertEqual(value(2, 1), 2)
+        self.assertEqual(value(1, 1), 1)
+        self.assertEqual(value(2, 2), 1)
+        self.assertEqual(value(0, 2), 1)
+
+    def test_no_wrap_between_rows(self):
+        engine = BitboardEngine(4, 3)
+        dilated = engine.dilate(engine.bit(3, 0))
+        self.assertEqual(set(engine.cells(dilated)), {(2, 0), (2, 1), (3, 1)})
+
+    def test_mine_in_corner(self):
+        """
+        | 0| 0| 0|
+        | 0| 1| 1|
+        | 0| 1| ?|
+        """
+        engine = BitboardEngine(3, 3)
+        for x in range(3):
+            for y in range(3):
+                if not x == y == 2:
+                    engine.reveal(x, y, 1 if x > 0 and y > 0 else 0)
+        safe, mines = engine.deduce()
+        self.assertEqual(safe, 0)
+        self.assertEqual(list(engine.cells(mines)), [(2, 2)])
+
+    def test_safe_after_known_mine(self):
+        """
+        | 1| ?| ?|
+        | ?| ?| ?|
+        with a known mine at (1, 0) every other neighbor of (0, 0) is safe
+        """
+        engine = BitboardEngine(3, 2)
+        engine.reveal(0, 0, 1)
+        engine.mark_mine(1, 0)
+        safe, mines = engine.deduce()
+        self.assertEqual(set(engine.cells(safe)), {(0, 1), (1, 1)})
+        self.assertEqual(mines, 0)
+
+    def test_solver_with_bitboard(self):
+        game = Minesweeper(3, 3, 1)
+        solver = MinesweeperSolver(game, bitboard=True)
+        BasicPatternGenerator(game, solver).pattern_b1()
+        self.assertTrue(solver.solve())
+        self.assertEqual(game.result, "Won")
+        self.assertTrue(all(solver.values[(x, 2)] == 1 for x in range(3)))
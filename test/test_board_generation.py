@@ -0,0 +1,89 @@
+import random
+import warnings
+from unittest import TestCase
+
+import minesweeper
+from minesweeper import Minesweeper
+
+
+class TestBoardGeneration(TestCase):
+
+    def test_consistent(self):
+        for seed in range(10):
+            game = Minesweeper(16, 30, 99, rng=random.Random(seed), debug=True)
+            self.assertEqual(sum(cell.constant == 9 for column in game.board for cell in column), 99)
+            self.assertEqual(len(game.board), 30)
+            self.assertEqual(len(game.board[0]), 16)
+
+    def test_fallback_matches_numpy(self):
+        if minesweeper.np is None:
+            self.skipTest("numpy is not installed")
+        game = Minesweeper(20, 25, 120, rng=random.Random(3))
+        mine_coordinates = [(x, y) for x in range(game.cols) for y in range(game.rows) if game.is_mine(x, y)]
+        indices = [x * game.rows + y for x, y in mine_coordinates]
+        self.assertEqual(game.count_mines(mine_coordinates), game.count_mines_numpy(indices))
+
+    def test_reproducible(self):
+        first = Minesweeper(9, 9, 10, rng=random.Random(7))
+        second = Minesweeper(9, 9, 10, rng=random.Random(7))
+        self.assertEqual([[cell.constant for cell in column] for column in first.board],
+                         [[cell.constant for cell in column] for column in second.board])
+
+    def test_inconsistency_detected(self):
+        game = Minesweeper(9, 9, 10, rng=random.Random(1))
+        cell = next(cell for column in game.board for cell in column if cell.constant != 9)
+        cell.constant += 1
+        with self.assertRaises(AssertionError):
+            game.check_consistency()
+
+    def test_large_board(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")  # 200 x 300 is below the soft limit
+            game = Minesweeper(200, 300, 9000, rng=random.Random(0))
+        self.assertEqual(len(game.board), 300)
+
+    def test_soft_limit(self):
+        with self.assertWarns(UserWarning):
+            Minesweeper(1001, 1000, 10, rng=random.Random(0))
+
+
+class TestFirstClick(TestCase):
+
+    def test_first_click_safe(self):
+        for seed in range(50):
+            game = Minesweeper(9, 9, 40, rng=random.Random(seed), debug=True)
+            x, y = next((x, y) for x in range(9) for y in range(9) if game.is_mine(x, y))
+            game.uncover(x, y)
+            self.assertFalse(game.game_over)
+            self.assertNotEqual(game.board[x][y].constant, 9)
+            self.assertEqual(sum(cell.constant == 9 for column in game.board for cell in column), 40)
+
+    def test_only_offending_mine_moves(self):
+        game = Minesweeper(9, 9, 10, rng=random.Random(4))
+        x, y = next((x, y) for x in range(9) for y in range(9) if game.is_mine(x, y))
+        mines = {(i, j) for i in range(9) for j in range(9) if game.is_mine(i, j)}
+        game.uncover(x, y)
+        moved = {(i, j) for i in range(9) for j in range(9) if game.is_mine(i, j)}
+        self.assertEqual(mines - moved, {(x, y)})
+        self.assertEqual(len(moved - mines), 1)
+
+    def test_opening(self):
+        for seed in range(50):
+            game = Minesweeper(9, 9, 35, rng=random.Random(seed), debug=True, opening=True)
+            game.uncover(seed % 9, seed // 9 % 9)
+            self.assertEqual(game.board[seed % 9][seed // 9 % 9].constant, 0)
+
+    def test_opening_without_room(self):
+        game = Minesweeper(3, 3, 4, rng=random.Random(1), debug=True, opening=True)
+        game.uncover(1, 1)  # 5 free cells can't hold the 9 cells of an opening
+        self.assertNotEqual(game.board[1][1].constant, 9)
+        self.assertFalse(game.game_over)
+
+    def test_flag_before_first_click(self):
+        game = Minesweeper(9, 9, 10, rng=random.Random(4))
+        x, y = next((x, y) for x in range(9) for y in range(9) if game.is_mine(x, y))
+        flagged = next((i, j) for i, j in game.get_neighbors(x, y) if not game.is_mine(i, j))
+        game.flag(*flagged)
+        game.uncover(x, y)
+        game.flag(*flagged)  # unflagging finds the cell, although its constant changed
+        self.assertEqual(len(game.marked), 0)
@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+from minesweeper import Minesweeper, Cell
+from minesweeper_cache import ComponentCache, canonical_signature
+from minesweeper_solver import MinesweeperSolver
+
+
+class TestComponentCache(TestCase):
+
+    def test_symmetric_signatures(self):
+        # 1-2-1 along the top row and along the left column of a board
+        top = canonical_signature([(0, 1), (1, 1), (2, 1)],
+                                  [([(0, 1), (1, 1)], 1, 0), ([(0, 1), (1, 1), (2, 1)], 2, 0),
+                                   ([(1, 1), (2, 1)], 1, 0)])
+        left = canonical_signature([(5, 7), (5, 6), (5, 5)],
+                                   [([(5, 7), (5, 6)], 1, 0), ([(5, 7), (5, 6), (5, 5)], 2, 0),
+                                    ([(5, 6), (5, 5)], 1, 0)])
+        self.assertEqual(top[0], left[0])
+        self.assertEqual(top[1].index((1, 1)), left[1].index((5, 6)))  # middle cells match
+        other = canonical_signature([(0, 1), (1, 1), (2, 1)],
+                                    [([(0, 1), (1, 1)], 1, 0), ([(0, 1), (1, 1), (2, 1)], 1, 0),
+                                     ([(1, 1), (2, 1)], 1, 0)])
+        self.assertNotEqual(top[0], other[0])
+
+    def test_lru(self):
+        cache = ComponentCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)  # 'b' is the least recently used
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.get('a'), cache.get('c')), (1, 3))
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_reuse_between_positions(self):
+        cache = ComponentCache()
+        counts = []
+        for row, next_row in ((0, 1), (7, 6)):  # same pattern along the top and (mirrored) along the bottom edge
+            game = Minesweeper(8, 4, 1)
+            for i in range(game.cols):
+                for j in range(game.rows):
+                    game.board[i][j] = Cell(i, j, 0)
+            solver = MinesweeperSolver(game, cache=cache)
+            for i in range(game.cols):
+                game.board[i][row].constant = 1
+                solver.checked.add((i, row))
+            component = [(i, next_row) for i in range(game.cols)]
+            counts.append(solver.count_component(component, 1))
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
@@ -0,0 +1,77 @@
+from unittest import TestCase
+
+from minesweeper import Minesweeper
+from minesweeper_solver import MinesweeperSolver
+from BasicPatternGenerator import BasicPatternGenerator
+
+
+class TestConstraintReduction(TestCase):
+    game = None
+    solver = None
+    generator = None
+
+    @classmethod
+    def setUp(cls) -> None:
+        cls.game = Minesweeper(3, 3, 1)
+        cls.solver = MinesweeperSolver(cls.game)
+        cls.generator = BasicPatternGenerator(cls.game, cls.solver)
+
+    @classmethod
+    def tearDown(cls) -> None:
+        cls.game = None
+        cls.solver = None
+        cls.generator = None
+
+    def test_pattern_1_1(self):
+        self.generator.pattern_1_1()
+        self.solver.uncover_cells()
+        safe, mines = self.solver.reduce_constraints()
+        self.assertEqual(safe, {(0, 2), (2, 2)})
+        self.assertEqual(mines, {(1, 2)})
+
+    def test_pattern_1_2(self):
+        self.generator.pattern_1_2()
+        self.solver.uncover_cells()
+        safe, mines = self.solver.reduce_constraints()
+        self.assertEqual(safe, {(1, 2)})
+        self.assertEqual(mines, {(0, 2), (2, 2)})
+
+    def test_pattern_1_2_1(self):
+        self.game = Minesweeper(3, 5, 2)
+        self.solver = MinesweeperSolver(self.game)
+        BasicPatternGenerator(self.game, self.solver).pattern_1_2_1()
+        self.solver.uncover_cells()
+        safe, mines = self.solver.reduce_constraints()
+        self.assertEqual(mines, {(1, 1), (3, 1)})  # under the 1s
+        self.assertEqual(safe, {(0, 0), (0, 1), (4, 0), (4, 1)})  # (2, 1) follows, once the mines are assigned
+        self.assert_solved_without_backtracking()
+
+    def test_pattern_1_1_edge(self):
+        self.game = Minesweeper(3, 5, 1)
+        self.solver = MinesweeperSolver(self.game)
+        BasicPatternGenerator(self.game, self.solver).pattern_1_1_edge()
+        self.solver.uncover_cells()
+        safe, mines = self.solver.reduce_constraints()
+        self.assertEqual(mines, set())
+        self.assertEqual(safe, {(2, 0), (2, 1)})  # the mine of the first 1 is also the mine of the second
+        self.assert_solved_without_backtracking()
+
+    def test_no_deduction(self):
+        self.generator.pattern_corner_1()
+        self.solver.cells_to_check = {(0, 0)}
+        self.solver.uncover_cells()
+        self.assertEqual(self.solver.reduce_constraints(), (set(), set()))
+
+    def test_solve_without_backtracking(self):
+        self.generator.pattern_1_2()
+        self.assert_solved_without_backtracking()
+
+    # ----- HELPER ----- #
+
+    def assert_solved_without_backtracking(self):
+        def backtrack(*args):
+            raise AssertionError("backtrack should not be needed")
+
+        self.solver.backtrack = backtrack
+        self.assertTrue(self.solver.solve())
+        self.assertEqual(self.game.result, "Won")
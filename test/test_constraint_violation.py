@@ -1,3 +1,4 @@
+import random
 from unittest import TestCase
 
 from minesweeper import Minesweeper
@@ -128,3 +129,14 @@ class TestMinesweeperSolver(TestCase):
         self.assertTrue(self.solver.violates_constraints(2, 1, 1))
         self.assertFalse(self.solver.violates_constraints(0, 1, 0))
         self.assertFalse(self.solver.violates_constraints(2, 1, 0))
+
+    def test_counters(self):
+        self.generator.mines_1_2_2()
+        self.solver.uncover_cells()
+        for _ in range(200):
+            self.solver.values[random.choice(self.solver.variables)] = random.choice([0, 1, None])
+        for x, y in self.solver.variables:
+            index = self.solver.topology.index(x, y)
+            neighbor_values = [self.solver.values[n] for n in self.solver.neighbors[(x, y)]]
+            self.assertEqual(self.solver.values.mines_around[index], neighbor_values.count(1))
+            self.assertEqual(self.solver.values.unknown_around[index], neighbor_values.count(None))
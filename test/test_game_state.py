@@ -0,0 +1,101 @@
+import random
+from unittest import TestCase
+
+from minesweeper import Minesweeper, Cell
+
+
+class TestGameState(TestCase):
+
+    def setUp(self):
+        self.game = Minesweeper(9, 9, 10, rng=random.Random(6))
+
+    def test_cell_equality(self):
+        self.assertEqual(Cell(1, 2, 3), Cell(1, 2, 3))
+        self.assertNotEqual(Cell(1, 2, 3), Cell(2, 1, 3))
+        self.assertEqual(len({Cell(1, 2, 3), Cell(2, 1, 3), Cell(1, 2, 3)}), 2)
+        self.assertEqual(self.game.board[4][5], Cell(4, 5, self.game.board[4][5].constant))
+
+    def test_counters(self):
+        x, y = next((x, y) for x in range(9) for y in range(9) if not self.game.is_mine(x, y))
+        self.game.uncover(x, y)
+        self.game.uncover(x, y)
+        self.assertEqual(len(self.game.uncovered), 1)
+        self.assertIn(self.game.board[x][y], self.game.uncovered)
+        self.assertEqual(self.game.uncovered_to_coordinates(), {(x, y)})
+
+        i, j = next((i, j) for i in range(9) for j in range(9) if (i, j) != (x, y))
+        self.game.flag(i, j)
+        self.assertEqual(len(self.game.marked), 1)
+        self.assertTrue(self.game.board[i][j].marked)
+        self.assertEqual([cell.to_coordinate() for cell in self.game.marked], [(i, j)])
+        self.game.flag(i, j)
+        self.assertEqual(len(self.game.marked), 0)
+        self.game.flag(x, y)  # uncovered cells can't be flagged
+        self.assertEqual(len(self.game.marked), 0)
+
+    def test_board_assignment(self):
+        board = self.game.board
+        board[0][0] = Cell(0, 0, 7)
+        self.assertEqual(self.game.board[0][0].constant, 7)
+        self.assertEqual(self.game.constants[0], 7)
+        board[2][1].constant = 9
+        self.assertTrue(self.game.is_mine(2, 1))
+        self.assertEqual(len(board), 9)
+        self.assertEqual(len(list(board[0])), 9)
+        with self.assertRaises(IndexError):
+            board[9]
+
+    def test_compact(self):
+        self.assertIsInstance(self.game.constants, bytearray)
+        self.assertIsInstance(self.game.state, bytearray)
+        self.assertEqual(len(self.game.constants), 81)
+        self.assertFalse(hasattr(self.game.board[0][0], "__dict__"))
+
+
+class TestUncoverMany(TestCase):
+
+    def expected_region(self, game, x, y):
+        """Cells a recursive flood fill from (x, y) uncovers"""
+        region, stack = {(x, y)}, [(x, y)]
+        while stack:
+            cell = stack.pop()
+            if game.board[cell[0]][cell[1]].constant == 0:
+                for n in game.get_neighbors(*cell):
+                    if n not in region:
+                        region.add(n)
+                        stack.append(n)
+        return region
+
+    def test_flood_fill(self):
+        for seed in range(30):
+            game = Minesweeper(20, 25, 40, rng=random.Random(seed))
+            zeros = [(x, y) for x in range(25) for y in range(20) if game.board[x][y].constant == 0]
+            x, y = random.Random(seed).choice(zeros)
+            delta, game_over = game.uncover_many([(x, y)])
+            self.assertEqual(len(delta), len({(i, j) for i, j, _ in delta}))
+            self.assertEqual({(i, j) for i, j, _ in delta}, self.expected_region(game, x, y))
+            self.assertTrue(all(game.board[i][j].constant == constant for i, j, constant in delta))
+            self.assertEqual(len(game.uncovered), len(delta))
+
+    def test_batch(self):
+        game = Minesweeper(9, 9, 10, rng=random.Random(2))
+        numbers = [(x, y) for x in range(9) for y in range(9) if 0 < game.board[x][y].constant < 9][:3]
+        delta, game_over = game.uncover_many(numbers + numbers[:1], flood=False)
+        self.assertEqual([(x, y) for x, y, _ in delta], numbers)
+        self.assertFalse(game_over)
+
+        mine = next((x, y) for x in range(9) for y in range(9) if game.is_mine(x, y))
+        safe = next((x, y) for x in range(9) for y in range(9)
+                    if not game.is_mine(x, y) and not game.is_uncovered(x, y))
+        delta, game_over = game.uncover_many([mine, safe])
+        self.assertEqual(delta, [(mine[0], mine[1], 9)])  # the batch stops at the end of the game
+        self.assertTrue(game_over)
+        self.assertEqual(game.result, "Lost")
+
+    def test_large_region(self):
+        game = Minesweeper(300, 300, 1, rng=random.Random(0))
+        x, y = next((x, y) for x in range(300) for y in range(300) if game.board[x][y].constant == 0)
+        delta, game_over = game.uncover_many([(x, y)])
+        self.assertEqual(len(delta), 300 * 300 - 1)
+        self.assertTrue(game_over)
+        self.assertEqual(game.result, "Won")
@@ -0,0 +1,34 @@
+from unittest import TestCase
+
+from minesweeper import Minesweeper
+from minesweeper_linear import forced_values, row_reduce
+from minesweeper_solver import MinesweeperSolver
+from BasicPatternGenerator import BasicPatternGenerator
+
+
+class TestLinear(TestCase):
+
+    def test_row_reduce(self):
+        rows = row_reduce([({'a': 1, 'b': 1}, 1), ({'b': 1, 'c': 1}, 1), ({'a': 1, 'c': 1}, 2)])
+        self.assertEqual(sorted(rows, key=lambda row: list(row[0])), [({'a': 1}, 1), ({'b': 1}, 0), ({'c': 1}, 1)])
+
+    def test_inconsistent(self):
+        self.assertIsNone(row_reduce([({'a': 1, 'b': 1}, 1), ({'a': 1, 'b': 1}, 2)]))
+        self.assertIsNone(forced_values([({'a': 1, 'b': 1}, 3)]))
+
+    def test_bounds(self):
+        # a + b = 1, c + d = 1, a + b + c + d + e = 2 -> e is safe, nothing else is known
+        forced = forced_values([({'a': 1, 'b': 1}, 1), ({'c': 1, 'd': 1}, 1),
+                                ({'a': 1, 'b': 1, 'c': 1, 'd': 1, 'e': 1}, 2)])
+        self.assertEqual(forced, {'e': 0})
+        # a - b = 1 only fits a = 1, b = 0
+        self.assertEqual(forced_values([({'a': 1, 'b': -1}, 1)]), {'a': 1, 'b': 0})
+
+    def test_solver_pattern_1_2(self):
+        game = Minesweeper(3, 3, 1)
+        solver = MinesweeperSolver(game)
+        BasicPatternGenerator(game, solver).pattern_1_2()
+        solver.uncover_cells()
+        safe, mines = solver.linear_deductions()
+        self.assertEqual(safe, {(1, 2)})
+        self.assertEqual(mines, {(0, 2), (2, 2)})
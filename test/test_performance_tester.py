@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+from minesweeper import Minesweeper
+from performance_tester import game_rng, run, summarize
+
+
+class TestPerformanceTester(TestCase):
+
+    def test_seeded_boards(self):
+        first = Minesweeper(9, 9, 10, rng=game_rng(3, 7))
+        second = Minesweeper(9, 9, 10, rng=game_rng(3, 7))
+        self.assertEqual([[cell.constant for cell in column] for column in first.board],
+                         [[cell.constant for cell in column] for column in second.board])
+
+    def test_reproducible(self):
+        results, _ = run(9, 9, 10, 6, 1, {"bitboard": True}, workers=1, progress=False)
+        self.assertEqual([result["index"] for result in results], list(range(6)))
+        again, _ = run(9, 9, 10, 6, 1, {"bitboard": True}, workers=2, progress=False)
+        self.assertEqual([(r["won"], r["progress"]) for r in results], [(r["won"], r["progress"]) for r in again])
+
+    def test_summarize(self):
+        results = [{"index": i, "won": i % 2 == 0, "time": i / 100, "progress": 1.0} for i in range(101)]
+        summary = summarize(results, 2.0)
+        self.assertEqual(summary["won"], 51)
+        self.assertAlmostEqual(summary["time_p50"], 0.5)
+        self.assertAlmostEqual(summary["time_p99"], 0.99)
+        self.assertAlmostEqual(summary["games_per_second"], 50.5)
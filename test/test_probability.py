@@ -0,0 +1,73 @@
+import random
+from fractions import Fraction
+from itertools import product
+from unittest import TestCase
+
+from minesweeper_probability import count_assignments, count_solutions, convolve, mine_probabilities
+
+
+class TestMineProbability(TestCase):
+
+    def test_count_solutions(self):
+        counts = count_solutions([[1, 0, 0], [0, 1, 0], [1, 0, 1]], 3)
+        self.assertEqual(counts[1], (2, [1, 1, 0]))
+        self.assertEqual(counts[2], (1, [1, 0, 1]))
+
+    def test_convolve(self):
+        self.assertEqual(convolve([1, 2], [1, 1]), [1, 3, 2])
+        self.assertEqual(convolve([1], [0, 4]), [0, 4])
+
+    def test_single_component_without_unconstrained(self):
+        # | 1| ?| ?| with one mine left: both cells are equally likely
+        counts = count_solutions([[1, 0], [0, 1]], 2)
+        probabilities, free = mine_probabilities([counts], 0, 1)
+        self.assertEqual(probabilities, [[Fraction(1, 2), Fraction(1, 2)]])
+        self.assertIsNone(free)
+
+    def test_weighting_by_global_mine_count(self):
+        # component has either no or two mines, 3 unconstrained cells and 2 mines left:
+        # 0 mines -> C(3, 2) = 3 ways, 2 mines -> C(3, 0) = 1 way
+        counts = count_solutions([[0, 0], [1, 1]], 2)
+        probabilities, free = mine_probabilities([counts], 3, 2)
+        self.assertEqual(probabilities, [[Fraction(1, 4), Fraction(1, 4)]])
+        self.assertEqual(free, Fraction(1, 2))
+
+    def test_multiple_components(self):
+        # two independent components with one mine each, but only one mine left -> inconsistent
+        first = count_solutions([[1, 0], [0, 1]], 2)
+        second = count_solutions([[1]], 1)
+        self.assertIsNone(mine_probabilities([first, second], 0, 1))
+        # with two mines left every solution fits
+        probabilities, _ = mine_probabilities([first, second], 0, 2)
+        self.assertEqual(probabilities, [[Fraction(1, 2), Fraction(1, 2)], [Fraction(1)]])
+
+    def test_certain_cells(self):
+        # mine count decides: component with 1 or 2 mines, exactly 2 mines left, no other cells
+        counts = count_solutions([[1, 0, 0], [1, 1, 0], [1, 0, 1]], 3)
+        probabilities, _ = mine_probabilities([counts], 0, 2)
+        self.assertEqual(probabilities, [[Fraction(1), Fraction(1, 2), Fraction(1, 2)]])
+
+    def test_no_solutions(self):
+        self.assertIsNone(mine_probabilities([{}], 5, 2))
+
+    def test_count_assignments_matches_enumeration(self):
+        rng = random.Random(0)
+        for _ in range(30):
+            size = rng.randint(1, 10)
+            constraints = []
+            for _ in range(rng.randint(1, 6)):
+                cells = rng.sample(range(size), rng.randint(1, min(4, size)))
+                upper = rng.randint(0, len(cells))
+                constraints.append((cells, upper - rng.randint(0, 1), upper))
+            mines_left = rng.randint(0, size)
+            solutions = [list(assignment) for assignment in product((0, 1), repeat=size)
+                         if sum(assignment) <= mines_left and all(lower <= sum(assignment[c] for c in cells) <= upper
+                                                                  for cells, lower, upper in constraints)]
+            self.assertEqual(count_assignments(size, constraints, mines_left), count_solutions(solutions, size))
+
+    def test_count_assignments_large_component(self):
+        # chain of 60 cells, every pair of neighbors holds exactly one mine: 2 solutions with 30 mines each
+        constraints = [([i, i + 1], 1, 1) for i in range(59)]
+        counts = count_assignments(60, constraints, 99)
+        self.assertEqual(list(counts), [30])
+        self.assertEqual(counts[30], (2, [1] * 60))
@@ -0,0 +1,79 @@
+from itertools import product
+from unittest import TestCase
+
+from minesweeper import Minesweeper, Cell
+from minesweeper_sat import SatSolver
+from minesweeper_solver import MinesweeperSolver
+from BasicPatternGenerator import BasicPatternGenerator
+
+
+class TestSat(TestCase):
+
+    def test_pigeonhole(self):
+        # 5 pigeons don't fit into 4 holes, needs learning and backjumping
+        sat = SatSolver()
+        holes = [[sat.new_var() for _ in range(4)] for _ in range(5)]
+        for pigeon in holes:
+            sat.add_clause(pigeon)
+        for hole in range(4):
+            sat.add_at_most([pigeon[hole] for pigeon in holes], 1)
+        self.assertFalse(sat.solve())
+
+    def test_assumptions(self):
+        sat = SatSolver()
+        a, b, c = sat.new_var(), sat.new_var(), sat.new_var()
+        sat.add_exactly([a, b, c], 1)
+        self.assertTrue(sat.solve([a]))
+        self.assertEqual(sat.model[1:], [True, False, False])
+        self.assertFalse(sat.solve([a, b]))
+        self.assertTrue(sat.solve([-a, -b]))
+        self.assertTrue(sat.model[c])
+        self.assertTrue(sat.solve())  # assumptions don't stick
+
+    def test_cardinality(self):
+        for n, k in [(3, 0), (4, 2), (5, 5), (5, 6)]:
+            for bits in product([False, True], repeat=n):
+                sat = SatSolver()
+                variables = [sat.new_var() for _ in range(n)]
+                sat.add_exactly(variables, k)
+                self.assertEqual(sat.solve([v if bit else -v for v, bit in zip(variables, bits)]), sum(bits) == k)
+
+    def test_solver_pattern_1_2(self):
+        game = Minesweeper(3, 3, 1)
+        solver = MinesweeperSolver(game, sat=True)
+        BasicPatternGenerator(game, solver).pattern_1_2()
+        solver.uncover_cells()
+        safe, mines = solver.sat_deductions(solver.split_components(solver.get_frontier()))
+        self.assertEqual(safe, {(1, 2)})
+        self.assertEqual(mines, {(0, 2), (2, 2)})
+
+    def test_solver_bound_by_mines_left(self):
+        """
+        | 0| 1| ?| ?|
+        | 1| 2| *| *|
+        | ?| *| 3| ?|
+        | ?| ?| ?| ?|
+        | ?| ?| ?| ?|
+
+        3 mines. Both 1s have one mine in their two covered cells, so only one mine is left for all other cells and the
+        3 needs both (2, 1) and (1, 2). Row reduction only combines equations and can't use that bound
+        """
+        game = Minesweeper(5, 4, 3)
+        mines = {(2, 1), (3, 1), (1, 2)}
+        for x in range(game.cols):
+            for y in range(game.rows):
+                near = sum((i, j) in mines for i in range(x - 1, x + 2) for j in range(y - 1, y + 2))
+                game.board[x][y] = Cell(x, y, 9 if (x, y) in mines else near)
+        solver = MinesweeperSolver(game, sat=True, stats=True)
+        solver.cells_to_check.update([(0, 0), (1, 0), (0, 1), (1, 1), (2, 2)])
+        solver.uncover_cells()
+        self.assertEqual(solver.reduce_constraints(), (set(), set()))
+        self.assertEqual(solver.linear_deductions(), (set(), set()))
+        safe, found = solver.sat_deductions(solver.split_components(solver.get_frontier()))
+        self.assertEqual(safe, {(2, 0), (0, 2)})
+        self.assertEqual(found, {(2, 1), (1, 2)})
+
+        self.assertTrue(solver.find_solutions())  # the SAT stage decides, before any probability gets computed
+        self.assertEqual((solver.stats.guesses, solver.stats.nodes), (0, 0))  # no guess and no search
+        self.assertEqual(game.marked_to_coordinates(), {(2, 1), (1, 2)})
+        self.assertTrue({(2, 0), (0, 2)} <= solver.cells_to_check)
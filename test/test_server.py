@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import random
+import tempfile
+import threading
+from unittest import TestCase
+
+from minesweeper import Minesweeper
+from minesweeper_server import GameServer, GameClient, benchmark
+from minesweeper_solver import MinesweeperSolver
+
+
+class TestServer(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.address = os.path.join(cls.directory.name, "games.sock")
+        cls.server = GameServer(line_limit=1024 * 1024)
+        cls.loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(cls.loop)
+            cls.loop.run_until_complete(cls.server.start(cls.address))
+            started.set()
+            cls.loop.run_forever()
+
+        cls.thread = threading.Thread(target=run, daemon=True)
+        cls.thread.start()
+        started.wait()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join()
+        cls.directory.cleanup()
+
+    def setUp(self):
+        self.client = GameClient(self.address)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_solver_plays_remote_game(self):
+        for seed in range(5):
+            remote = self.client.new_game(9, 9, 10, seed=seed)
+            local = Minesweeper(9, 9, 10, rng=random.Random(seed))
+            MinesweeperSolver(remote, starting_point=(4, 4), rng=random.Random(seed)).solve()
+            MinesweeperSolver(local, starting_point=(4, 4), rng=random.Random(seed)).solve()
+            self.assertEqual(remote.result, local.result)
+            self.assertEqual(remote.uncovered_to_coordinates(), local.uncovered_to_coordinates())
+            snapshot = self.client.call("snapshot", game=remote.id)
+            self.assertEqual({(x, y) for x, y, _ in snapshot["uncovered"]}, remote.uncovered_to_coordinates())
+            self.assertEqual(snapshot["result"] or remote.result, remote.result)
+            remote.close()
+
+    def test_flag_and_errors(self):
+        game = self.client.new_game(9, 9, 10, seed=1)
+        game.flag(2, 3)
+        self.assertEqual(len(game.marked), 1)
+        self.assertEqual(self.client.call("snapshot", game=game.id)["marked"], [[2, 3]])
+        game.flag(2, 3)
+        self.assertEqual(len(game.marked), 0)
+        with self.assertRaises(ValueError):
+            self.client.call("uncover", game=game.id, cells=[[9, 0]])
+        with self.assertRaises(ValueError):
+            self.client.call("snapshot", game=-1)
+        with self.assertRaises(ValueError):
+            self.client.call("dance")
+        self.assertIn(game.id, self.server.games)  # errors keep the connection open
+        game.close()
+        self.assertNotIn(game.id, self.server.games)
+
+    def test_large_batch(self):
+        game = self.client.new_game(100, 100, 1000, seed=2)
+        cells = [(x, y) for x in range(100) for y in range(90)]  # 9000 cells, far above asyncio's default line limit
+        response = self.client.call("uncover", game=game.id, cells=cells, flood=False)
+        self.assertTrue(response["game_over"])
+        game.close()
+
+    def test_line_limit(self):
+        game = self.client.new_game(9, 9, 10, seed=1)
+        self.client.file.write(b'{"op":"flag","game":%d,"x":0,"y":0,"pad":"%s"}\n' % (game.id, b"x" * 2000000))
+        self.client.file.flush()
+        self.assertIn("error", json.loads(self.client.file.readline()))
+        game.flag(1, 1)  # the connection and its games stay usable
+        self.assertEqual(self.client.call("snapshot", game=game.id)["marked"], [[1, 1]])
+        with self.assertRaises(ValueError):
+            self.client.call("new", rows=10000, cols=10000, mines=100)
+
+    def test_request_not_an_object(self):
+        game = self.client.new_game(9, 9, 10, seed=1)
+        for line in (b'"hello"\n', b'42\n', b'[1, 2]\n', b'null\n'):
+            self.client.file.write(line)
+            self.client.file.flush()
+            self.assertIn("error", json.loads(self.client.file.readline()))
+        self.assertIn(game.id, self.server.games)  # the connection and its games stay usable
+        game.flag(1, 1)
+        self.assertEqual(self.client.call("snapshot", game=game.id)["marked"], [[1, 1]])
+
+    def test_invalid_cells_change_nothing(self):
+        game = self.client.new_game(9, 9, 10, seed=1)
+        for cells in ([[0, 0], [1.5, 2]], [[0, 0], [1, True]], [[0, 0], [1]], [[0, 0], "ab"], [[0, 0], [9, 0]]):
+            with self.assertRaises(ValueError):
+                self.client.call("uncover", game=game.id, cells=cells)
+        with self.assertRaises(ValueError):
+            self.client.call("flag", game=game.id, x=0.5, y=0)
+        snapshot = self.client.call("snapshot", game=game.id)
+        self.assertEqual((snapshot["uncovered"], snapshot["marked"]), ([], []))
+        self.assertFalse(snapshot["game_over"])
+
+    def test_games_dropped_with_connection(self):
+        client = GameClient(self.address)
+        game = client.new_game(9, 9, 10)
+        client.close()
+        for _ in range(100):
+            if game.id not in self.server.games:
+                break
+            threading.Event().wait(0.01)
+        self.assertNotIn(game.id, self.server.games)
+
+
+class TestBenchmark(TestCase):
+
+    def test_benchmark(self):
+        result = asyncio.run(benchmark(None, clients=20, games=2, rows=9, cols=9, mines=10, seed=0))
+        self.assertGreaterEqual(result["requests"], 20 * 2 * 3)  # new, at least one move and close per game
+        self.assertGreater(result["requests_per_second"], 0)
+        self.assertLessEqual(result["latency_p50"], result["latency_max"])
@@ -1,6 +1,11 @@
-from unittest import TestCase
+from unittest import TestCase, skipIf
 from itertools import product
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from minesweeper import Minesweeper
 from minesweeper_solver import MinesweeperSolver
 from BasicPatternGenerator import BasicPatternGenerator
@@ -171,6 +176,37 @@ class TestMinesweeperSolver(TestCase):
         self.assertTrue(len(backtrack_solutions) == len(valids))
         self.assertTrue(sorted(backtrack_solutions) == sorted([list(valid) for valid in valids]))
 
+    @skipIf(np is None, "numpy not installed")
+    def test_batched_solutions_1_2_2(self):
+        self.generator.mines_1_2_2()
+        self.solver.cells_to_check.remove((0, 0))
+        self.solver.cells_to_check.remove((1, 0))
+        self.solver.cells_to_check.remove((2, 0))
+        self.solver.cells_to_check.add((1, 1))
+        self.solver.cells_to_check.add((2, 1))
+        self.solver.ac3()
+        self.solver.unassigned = self.solver.get_frontier()
+        candidates = [list(p) for p in product([0, 1], repeat=len(self.solver.unassigned))]
+        valid = self.solver.are_solutions_valid(candidates)
+        for candidate, is_valid in zip(candidates, valid):
+            self.assertEqual(bool(is_valid), self.solver.is_solution_valid(candidate))
+        self.assertEqual(self.solver.batch_solutions(2), self.solver.backtrack(2))
+        self.assertEqual(self.solver.batch_solutions(2, block_size=5), self.solver.backtrack(2))
+
+    @skipIf(np is None, "numpy not installed")
+    def test_batched_solutions_mines_4(self):
+        self.generator.mines_4()
+        self.solver.cells_to_check.remove((0, 0))
+        self.solver.cells_to_check.remove((2, 0))
+        self.solver.cells_to_check.remove((1, 1))
+        self.solver.cells_to_check.remove((0, 2))
+        self.solver.cells_to_check.add((1, 1))
+        self.solver.uncover_cells()
+        self.solver.unassigned = self.solver.get_frontier()
+        for last_cells in (True, False):
+            self.assertEqual(sorted(self.solver.batch_solutions(4, last_cells=last_cells)),
+                             sorted(self.solver.backtrack(4, last_cells=last_cells)))
+
     # ----- HELPER -----
 
     def generate_and_test_solutions(self, valid, size):
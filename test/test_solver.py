@@ -1,7 +1,9 @@
+import random
 from unittest import TestCase
 
 from minesweeper import Minesweeper, Cell
 from minesweeper_solver import MinesweeperSolver
+from minesweeper_trace import TraceSink, GUESS
 from BasicPatternGenerator import BasicPatternGenerator
 
 
@@ -151,6 +153,29 @@ class TestMinesweeperSolver(TestCase):
         self.assertTrue(self.solver.solve())
         self.postconditions()
 
+    def test_cells_uncovered_by_player(self):
+        self.game = Minesweeper(9, 9, 10, rng=random.Random(3))
+        x, y = next((x, y) for x in range(9) for y in range(9) if self.game.board[x][y].constant == 0)
+        delta, _ = self.game.uncover_many([(x, y)])  # the player opens a region before the solver starts
+        self.solver = MinesweeperSolver(self.game, starting_point=(x, y), rng=random.Random(3))
+        self.solver.uncover_cells()
+        self.assertTrue({(i, j) for i, j, _ in delta} <= self.solver.checked)
+        self.assertTrue(all(self.solver.domains[(i, j)] == {0} for i, j, _ in delta))
+
+    def test_no_guess_with_known_safe_cells(self):
+        waiting = []
+
+        class GuessSink(TraceSink):
+            def emit(self, event, **data):
+                if event == GUESS:
+                    waiting.extend(solver.known_safe_cells())
+
+        for seed in range(10):
+            game = Minesweeper(16, 16, 40, rng=random.Random(seed), trace=GuessSink())
+            solver = MinesweeperSolver(game, starting_point=(8, 8), rng=random.Random(seed))
+            solver.solve()
+            self.assertEqual(waiting, [], "guessed with known safe cells in game {}".format(seed))
+
     # ----- HELPER ----- #
 
     def preconditions(self):
@@ -0,0 +1,69 @@
+import random
+from unittest import TestCase
+
+from minesweeper import Minesweeper
+from minesweeper_cache import ComponentCache
+from minesweeper_solver import MinesweeperSolver
+from minesweeper_stats import SolverStats, profile_solve
+from BasicPatternGenerator import BasicPatternGenerator
+
+
+class TestStats(TestCase):
+
+    def test_disabled_by_default(self):
+        game = Minesweeper(3, 3, 1)
+        self.assertIsNone(MinesweeperSolver(game).stats)
+
+    def test_pattern(self):
+        game = Minesweeper(3, 3, 1)
+        solver = MinesweeperSolver(game, stats=True)
+        BasicPatternGenerator(game, solver).pattern_corner_1()
+        solver.cells_to_check = {(0, 0)}
+        solver.solve()
+        self.assertGreater(solver.stats.revise_calls, 0)
+        self.assertEqual(solver.stats.stack, [])
+
+    def test_expert_game(self):
+        parents = set()
+
+        class NestingStats(SolverStats):
+            def enter(self, phase):
+                parents.add((phase, self.stack[-1] if self.stack else None))
+                super().enter(phase)
+
+        rng = random.Random(4)
+        game = Minesweeper(16, 30, 99, rng=rng)
+        solver = MinesweeperSolver(game, starting_point=(5, 5), rng=rng, stats=True, cache=ComponentCache())
+        solver.stats = NestingStats()
+        solver.solve()
+        stats = solver.stats
+        for counter in ("revise_calls", "nodes", "solutions", "cache_misses", "guesses"):
+            self.assertGreater(getattr(stats, counter), 0, counter)
+        self.assertTrue(all(seconds >= 0 for seconds in stats.times.values()))
+        self.assertEqual(stats.stack, [])
+        # every phase ran, and only inside the phase that calls it
+        allowed = {"solve": {None}, "ac3": {"solve"}, "uncover_cells": {"ac3"},
+                   "find_solutions": {"solve"}, "backtrack": {"find_solutions"}}
+        self.assertEqual({phase for phase, _ in parents}, set(allowed))
+        for phase, parent in parents:
+            self.assertIn(parent, allowed[phase], phase)
+
+    def test_aggregate(self):
+        first = SolverStats()
+        first.nodes = 3
+        first.times["ac3"] = 1.0
+        second = SolverStats()
+        second.nodes = 4
+        second.guesses = 1
+        second.memory_peak = 10
+        total = SolverStats.aggregate([first, second.to_dict()])
+        self.assertEqual((total.games, total.nodes, total.guesses, total.memory_peak), (2, 7, 1, 10))
+        self.assertEqual(total.times["ac3"], 1.0)
+        self.assertIsNone(SolverStats.aggregate([]))
+
+    def test_profile(self):
+        game = Minesweeper(9, 9, 10, rng=random.Random(1))
+        solver = MinesweeperSolver(game, rng=random.Random(1), stats=True)
+        _, profile = profile_solve(solver, memory=True)
+        self.assertGreater(solver.stats.memory_peak, 0)
+        self.assertTrue(profile.getstats())
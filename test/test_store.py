@@ -0,0 +1,45 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from minesweeper_cache import ComponentCache
+from minesweeper_store import PatternStore
+
+
+class TestStore(TestCase):
+    directory = None
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "patterns.db")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        key = ((2, (((0, 1), 1, 0),)), 2)
+        cache = ComponentCache()
+        cache.put(key, {1: (2, [1, 1])})
+        store = PatternStore(self.path)
+        self.assertEqual(store.save(cache), 1)
+        store.close()
+
+        store = PatternStore(self.path)
+        loaded = ComponentCache()
+        self.assertEqual(store.load(loaded), 1)
+        self.assertEqual(loaded.get(key), {1: (2, [1, 1])})
+        self.assertEqual(store.load(loaded), 0)  # only once per cache
+        store.close()
+
+    def test_size_limit(self):
+        store = PatternStore(self.path, max_entries=2)
+        for i in range(3):
+            cache = ComponentCache()
+            cache.put(i, {0: (1, [0])})
+            store.save(cache)
+        self.assertEqual(len(store), 2)
+        loaded = ComponentCache()
+        store.load(loaded)
+        self.assertIsNone(loaded.get(0))  # least recently saved entry is gone
+        self.assertEqual(loaded.get(2), {0: (1, [0])})
+        store.close()
@@ -0,0 +1,50 @@
+import random
+import sys
+import traceback
+from unittest import TestCase
+
+from minesweeper import Minesweeper, Cell
+from minesweeper_solver import MinesweeperSolver
+
+
+class TestStress(TestCase):
+
+    def test_huge_opening(self):
+        """
+        49x49 board with a single mine in the lower right corner. Uncovering the upper left corner opens the whole
+        board except the mine, which has to be deduced afterwards. Recursion depth must not follow the size of the
+        opening
+        """
+        limit = sys.getrecursionlimit()
+        game = Minesweeper(49, 49, 1)
+        game.mines = 1
+        for x in range(game.cols):
+            for y in range(game.rows):
+                game.board[x][y] = Cell(x, y, 1 if x >= 47 and y >= 47 else 0)
+        game.board[48][48] = Cell(48, 48, 9)
+        solver = MinesweeperSolver(game, starting_point=(0, 0))
+
+        self.assertTrue(solver.solve())
+        self.assertEqual(limit, sys.getrecursionlimit())
+        self.assertEqual(game.result, "Won")
+        self.assertTrue(solver.values[(48, 48)] == 1)
+        self.assertTrue(solver.is_solver_consistent())
+
+    def test_rounds_do_not_recurse(self):
+        """
+        Expert games take many rounds of deductions and guesses. Every round has to start at the same call depth
+        """
+        depths = []
+        for seed in range(3):
+            game = Minesweeper(16, 30, 99, rng=random.Random(seed))
+            solver = MinesweeperSolver(game, starting_point=(5, 5), rng=random.Random(seed))
+            find_solutions = solver.find_solutions
+
+            def record():
+                depths.append(len(traceback.extract_stack()))
+                return find_solutions()
+
+            solver.find_solutions = record
+            solver.solve()
+        self.assertGreater(len(depths), 10)
+        self.assertEqual(len(set(depths)), 1)
@@ -0,0 +1,81 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from minesweeper import Minesweeper
+from minesweeper_solver import MinesweeperSolver
+from minesweeper_tables import HEADER, Window, get_windows, load_tables, save_tables, windows
+from BasicPatternGenerator import BasicPatternGenerator
+
+
+class TestTables(TestCase):
+    game = None
+    solver = None
+    generator = None
+
+    @classmethod
+    def setUp(cls) -> None:
+        cls.game = Minesweeper(3, 3, 1)
+        cls.solver = MinesweeperSolver(cls.game, tables=True)
+        cls.generator = BasicPatternGenerator(cls.game, cls.solver)
+
+    @classmethod
+    def tearDown(cls) -> None:
+        cls.game = None
+        cls.solver = None
+        cls.generator = None
+
+    def deduce(self):
+        self.solver.uncover_cells()
+        while self.solver.window_deductions():
+            pass
+        mines = {cell for cell in self.solver.variables if self.solver.values[cell] == 1}
+        return self.solver.cells_to_check, mines
+
+    def test_window(self):
+        # 1-2 pair at the top edge: cells above the pair are off the board (known)
+        window = Window(4, 3, [(1, 1), (2, 1)])
+        window.generate()
+        unknown = sum(1 << window.outer.index(cell) for cell in [(-1, 1), (0, 1), (1, 1), (2, 1)])
+        safe, mines = window.lookup(unknown, [1, 2])
+        self.assertEqual(safe, 1 << window.outer.index((-1, 1)))
+        self.assertEqual(mines, 1 << window.outer.index((2, 1)))
+        self.assertEqual(window.lookup(unknown, [3, 0]), (0, 0))  # inconsistent
+
+    def test_pattern_1_1(self):
+        self.generator.pattern_1_1()
+        # the mine in the middle only follows, once one of the safe cells is uncovered
+        self.assertEqual(self.deduce(), ({(0, 2), (2, 2)}, set()))
+
+    def test_pattern_1_2(self):
+        self.generator.pattern_1_2()
+        self.assertEqual(self.deduce(), ({(1, 2)}, {(0, 2), (2, 2)}))
+
+    def test_mines_1_2_2(self):
+        self.generator.mines_1_2_2()
+        self.assertEqual(self.deduce(), ({(0, 2)}, {(1, 2), (2, 2)}))
+
+    def test_pattern_b1(self):
+        self.generator.pattern_b1()
+        self.assertEqual(self.deduce(), (set(), {(0, 2), (1, 2), (2, 2)}))
+
+    def test_solve(self):
+        self.generator.pattern_1_2()
+        self.assertTrue(self.solver.solve())
+        self.assertEqual(self.game.result, "Won")
+
+    def test_table_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tables.bin")
+            save_tables(path)
+            self.assertTrue(load_tables(windows(), path))
+            expected = [window.safe for window in get_windows(path)]
+
+            for name, content in (("truncated.bin", open(path, "rb").read()[:-2]),
+                                  ("old.bin", open(path, "rb").read()[HEADER.size:])):  # tables without header
+                stale = os.path.join(directory, name)
+                with open(stale, "wb") as file:
+                    file.write(content)
+                self.assertFalse(load_tables(windows(), stale))
+                self.assertEqual([window.safe for window in get_windows(stale)], expected)
+                self.assertTrue(load_tables(windows(), stale))  # rebuilt
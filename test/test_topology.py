@@ -0,0 +1,36 @@
+from unittest import TestCase
+
+from minesweeper import Minesweeper
+from minesweeper_topology import NeighborMap, get_topology
+
+
+class TestTopology(TestCase):
+
+    def test_shared_per_size(self):
+        self.assertIs(get_topology(4, 7), get_topology(4, 7))
+        self.assertIs(Minesweeper(5, 6, 3).topology, Minesweeper(5, 6, 4).topology)
+        self.assertIsNot(get_topology(5, 6), get_topology(6, 5))
+
+    def test_neighbors(self):
+        topology = get_topology(4, 7)
+        for x, y in topology.coordinates:
+            index = topology.index(x, y)
+            self.assertEqual(topology.coordinates[index], (x, y))
+            expected = [(i, j) for i in range(x - 1, x + 2) for j in range(y - 1, y + 2)
+                        if (i, j) != (x, y) and 0 <= i < 7 and 0 <= j < 4]
+            self.assertEqual(list(topology.neighbor_coordinates(index)), expected)
+            csr = topology.indices[topology.offsets[index]:topology.offsets[index + 1]]
+            self.assertEqual([topology.coordinates[n] for n in csr], expected)
+
+    def test_lazy_neighbors(self):
+        topology = get_topology(4, 7)
+        neighbors = NeighborMap(topology)
+        self.assertEqual(len(neighbors), 0)
+        self.assertEqual(neighbors[(0, 0)], ((0, 1), (1, 0), (1, 1)))
+        self.assertEqual(len(neighbors), 1)
+        self.assertIs(neighbors[(0, 0)], topology.neighbor_coordinates(0))  # shared with the topology
+        self.assertIs(topology.neighbors[(0, 0)], topology.neighbor_coordinates(0))
+        with self.assertRaises(KeyError):
+            neighbors[(7, 0)]
+        self.assertEqual(len(topology.coordinates), 28)
+        self.assertEqual(list(topology.coordinates), [topology.coordinates[i] for i in range(28)])
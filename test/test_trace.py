@@ -0,0 +1,55 @@
+import io
+import json
+import random
+from contextlib import redirect_stdout
+from unittest import TestCase
+
+from minesweeper import Minesweeper
+from minesweeper_solver import MinesweeperSolver
+from minesweeper_trace import ConsoleSink, JsonLinesSink, MemorySink, BOARD_GENERATED, MINES_MOVED, UNCOVERED, FLAG, \
+    GUESS, GAME_OVER
+
+
+class TestTrace(TestCase):
+
+    def test_silent_by_default(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            game = Minesweeper(9, 9, 10, rng=random.Random(2))
+            MinesweeperSolver(game, rng=random.Random(2)).solve()
+        self.assertEqual(output.getvalue(), "")
+
+    def test_memory_sink(self):
+        sink = MemorySink()
+        game = Minesweeper(16, 30, 99, rng=random.Random(5), trace=sink)
+        MinesweeperSolver(game, starting_point=(3, 3), rng=random.Random(5)).solve()
+        generated = sink.of(BOARD_GENERATED)
+        self.assertEqual(len(generated[-1]["mine_coordinates"]), 99)
+        self.assertEqual(len(sink.of(UNCOVERED)), len(game.uncovered))
+        self.assertEqual(sink.of(UNCOVERED)[0], {"x": 3, "y": 3, "constant": game.board[3][3].constant})
+        self.assertEqual(len([e for e in sink.of(FLAG) if e["marked"]]), len(game.marked))
+        self.assertTrue(sink.of(GUESS))
+        self.assertEqual(sink.of(GAME_OVER), [{"result": game.result}])
+
+    def test_mines_moved(self):
+        sink = MemorySink()
+        game = Minesweeper(3, 3, 4, rng=random.Random(0), trace=sink)
+        x, y = next((x, y) for x in range(3) for y in range(3) if game.is_mine(x, y))
+        game.uncover(x, y)  # first click on a mine moves it away
+        self.assertEqual(len(sink.of(BOARD_GENERATED)), 1)
+        [moved] = sink.of(MINES_MOVED)
+        self.assertEqual(moved["moves"][0][0], (x, y))
+        self.assertFalse(game.game_over)
+
+    def test_json_lines_and_console(self):
+        file = io.StringIO()
+        game = Minesweeper(9, 9, 10, rng=random.Random(1), trace=JsonLinesSink(file))
+        game.flag(0, 0)
+        events = [json.loads(line) for line in file.getvalue().splitlines()]
+        self.assertEqual([event["event"] for event in events], [BOARD_GENERATED, FLAG])
+        self.assertEqual(events[1], {"event": FLAG, "x": 0, "y": 0, "marked": True})
+
+        output = io.StringIO()
+        ConsoleSink(output).emit(GUESS, x=1, y=2, probability=0.25)
+        ConsoleSink(output).emit(GAME_OVER, result="Won")
+        self.assertEqual(output.getvalue(), "Guess (1, 2): 0.250\nGame result: Won\n")